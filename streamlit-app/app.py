@@ -2,18 +2,32 @@
 Email-to-SMS Code Generator
 Streamlit application for generating Cloudflare Worker code
 """
+import time
+import uuid
+
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 from components import (
+    finish_rerun,
+    render_diagnostics_panel,
+    section,
+    start_rerun,
     render_form,
+    collect_form,
+    fragment,
     render_preview_panel,
     show_file_stats,
     render_download_section,
     render_deployment_instructions,
+    render_diff_section,
     render_export_options,
+    render_fleet_section,
     render_import_section
 )
-from generators import CodeGenerator
-from utils import APP_TITLE, APP_SUBTITLE, APP_VERSION
+from generators import CodeGenerator, generation_jobs, submit_generation
+from utils import APP_TITLE, APP_SUBTITLE, APP_VERSION, JOB_POLL_INTERVAL, load_bundle
+from utils.bundle_store import bundle_store
+from utils.jobs import CANCELLED, DONE, QUEUED
 
 
 # Page configuration
@@ -74,9 +88,15 @@ def initialize_session_state():
     if 'generated_files' not in st.session_state:
         st.session_state.generated_files = {}
 
+    if 'previous_files' not in st.session_state:
+        st.session_state.previous_files = {}
+
     if 'current_config' not in st.session_state:
         st.session_state.current_config = None
 
+    if 'generation_job' not in st.session_state:
+        st.session_state.generation_job = None
+
 
 def render_header():
     """Render application header."""
@@ -114,6 +134,21 @@ def render_sidebar():
 
         st.markdown("---")
 
+        st.markdown("## ⚙️ Settings")
+        st.toggle(
+            "Validate whitelist on submit",
+            value=False,
+            help="Hold sender whitelist edits until you submit them; useful for long lists",
+            key='defer_validation'
+        )
+
+        st.markdown("---")
+
+        st.markdown("## 📊 Diagnostics")
+        render_diagnostics_panel()
+
+        st.markdown("---")
+
         st.markdown("## 📚 Resources")
         st.markdown("""
         - [Cloudflare Workers](https://developers.cloudflare.com/workers/)
@@ -135,8 +170,178 @@ def render_sidebar():
         """)
 
 
+@fragment
+def render_results():
+    """
+    Render generated files, downloads and instructions.
+
+    Runs as a fragment where supported, so preview, download and diff
+    widgets rerun only this area, and form edits do not rerun it.
+    """
+    if st.session_state.generated_files:
+        config, _ = collect_form()
+        files = load_bundle(st.session_state.generated_files)
+
+        # Show file statistics
+        with section('stats'):
+            show_file_stats(files)
+
+        # Show code preview
+        with section('preview'):
+            render_preview_panel(files)
+
+        # Download section
+        with section('downloads'):
+            render_download_section(files, config.basic.worker_name)
+
+        # Changes against the previous bundle
+        with section('diff'):
+            render_diff_section(files, config.basic.worker_name)
+
+        # Deployment instructions
+        with section('instructions'):
+            render_deployment_instructions(
+                config.basic.worker_name,
+                config.basic.domain,
+                config.basic.email_pattern
+            )
+
+        # Configuration export
+        st.markdown("---")
+        render_export_options(config)
+
+    else:
+        # Show placeholder when no code generated yet
+        st.info("""
+        👆 **Get started by:**
+        1. Filling in your configuration above
+        2. Clicking the "Generate Code" button
+        3. Downloading your customized Worker files
+        """)
+
+        # Show example
+        with st.expander("📖 See Example Configuration"):
+            st.markdown("""
+            **Example Setup:**
+            - **Worker Name:** `my-email-sms`
+            - **Domain:** `example.com`
+            - **Email Pattern:** `*@sms.example.com`
+            - **Twilio Phone:** `+15551234567`
+
+            **This creates a worker that:**
+            - Receives emails at `15551234567@sms.example.com`
+            - Sends SMS to `+15551234567`
+            - Includes rate limiting (10 msgs/sender/hour)
+            - Logs to Analytics Engine
+            - Retries failed sends up to 3 times
+            """)
+
+
+def session_id() -> str:
+    """Get the current session's ID, used to schedule its jobs fairly."""
+    ctx = get_script_run_ctx()
+    if ctx is not None:
+        return ctx.session_id
+    if 'session_id' not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+    return st.session_state.session_id
+
+
+def attach_generated_files(files):
+    """
+    Store a finished bundle in the session.
+
+    Args:
+        files: Generated Bundle
+    """
+    # Validate that all expected files were generated
+    expected_files = ['src/index.ts', 'wrangler.toml', 'package.json',
+                     'tsconfig.json', '.env.example', '.gitignore',
+                     'README.md', 'deploy.sh']
+
+    missing_files = [f for f in expected_files if f not in files]
+    if missing_files:
+        st.warning(f"⚠️ Some files were not generated: {', '.join(missing_files)}")
+
+    # Store a reference in session state, keeping the last bundle for diffs.
+    # Contents live once in the shared bundle store.
+    if st.session_state.generated_files:
+        st.session_state.previous_files = st.session_state.generated_files
+    st.session_state.generated_files = bundle_store.put(files)
+
+    # Show success
+    st.success(f"✅ Successfully generated {len(files)} files!")
+    st.balloons()
+
+    # Clear sensitive credentials from session state for security
+    sensitive_keys = [
+        'twilio_sid',
+        'twilio_token',
+        'twilio_phone',
+        'cloudflare_api_token'
+    ]
+    for key in sensitive_keys:
+        if key in st.session_state:
+            del st.session_state[key]
+
+    # Notify user that credentials have been cleared
+    st.info("🔒 **Security Notice:** Sensitive credentials have been cleared from the session for your protection. They are only included in the downloaded code files.")
+
+
+def render_generation_job() -> bool:
+    """
+    Render the session's generation job.
+
+    Shows per-file progress and a cancel button while the job runs. Once it
+    finishes, attaches the bundle to the session (or shows the error) and
+    forgets the job.
+
+    Returns:
+        True if the job is still running and the page should poll again
+    """
+    job = st.session_state.generation_job
+    if job is None:
+        return False
+
+    if not job.finished:
+        if job.status == QUEUED:
+            waiting = generation_jobs.pending()
+            st.progress(0.0, text=f"⏳ Waiting for a free worker ({waiting} queued)...")
+        else:
+            text = f"⚙️ Generating code... {job.completed}/{job.total or '?'}"
+            if job.current:
+                text += f" ({job.current})"
+            st.progress(job.fraction, text=text)
+
+        if st.button("✖️ Cancel", key='cancel_generation'):
+            generation_jobs.cancel(job)
+            job.wait(JOB_POLL_INTERVAL)
+        if not job.finished:
+            return True
+
+    st.session_state.generation_job = None
+
+    if job.status == DONE:
+        attach_generated_files(job.result)
+    elif job.status == CANCELLED:
+        st.warning("✖️ Code generation cancelled.")
+    elif isinstance(job.error, KeyError):
+        st.error(f"❌ Template rendering error: Missing configuration key: {str(job.error)}")
+        st.error("Please ensure all required fields are filled correctly.")
+    elif isinstance(job.error, ValueError):
+        st.error(f"❌ Invalid configuration value: {str(job.error)}")
+        st.error("Please check your input values and try again.")
+    else:
+        st.error(f"❌ File generation error: {str(job.error)}")
+        st.exception(job.error)
+    return False
+
+
 def main():
     """Main application logic."""
+    # Time this rerun for the diagnostics panel
+    start_rerun()
+
     # Initialize
     initialize_session_state()
 
@@ -151,6 +356,9 @@ def main():
 
     # Import Configuration Section - Available from the start
     render_import_section()
+
+    # Fleet download - many tenant configurations in one archive
+    render_fleet_section()
     
     st.markdown("---")
 
@@ -169,7 +377,10 @@ def main():
     """, unsafe_allow_html=True)
 
     # Render configuration form and collect validation errors
-    config, validation_errors = render_form()
+    with section('form'):
+        config, validation_errors = render_form(
+            defer_validation=st.session_state.get('defer_validation', False)
+        )
 
     # Store config in session state
     st.session_state.current_config = config
@@ -194,123 +405,53 @@ def main():
             disabled=len(validation_errors) > 0
         )
 
-    # Generate code when button clicked
+    # Submit generation when button clicked
     if generate_button:
-        with st.spinner("⚙️ Generating code..."):
-            try:
-                # Create code generator with validated config
-                generator = CodeGenerator(config)
-
-                # Validate configuration
-                is_valid, errors = generator.validate_config()
-
-                if not is_valid:
-                    st.error("❌ Configuration validation failed:")
-                    for error in errors:
-                        st.error(f"  • {error}")
-                else:
-                    # Generate all files with error handling
-                    try:
-                        files = generator.generate_all()
-
-                        # Validate that all expected files were generated
-                        expected_files = ['src/index.ts', 'wrangler.toml', 'package.json',
-                                         'tsconfig.json', '.env.example', '.gitignore',
-                                         'README.md', 'deploy.sh']
-
-                        missing_files = [f for f in expected_files if f not in files]
-                        if missing_files:
-                            st.warning(f"⚠️ Some files were not generated: {', '.join(missing_files)}")
-
-                        # Store in session state
-                        st.session_state.generated_files = files
-
-                        # Show success
-                        st.success(f"✅ Successfully generated {len(files)} files!")
-                        st.balloons()
-
-                        # Clear sensitive credentials from session state for security
-                        sensitive_keys = [
-                            'twilio_sid',
-                            'twilio_token',
-                            'twilio_phone',
-                            'cloudflare_api_token'
-                        ]
-                        for key in sensitive_keys:
-                            if key in st.session_state:
-                                del st.session_state[key]
-
-                        # Notify user that credentials have been cleared
-                        st.info("🔒 **Security Notice:** Sensitive credentials have been cleared from the session for your protection. They are only included in the downloaded code files.")
-
-                    except KeyError as ke:
-                        st.error(f"❌ Template rendering error: Missing configuration key: {str(ke)}")
-                        st.error("Please ensure all required fields are filled correctly.")
-                    except Exception as template_error:
-                        st.error(f"❌ File generation error: {str(template_error)}")
-                        st.exception(template_error)
-
-            except ValueError as ve:
-                st.error(f"❌ Invalid configuration value: {str(ve)}")
-                st.error("Please check your input values and try again.")
-            except Exception as e:
-                st.error(f"❌ Unexpected error generating code: {str(e)}")
-                st.exception(e)
-                # Log error details for debugging
-                import traceback
-                st.error("**Debug Information:**")
-                st.code(traceback.format_exc(), language="python")
-
-    # Display generated code
-    if st.session_state.generated_files:
-        # Show file statistics
-        show_file_stats(st.session_state.generated_files)
-
-        # Show code preview
-        render_preview_panel(st.session_state.generated_files)
-
-        # Download section
-        render_download_section(
-            st.session_state.generated_files,
-            config.basic.worker_name
-        )
-
-        # Deployment instructions
-        render_deployment_instructions(
-            config.basic.worker_name,
-            config.basic.domain,
-            config.basic.email_pattern
-        )
-
-        # Configuration export
-        st.markdown("---")
-        render_export_options(config)
-
-    else:
-        # Show placeholder when no code generated yet
-        st.info("""
-        👆 **Get started by:**
-        1. Filling in your configuration above
-        2. Clicking the "Generate Code" button
-        3. Downloading your customized Worker files
-        """)
-
-        # Show example
-        with st.expander("📖 See Example Configuration"):
-            st.markdown("""
-            **Example Setup:**
-            - **Worker Name:** `my-email-sms`
-            - **Domain:** `example.com`
-            - **Email Pattern:** `*@sms.example.com`
-            - **Twilio Phone:** `+15551234567`
-
-            **This creates a worker that:**
-            - Receives emails at `15551234567@sms.example.com`
-            - Sends SMS to `+15551234567`
-            - Includes rate limiting (10 msgs/sender/hour)
-            - Logs to Analytics Engine
-            - Retries failed sends up to 3 times
-            """)
+        try:
+            # Create code generator with validated config
+            generator = CodeGenerator(config)
+
+            # Validate configuration
+            is_valid, errors = generator.validate_config()
+
+            if not is_valid:
+                st.error("❌ Configuration validation failed:")
+                for error in errors:
+                    st.error(f"  • {error}")
+            else:
+                job = st.session_state.generation_job
+                if job is not None and not job.finished:
+                    generation_jobs.cancel(job)
+                job = submit_generation(config, owner=session_id())
+                st.session_state.generation_job = job
+
+                # Short jobs finish before the page renders
+                job.wait(JOB_POLL_INTERVAL)
+
+        except ValueError as ve:
+            st.error(f"❌ Invalid configuration value: {str(ve)}")
+            st.error("Please check your input values and try again.")
+        except Exception as e:
+            st.error(f"❌ Unexpected error generating code: {str(e)}")
+            st.exception(e)
+            # Log error details for debugging
+            import traceback
+            st.error("**Debug Information:**")
+            st.code(traceback.format_exc(), language="python")
+
+    # Progress of a running job, or its result once finished
+    polling = render_generation_job()
+
+    # Generated code, downloads and instructions
+    with section('results'):
+        render_results()
+
+    finish_rerun(session=session_id())
+
+    # Poll the running job after the page has rendered
+    if polling:
+        time.sleep(JOB_POLL_INTERVAL)
+        st.rerun()
 
 
 if __name__ == "__main__":
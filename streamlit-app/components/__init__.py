@@ -1,20 +1,33 @@
 """UI component modules."""
-from .input_form import render_form
+from .input_form import render_form, collect_form
+from .fragments import fragment, FRAGMENTS_SUPPORTED
+from .diagnostics import start_rerun, section, finish_rerun, render_diagnostics_panel
 from .code_display import render_code_tabs, render_preview_panel, show_file_stats
 from .download_manager import (
     render_download_section,
     render_deployment_instructions,
+    render_diff_section,
     render_export_options,
+    render_fleet_section,
     render_import_section
 )
 
 __all__ = [
     'render_form',
+    'collect_form',
+    'fragment',
+    'FRAGMENTS_SUPPORTED',
+    'start_rerun',
+    'section',
+    'finish_rerun',
+    'render_diagnostics_panel',
     'render_code_tabs',
     'render_preview_panel',
     'show_file_stats',
     'render_download_section',
     'render_deployment_instructions',
+    'render_diff_section',
     'render_export_options',
+    'render_fleet_section',
     'render_import_section'
 ]
@@ -6,7 +6,31 @@ from pygments.lexers import (
     MarkdownLexer, BashLexer, get_lexer_by_name
 )
 from pygments.formatters import HtmlFormatter
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Optional, Tuple, Union
+import hashlib
+from utils import LRUCache
+from utils.bundle import GeneratedFile, as_bundle, language_for, mime_type_for
+from utils.constants import (
+    HIGHLIGHT_CACHE_MAX_BYTES,
+    HIGHLIGHT_CACHE_MAX_ENTRIES,
+    HIGHLIGHT_MAX_CHARS,
+    PREVIEW_MAX_LINES
+)
+
+
+# Lexers are stateless, so one instance per language is shared by all calls
+_LEXERS = {
+    '.ts': TypeScriptLexer(),
+    '.toml': TOMLLexer(),
+    '.json': JsonLexer(),
+    '.md': MarkdownLexer(),
+    '.sh': BashLexer(),
+}
+_TEXT_LEXER = get_lexer_by_name('text')
+
+# Highlighted HTML keyed by (content hash, lexer, style), shared by all sessions
+highlight_cache = LRUCache(max_entries=HIGHLIGHT_CACHE_MAX_ENTRIES, max_bytes=HIGHLIGHT_CACHE_MAX_BYTES)
 
 
 def get_lexer_for_file(filename: str):
@@ -17,71 +41,120 @@ def get_lexer_for_file(filename: str):
         filename: Filename to determine lexer
 
     Returns:
-        Pygments lexer
+        Shared Pygments lexer instance
     """
-    if filename.endswith('.ts'):
-        return TypeScriptLexer()
-    elif filename.endswith('.toml'):
-        return TOMLLexer()
-    elif filename.endswith('.json'):
-        return JsonLexer()
-    elif filename.endswith('.md'):
-        return MarkdownLexer()
-    elif filename.endswith('.sh'):
-        return BashLexer()
-    else:
-        return get_lexer_by_name('text')
+    for extension, lexer in _LEXERS.items():
+        if filename.endswith(extension):
+            return lexer
+    return _TEXT_LEXER
+
+
+@lru_cache(maxsize=None)
+def get_formatter(style: str = 'monokai') -> HtmlFormatter:
+    """
+    Get the shared HTML formatter for a style.
+
+    Args:
+        style: Pygments style name
+
+    Returns:
+        HtmlFormatter instance
+    """
+    return HtmlFormatter(
+        style=style,
+        noclasses=True,
+        linenos='table',
+        cssclass='highlight'
+    )
 
 
-def syntax_highlight(code: str, filename: str) -> str:
+def syntax_highlight(code: str, filename: str, style: str = 'monokai', digest: Optional[str] = None) -> str:
     """
-    Apply syntax highlighting to code.
+    Apply syntax highlighting to code, reusing cached HTML for unchanged content.
 
     Args:
         code: Code to highlight
         filename: Filename to determine language
+        style: Pygments style name
+        digest: Precomputed sha256 of ``code`` (e.g. GeneratedFile.sha256)
 
     Returns:
         HTML with syntax highlighting
     """
     lexer = get_lexer_for_file(filename)
-    formatter = HtmlFormatter(
-        style='monokai',
-        noclasses=True,
-        linenos='table',
-        cssclass='highlight'
+    key = (digest or hashlib.sha256(code.encode('utf-8')).hexdigest(), lexer.name, style)
+    return highlight_cache.get_or_create(key, lambda: highlight(code, lexer, get_formatter(style)))
+
+
+def _preview(file: GeneratedFile, preview_lines: int) -> Tuple[str, Optional[str]]:
+    """
+    Get the text to display, truncated to the preview window unless expanded.
+
+    Returns:
+        Tuple of (text, sha256 of the text if it is the whole file)
+    """
+    if file.lines <= preview_lines:
+        return file.content, file.sha256
+
+    show_all = st.toggle(
+        f"Show all {file.lines:,} lines",
+        key=f"show_all_{file.path}",
+        help="Large files are truncated in the preview; downloads always contain the full file"
     )
-    return highlight(code, lexer, formatter)
+    if show_all:
+        return file.content, file.sha256
+
+    st.caption(f"Showing the first {preview_lines} of {file.lines:,} lines")
+    preview = '\n'.join(file.content.splitlines()[:preview_lines])
+
+    # Close a code fence cut in half so the rest of the page renders normally
+    if file.language == 'markdown' and preview.count('```') % 2:
+        preview += '\n```'
+    return preview, None
 
 
-def render_code_tab(filename: str, code: str, show_download: bool = True):
+def render_code_tab(
+    filename: str,
+    code: Union[str, GeneratedFile],
+    show_download: bool = True,
+    preview_lines: Optional[int] = None
+):
     """
     Render a single code tab with syntax highlighting.
 
     Args:
         filename: Name of the file
-        code: File content
+        code: File content, or its GeneratedFile record from a Bundle
         show_download: Whether to show download button
+        preview_lines: Lines shown before "show all" (defaults to PREVIEW_MAX_LINES)
     """
+    file = code if isinstance(code, GeneratedFile) else GeneratedFile(filename, code)
+    preview_lines = preview_lines or PREVIEW_MAX_LINES
+
     # Show file info
     st.markdown(f"**File:** `{filename}`")
-    st.caption(f"📏 {len(code)} characters, {len(code.splitlines())} lines")
+    st.caption(f"📏 {file.chars} characters, {file.lines} lines")
+
+    shown, digest = _preview(file, preview_lines)
 
     # Code display with syntax highlighting
-    if filename.endswith('.md'):
+    if file.language == 'markdown':
         # Render markdown directly
-        st.markdown(code)
+        st.markdown(shown)
+    elif len(shown) <= HIGHLIGHT_MAX_CHARS:
+        # Pygments HTML, cached across reruns and sessions
+        st.markdown(syntax_highlight(shown, filename, digest=digest), unsafe_allow_html=True)
     else:
-        # Use syntax highlighting
-        st.code(code, language=get_language_name(filename), line_numbers=True)
+        # Large files are left to the browser-side highlighter
+        st.code(shown, language=file.language, line_numbers=True)
 
     # Download button
     if show_download:
         st.download_button(
             label=f"⬇️ Download {filename}",
-            data=code,
+            data=file.data,
             file_name=filename,
-            mime=get_mime_type(filename),
+            mime=file.mime_type,
             key=f"download_{filename}"
         )
 
@@ -96,22 +169,7 @@ def get_language_name(filename: str) -> str:
     Returns:
         Language identifier
     """
-    if filename.endswith('.ts'):
-        return 'typescript'
-    elif filename.endswith('.js'):
-        return 'javascript'
-    elif filename.endswith('.toml'):
-        return 'toml'
-    elif filename.endswith('.json'):
-        return 'json'
-    elif filename.endswith('.md'):
-        return 'markdown'
-    elif filename.endswith('.sh'):
-        return 'bash'
-    elif filename.endswith('.yml') or filename.endswith('.yaml'):
-        return 'yaml'
-    else:
-        return 'text'
+    return language_for(filename)
 
 
 def get_mime_type(filename: str) -> str:
@@ -124,25 +182,12 @@ def get_mime_type(filename: str) -> str:
     Returns:
         MIME type string
     """
-    if filename.endswith('.ts'):
-        return 'application/typescript'
-    elif filename.endswith('.js'):
-        return 'application/javascript'
-    elif filename.endswith('.json'):
-        return 'application/json'
-    elif filename.endswith('.toml'):
-        return 'application/toml'
-    elif filename.endswith('.md'):
-        return 'text/markdown'
-    elif filename.endswith('.sh'):
-        return 'application/x-sh'
-    else:
-        return 'text/plain'
+    return mime_type_for(filename)
 
 
 def render_code_tabs(files: Dict[str, str], worker_type: str = "standard"):
     """
-    Render multiple code tabs with worker type awareness.
+    Render a file selector and the preview of the selected file.
 
     Args:
         files: Dictionary mapping filenames to content
@@ -170,12 +215,18 @@ def render_code_tabs(files: Dict[str, str], worker_type: str = "standard"):
     else:
         tab_icons = {filename: '📄' for filename in tab_names}
 
-    tabs = st.tabs([f"{tab_icons.get(name, '📄')} {name}" for name in tab_names])
+    # Only the selected file is rendered; the others cost nothing per rerun.
+    # Select by label: the testing framework cannot round-trip format_func options
+    labels = {f"{tab_icons.get(name, '📄')} {name}": name for name in tab_names}
+    selected = labels[st.radio(
+        "Generated file",
+        options=list(labels),
+        horizontal=True,
+        key="code_preview_file",
+        label_visibility="collapsed"
+    )]
 
-    # Render each tab
-    for tab, (filename, content) in zip(tabs, files.items()):
-        with tab:
-            render_code_tab(filename, content)
+    render_code_tab(selected, as_bundle(files).file(selected))
 
 
 def render_preview_panel(files: Dict[str, str]):
@@ -247,9 +298,10 @@ def show_file_stats(files: Dict[str, str]):
     if not files:
         return
 
-    total_lines = sum(len(content.splitlines()) for content in files.values())
-    total_chars = sum(len(content) for content in files.values())
-    total_size_kb = total_chars / 1024
+    bundle = as_bundle(files)
+    total_lines = bundle.total_lines
+    total_chars = bundle.total_chars
+    total_size_kb = bundle.total_size / 1024
 
     col1, col2, col3, col4 = st.columns(4)
 
@@ -0,0 +1,97 @@
+"""Per-rerun timing and the sidebar diagnostics panel."""
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+import streamlit as st
+from utils.metrics import metrics
+
+
+# Session state keys: timings being collected, and those of the last full rerun
+TIMINGS_KEY = '_rerun_timings'
+LAST_TIMINGS_KEY = '_last_rerun_timings'
+RERUN_START_KEY = '_rerun_start'
+
+
+def start_rerun() -> None:
+    """Start timing a full app rerun; the previous rerun's timings become the last ones."""
+    st.session_state[LAST_TIMINGS_KEY] = st.session_state.get(TIMINGS_KEY, {})
+    st.session_state[TIMINGS_KEY] = {}
+    st.session_state[RERUN_START_KEY] = time.perf_counter()
+
+
+@contextmanager
+def section(name: str) -> Iterator[None]:
+    """
+    Time one UI section.
+
+    Recorded in the ``section.<name>_ms`` histogram and in this session's
+    timings for the diagnostics panel.
+
+    Args:
+        name: Section name
+    """
+    timings = st.session_state.setdefault(TIMINGS_KEY, {})
+    with metrics.timer(f"section.{name}_ms", into=timings):
+        yield
+
+
+def finish_rerun(**fields) -> Dict[str, float]:
+    """
+    Record the rerun's total duration and write it to the structured log.
+
+    Args:
+        **fields: Extra values for the log record
+
+    Returns:
+        Section timings of this rerun in milliseconds
+    """
+    timings = st.session_state.setdefault(TIMINGS_KEY, {})
+    start = st.session_state.get(RERUN_START_KEY)
+    if start is not None:
+        timings['rerun_ms'] = (time.perf_counter() - start) * 1000
+        metrics.observe('rerun_ms', timings['rerun_ms'])
+    metrics.inc('reruns')
+    metrics.emit('rerun', timings=timings, **fields)
+    metrics.maybe_flush()
+    return timings
+
+
+def _ms(value) -> str:
+    """Format milliseconds for display."""
+    return '-' if value is None else f"{value:,.1f}"
+
+
+def render_diagnostics_panel() -> None:
+    """Render timing diagnostics in the sidebar (off by default)."""
+    if not st.toggle("Show diagnostics", value=False, key='show_diagnostics'):
+        return
+
+    snapshot = metrics.snapshot()
+
+    st.markdown("**Last rerun (this session)**")
+    last = st.session_state.get(LAST_TIMINGS_KEY, {})
+    if last:
+        st.table([
+            {"Section": name.removeprefix('section.').removesuffix('_ms'), "ms": _ms(value)}
+            for name, value in sorted(last.items(), key=lambda item: -item[1])
+        ])
+    else:
+        st.caption("No completed rerun yet.")
+
+    st.markdown("**All sessions**")
+    histograms = snapshot['histograms']
+    if histograms:
+        st.table([
+            {
+                "Metric": name,
+                "Count": stats['count'],
+                "p50": _ms(stats['p50']),
+                "p95": _ms(stats['p95']),
+                "Max": _ms(stats['max'])
+            }
+            for name, stats in histograms.items()
+        ])
+    counters = snapshot['counters']
+    if counters:
+        st.caption(" · ".join(f"{name}: {value:,}" for name, value in counters.items()))
@@ -1,56 +1,122 @@
 """Download and file management components."""
 import streamlit as st
-import zipfile
-import io
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 import json
+import os
+import tempfile
+import weakref
+from generators.fleet_generator import parse_fleet_configs, write_fleet_archive
+from utils import (
+    Bundle,
+    FileDiff,
+    LRUCache,
+    bundle_fingerprint,
+    bundle_patch,
+    diff_bundles,
+    export_config_json,
+    is_placeholder,
+    load_bundle
+)
+from utils.archive import (
+    ARCHIVE_FORMATS,
+    LEVELED_METHODS,
+    ArchiveResult,
+    build_tar_gz,
+    build_zip,
+    extend_zip,
+    read_archive
+)
+from utils.metrics import SIZE_BUCKETS_BYTES, metrics
+from utils.zip_writer import PARALLEL_METHODS, build_zip_parallel
+from utils.constants import (
+    ARCHIVE_CACHE_MAX_BYTES,
+    ARCHIVE_CACHE_MAX_ENTRIES,
+    ARCHIVE_COMPRESSION_OPTIONS,
+    ARCHIVE_FORMAT_OPTIONS
+)
+
+
+# Archive bytes keyed by bundle fingerprint. Module level, so every rerun and
+# every session downloading the same bundle shares one compressed copy.
+archive_cache = LRUCache(
+    max_entries=ARCHIVE_CACHE_MAX_ENTRIES,
+    max_bytes=ARCHIVE_CACHE_MAX_BYTES,
+    sizeof=lambda result: result.compressed_size
+)
+
+
+def build_zip_archive(
+    files: Dict[str, str],
+    worker_name: str,
+    compression: str = 'deflate',
+    level: Optional[int] = None
+) -> ArchiveResult:
+    """
+    Build ZIP archive with all generated files and report size and build time.
 
+    Args:
+        files: Dictionary mapping filenames to content
+        worker_name: Worker name for ZIP filename
+        compression: Compression method (stored, deflate, bzip2, lzma)
+        level: Compression level 1-9 for deflate/bzip2, or None for the default
 
-def create_zip_archive(files: Dict[str, str], worker_name: str) -> bytes:
+    Returns:
+        ArchiveResult
+    """
+    if isinstance(files, Bundle) and files.compress and compression in PARALLEL_METHODS:
+        # Reuse the bundle's precompressed entries (same bytes as build_zip)
+        return build_zip_parallel(files, f"{worker_name}/", compression, level, workers=1)
+    return build_zip(files, f"{worker_name}/", compression, level)
+
+
+def create_zip_archive(
+    files: Dict[str, str],
+    worker_name: str,
+    compression: str = 'deflate',
+    level: Optional[int] = None
+) -> bytes:
     """
     Create ZIP archive with all generated files.
 
     Args:
         files: Dictionary mapping filenames to content
         worker_name: Worker name for ZIP filename
+        compression: Compression method (stored, deflate, bzip2, lzma)
+        level: Compression level 1-9 for deflate/bzip2, or None for the default
 
     Returns:
         ZIP file as bytes
     """
-    zip_buffer = io.BytesIO()
+    return build_zip_archive(files, worker_name, compression, level).data
 
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        # Add all files to ZIP
-        for filepath, content in files.items():
-            # Create proper path structure
-            zip_path = f"{worker_name}/{filepath}"
-            zip_file.writestr(zip_path, content)
 
-    return zip_buffer.getvalue()
-
-
-def create_deployment_package(files: Dict[str, str], worker_name: str) -> bytes:
+def build_tar_archive(files: Dict[str, str], worker_name: str, level: Optional[int] = None) -> ArchiveResult:
     """
-    Create deployment package with all files and setup instructions.
+    Build tar.gz archive with all generated files.
 
     Args:
         files: Dictionary mapping filenames to content
-        worker_name: Worker name for package
+        worker_name: Worker name for the top-level directory
+        level: Gzip level 1-9, or None for the default
 
     Returns:
-        ZIP file as bytes with deployment-ready structure
+        ArchiveResult
     """
-    zip_buffer = io.BytesIO()
+    return build_tar_gz(files, f"{worker_name}/", level)
 
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        # Add all worker files
-        for filepath, content in files.items():
-            zip_path = f"{worker_name}/{filepath}"
-            zip_file.writestr(zip_path, content)
 
-        # Add quick start guide
-        quick_start = f"""# Quick Start Guide - {worker_name}
+def quick_start_guide(worker_name: str) -> str:
+    """
+    Render the QUICK_START.md added to deployment packages.
+
+    Args:
+        worker_name: Worker name
+
+    Returns:
+        Markdown content
+    """
+    return f"""# Quick Start Guide - {worker_name}
 
 ## 1. Extract & Setup
 ```bash
@@ -77,9 +143,192 @@ See README.md for detailed email routing setup instructions.
 ## Support
 Generated by email-to-sms-streamlit-generator
 """
-        zip_file.writestr(f"{worker_name}/QUICK_START.md", quick_start)
 
-    return zip_buffer.getvalue()
+
+def build_deployment_package(
+    files: Dict[str, str],
+    worker_name: str,
+    compression: str = 'deflate',
+    level: Optional[int] = None,
+    base: Optional[ArchiveResult] = None
+) -> ArchiveResult:
+    """
+    Build deployment package with all files and setup instructions.
+
+    The package is derived from the plain ZIP archive: its compressed entries
+    are copied as-is and only QUICK_START.md is compressed.
+
+    Args:
+        files: Dictionary mapping filenames to content
+        worker_name: Worker name for package
+        compression: Compression method (stored, deflate, bzip2, lzma)
+        level: Compression level 1-9 for deflate/bzip2, or None for the default
+        base: Already-built ZIP archive of ``files`` (built if omitted)
+
+    Returns:
+        ArchiveResult
+    """
+    if base is None:
+        base = build_zip_archive(files, worker_name, compression, level)
+
+    return extend_zip(
+        base,
+        {'QUICK_START.md': quick_start_guide(worker_name)},
+        f"{worker_name}/",
+        compression,
+        level
+    )
+
+
+def create_deployment_package(
+    files: Dict[str, str],
+    worker_name: str,
+    compression: str = 'deflate',
+    level: Optional[int] = None
+) -> bytes:
+    """
+    Create deployment package with all files and setup instructions.
+
+    Args:
+        files: Dictionary mapping filenames to content
+        worker_name: Worker name for package
+        compression: Compression method (stored, deflate, bzip2, lzma)
+        level: Compression level 1-9 for deflate/bzip2, or None for the default
+
+    Returns:
+        ZIP file as bytes with deployment-ready structure
+    """
+    return build_deployment_package(files, worker_name, compression, level).data
+
+
+def _recorded(kind: str, result: ArchiveResult) -> ArchiveResult:
+    """Record a newly built archive's size and build time in the metrics."""
+    metrics.inc(f"archive.{kind}.built")
+    metrics.observe(f"archive.{kind}.size_bytes", result.compressed_size, SIZE_BUCKETS_BYTES)
+    metrics.observe(f"archive.{kind}.build_ms", result.duration * 1000)
+    return result
+
+
+def get_zip_archive(
+    files: Dict[str, str],
+    worker_name: str,
+    compression: str = 'deflate',
+    level: Optional[int] = None
+) -> ArchiveResult:
+    """
+    Get ZIP archive for a bundle, compressing only on a cache miss.
+
+    Args:
+        files: Dictionary mapping filenames to content
+        worker_name: Worker name for ZIP filename
+        compression: Compression method (stored, deflate, bzip2, lzma)
+        level: Compression level 1-9 for deflate/bzip2, or None for the default
+
+    Returns:
+        ArchiveResult
+    """
+    key = ('zip', compression, level, bundle_fingerprint(files, worker_name))
+    return archive_cache.get_or_create(
+        key, lambda: _recorded('zip', build_zip_archive(files, worker_name, compression, level))
+    )
+
+
+def get_tar_archive(files: Dict[str, str], worker_name: str, level: Optional[int] = None) -> ArchiveResult:
+    """
+    Get tar.gz archive for a bundle, compressing only on a cache miss.
+
+    Args:
+        files: Dictionary mapping filenames to content
+        worker_name: Worker name for the top-level directory
+        level: Gzip level 1-9, or None for the default
+
+    Returns:
+        ArchiveResult
+    """
+    key = ('tar.gz', level, bundle_fingerprint(files, worker_name))
+    return archive_cache.get_or_create(key, lambda: _recorded('tar.gz', build_tar_archive(files, worker_name, level)))
+
+
+def get_deployment_package(
+    files: Dict[str, str],
+    worker_name: str,
+    compression: str = 'deflate',
+    level: Optional[int] = None
+) -> ArchiveResult:
+    """
+    Get deployment package for a bundle, compressing only on a cache miss.
+
+    Args:
+        files: Dictionary mapping filenames to content
+        worker_name: Worker name for package
+        compression: Compression method (stored, deflate, bzip2, lzma)
+        level: Compression level 1-9 for deflate/bzip2, or None for the default
+
+    Returns:
+        ArchiveResult
+    """
+    key = ('deploy', compression, level, bundle_fingerprint(files, worker_name))
+    return archive_cache.get_or_create(
+        key,
+        lambda: _recorded('deploy', build_deployment_package(
+            files, worker_name, compression, level,
+            base=get_zip_archive(files, worker_name, compression, level)
+        ))
+    )
+
+
+def render_archive_options():
+    """
+    Render archive format and compression options.
+
+    Returns:
+        Tuple of (archive format, compression method, level or None)
+    """
+    col1, col2, col3 = st.columns(3)
+
+    # Select by label: the testing framework cannot round-trip format_func options
+    with col1:
+        formats = {label: fmt for fmt, label in ARCHIVE_FORMAT_OPTIONS.items()}
+        archive_format = formats[st.selectbox(
+            "Archive Format",
+            options=list(formats),
+            key="archive_format",
+            help="The deployment package is always a ZIP archive"
+        )]
+
+    with col2:
+        methods = {label: method for method, label in ARCHIVE_COMPRESSION_OPTIONS.items()}
+        compression = methods[st.selectbox(
+            "ZIP Compression",
+            options=list(methods),
+            key="archive_compression",
+            help="Trade archive size against build time"
+        )]
+
+    # Tarballs are always gzip (deflate) compressed
+    leveled = compression in LEVELED_METHODS or archive_format == 'tar.gz'
+    level = None
+    with col3:
+        if leveled:
+            level = st.slider(
+                "Compression Level",
+                min_value=1,
+                max_value=9,
+                value=9 if compression == 'bzip2' else 6,
+                key=f"archive_level_{compression}",
+                help="Higher levels produce smaller archives but take longer"
+            )
+
+    return archive_format, compression, level
+
+
+def _archive_caption(result: ArchiveResult) -> str:
+    """Describe archive size and build time."""
+    return (
+        f"{result.compressed_size / 1024:.1f} KB "
+        f"({result.ratio:.0%} of {result.uncompressed_size / 1024:.1f} KB), "
+        f"built in {result.duration * 1000:.0f} ms · SHA-256 {result.sha256[:12]}"
+    )
 
 
 def render_download_section(files: Dict[str, str], worker_name: str, worker_type: str = "standard"):
@@ -97,36 +346,48 @@ def render_download_section(files: Dict[str, str], worker_name: str, worker_type
     st.markdown("---")
     st.subheader("⬇️ Download & Deploy")
 
+    with st.expander("🗜️ Archive Options"):
+        archive_format, compression, level = render_archive_options()
+
+    # The level slider may be the tarball's gzip level; stored and lzma ZIPs take none
+    zip_level = level if compression in LEVELED_METHODS else None
+
     col1, col2, col3 = st.columns(3)
 
     with col1:
-        # Download as ZIP
-        zip_data = create_zip_archive(files, worker_name)
-        download_label = "📦 Download All Files (.zip)"
+        # Download as ZIP or tarball
+        if archive_format == 'tar.gz':
+            archive = get_tar_archive(files, worker_name, level)
+        else:
+            archive = get_zip_archive(files, worker_name, compression, zip_level)
+
+        download_label = f"📦 Download All Files (.{archive_format})"
         if worker_type == "email":
-            download_label = "📧 Download Email Worker (.zip)"
+            download_label = f"📧 Download Email Worker (.{archive_format})"
 
         st.download_button(
             label=download_label,
-            data=zip_data,
-            file_name=f"{worker_name}.zip",
-            mime="application/zip",
-            help="Download all files as a ZIP archive",
+            data=archive.data,
+            file_name=f"{worker_name}.{archive_format}",
+            mime=ARCHIVE_FORMATS[archive_format],
+            help="Download all files as a single archive",
             use_container_width=True
         )
+        st.caption(_archive_caption(archive))
 
     with col2:
         # Download deployment package
         if worker_type == "email":
-            deployment_package = create_deployment_package(files, worker_name)
+            deployment_package = get_deployment_package(files, worker_name, compression, zip_level)
             st.download_button(
                 label="🚀 Deployment Package",
-                data=deployment_package,
+                data=deployment_package.data,
                 file_name=f"{worker_name}-deploy.zip",
                 mime="application/zip",
                 help="Download ready-to-deploy package with dependencies",
                 use_container_width=True
             )
+            st.caption(_archive_caption(deployment_package))
         else:
             st.button(
                 "📄 Download Individual Files",
@@ -386,6 +647,114 @@ def render_copy_buttons(files: Dict[str, str]):
             )
 
 
+def _diff_uploaded_archive(uploaded, files: Dict[str, str]) -> Optional[List[FileDiff]]:
+    """
+    Diff an uploaded archive against the bundle, once per upload and bundle.
+
+    The result is kept in session state keyed by the upload's file_id and
+    the bundle fingerprint, so reruns skip reading, hashing and diffing.
+
+    Args:
+        uploaded: Streamlit UploadedFile holding a .zip or .tar.gz
+        files: Dictionary mapping filenames to content
+
+    Returns:
+        FileDiff per path, or None if the archive is empty
+
+    Raises:
+        ValueError: If the archive cannot be read
+    """
+    key = (uploaded.file_id, bundle_fingerprint(files))
+    cached = st.session_state.get('diff_upload_cache')
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    previous = read_archive(uploaded.getvalue())
+    # Deployment packages add a guide that is never part of the bundle
+    if 'QUICK_START.md' not in files:
+        previous.pop('QUICK_START.md', None)
+
+    diffs = diff_bundles(previous, files) if previous else None
+    st.session_state['diff_upload_cache'] = (key, diffs)
+    return diffs
+
+
+def render_diff_section(files: Dict[str, str], worker_name: str):
+    """
+    Render changes against the previous generation or a previously downloaded archive.
+
+    Args:
+        files: Dictionary mapping filenames to content
+        worker_name: Worker name for the patch filename
+    """
+    if not files:
+        return
+
+    with st.expander("🔀 Changes Since Last Download"):
+        source = st.radio(
+            "Compare against",
+            options=["Previous generation", "Uploaded archive"],
+            horizontal=True,
+            key="diff_source"
+        )
+
+        diffs = None
+        if source == "Uploaded archive":
+            uploaded = st.file_uploader(
+                "Upload previous archive",
+                type=['zip', 'gz', 'tgz'],
+                help="The .zip or .tar.gz you downloaded and deployed before",
+                key="diff_archive_uploader"
+            )
+            if uploaded:
+                try:
+                    diffs = _diff_uploaded_archive(uploaded, files)
+                except ValueError as e:
+                    st.error(f"❌ {str(e)}")
+                    return
+        else:
+            previous = load_bundle(st.session_state.get('previous_files'))
+            if previous:
+                diffs = diff_bundles(previous, files)
+            else:
+                st.info("💡 Generate again after changing a setting, or upload the archive you deployed.")
+
+        if not diffs:
+            return
+
+        changed = [diff for diff in diffs if diff.status != 'unchanged']
+        if not changed:
+            st.success("✅ No changes")
+            return
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("📁 Files Changed", len(changed))
+        with col2:
+            st.metric("➕ Lines Added", sum(diff.added for diff in changed))
+        with col3:
+            st.metric("➖ Lines Removed", sum(diff.removed for diff in changed))
+
+        st.download_button(
+            label="📝 Download Patch",
+            data=bundle_patch(diffs),
+            file_name=f"{worker_name}.patch",
+            mime="text/x-diff",
+            help="Apply from the worker directory with `git apply` or `patch -p1`"
+        )
+
+        # Only the selected file's diff is rendered
+        icons = {'added': '🟢', 'removed': '🔴', 'modified': '🟡'}
+        labels = {f"{icons[diff.status]} {diff.path} (+{diff.added} -{diff.removed})": diff for diff in changed}
+        selected = labels[st.radio(
+            "Changed file",
+            options=list(labels),
+            key="diff_file",
+            label_visibility="collapsed"
+        )]
+        st.code(selected.patch, language="diff")
+
+
 def render_import_section():
     """
     Render configuration import section (available at app start).
@@ -436,6 +805,122 @@ def render_import_section():
             st.exception(e)
 
 
+class _FleetArchive:
+    """A built fleet archive on disk, removed when the session drops it."""
+
+    def __init__(self, upload_id: str, entries: list):
+        self.upload_id = upload_id
+        self.entries = entries
+        with tempfile.NamedTemporaryFile(prefix='fleet-', suffix='.zip', delete=False) as archive:
+            self.path = archive.name
+        self._finalizer = weakref.finalize(self, _remove_file, self.path)
+
+    def discard(self) -> None:
+        """Delete the archive file now."""
+        self._finalizer()
+
+
+def _remove_file(path: str) -> None:
+    """Delete a file if it still exists."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def render_fleet_section():
+    """
+    Render fleet download: one archive for many tenant configurations.
+    The archive holds a directory per worker plus manifest.json.
+    """
+    with st.expander("🏢 Fleet Download (multiple workers)"):
+        st.caption(
+            "Upload a JSON array or JSON Lines file of exported configurations "
+            "to download one archive with a directory per worker and a manifest."
+        )
+
+        uploaded_file = st.file_uploader(
+            "Upload Tenant Configurations",
+            type=['json', 'jsonl'],
+            help="Configurations exported with the Save Configuration feature",
+            key="fleet_uploader"
+        )
+
+        worker_types = {"Standard Worker": "standard", "Email Worker": "email"}
+        worker_type = worker_types[st.radio(
+            "Worker Type",
+            options=list(worker_types),
+            horizontal=True,
+            key="fleet_worker_type"
+        )]
+
+        # Drop an archive built from a different (or removed) upload
+        fleet = st.session_state.get('fleet_archive')
+        if fleet and (uploaded_file is None or uploaded_file.file_id != fleet.upload_id):
+            fleet.discard()
+            del st.session_state['fleet_archive']
+            fleet = None
+
+        if uploaded_file and st.button("🏗️ Build Fleet Archive", key="fleet_build"):
+            try:
+                configs = parse_fleet_configs(uploaded_file.getvalue())
+            except ValueError as e:
+                st.error(f"❌ {str(e)}")
+                return
+
+            progress = st.progress(0.0, text=f"Generating {len(configs)} workers...")
+
+            def on_progress(completed, entry):
+                progress.progress(
+                    completed / len(configs),
+                    text=f"Generated {completed}/{len(configs)}: {entry.worker_name}"
+                )
+
+            if fleet:
+                fleet.discard()
+            fleet = _FleetArchive(uploaded_file.file_id, [])
+
+            # Workers are streamed to a file one at a time; the session keeps only its path
+            with open(fleet.path, 'wb') as archive:
+                fleet.entries = write_fleet_archive(configs, archive, worker_type, on_progress=on_progress)
+            st.session_state['fleet_archive'] = fleet
+
+        if fleet:
+            _render_fleet_download(fleet)
+
+
+def _render_fleet_download(fleet: _FleetArchive):
+    """
+    Render the results of a built fleet archive and a one-shot download.
+
+    st.download_button copies its data into Streamlit's media storage on
+    every run that renders it, so the archive is only offered on the run
+    after "Prepare Download" is clicked and released on the next rerun.
+    """
+    failed = [entry for entry in fleet.entries if entry.status != 'ok']
+
+    st.success(f"✅ Generated {len(fleet.entries) - len(failed)} of {len(fleet.entries)} workers")
+    for entry in failed:
+        st.warning(f"⚠️ {entry.worker_name}: {entry.error}")
+
+    if st.button("📥 Prepare Download", key="fleet_prepare", use_container_width=True):
+        with open(fleet.path, 'rb') as archive:
+            st.download_button(
+                label="📦 Download Fleet Archive (.zip)",
+                data=archive,
+                file_name="fleet.zip",
+                mime="application/zip",
+                help="One directory per worker plus manifest.json",
+                use_container_width=True
+            )
+        st.caption("The download link is removed when the page next updates.")
+
+
+def _unless_placeholder(value) -> str:
+    """Return value, or an empty string if it is a redacted export placeholder."""
+    return '' if is_placeholder(value) else (value or '')
+
+
 def apply_imported_config(config_dict: dict):
     """
     Apply imported configuration to session state.
@@ -454,9 +939,9 @@ def apply_imported_config(config_dict: dict):
     # Map Twilio settings
     if 'twilio' in config_dict:
         twilio = config_dict['twilio']
-        st.session_state['twilio_sid'] = twilio.get('account_sid', '')
-        st.session_state['twilio_token'] = twilio.get('auth_token', '')
-        st.session_state['twilio_phone'] = twilio.get('phone_number', '')
+        st.session_state['twilio_sid'] = _unless_placeholder(twilio.get('account_sid', ''))
+        st.session_state['twilio_token'] = _unless_placeholder(twilio.get('auth_token', ''))
+        st.session_state['twilio_phone'] = _unless_placeholder(twilio.get('phone_number', ''))
     
     # Map routing settings
     if 'routing' in config_dict:
@@ -506,7 +991,7 @@ def apply_imported_config(config_dict: dict):
         integrations = config_dict['integrations']
         st.session_state['url_shorten'] = integrations.get('enable_url_shortening', False)
         st.session_state['error_notify'] = integrations.get('enable_error_notifications', False)
-        st.session_state['notify_email'] = integrations.get('notification_email', '')
+        st.session_state['notify_email'] = _unless_placeholder(integrations.get('notification_email', ''))
 
 
 def render_export_options(config):
@@ -521,19 +1006,34 @@ def render_export_options(config):
     col1, col2 = st.columns(2)
 
     with col1:
-        # Export as JSON
-        config_json = config.to_dict()
-        json_str = json.dumps(config_json, indent=2)
+        include_credentials = st.checkbox(
+            "Include credentials",
+            value=False,
+            key="export_include_credentials",
+            help="Write the Twilio credentials, phone number, Cloudflare API token and "
+                 "notification email into the file instead of placeholders"
+        )
+
+        # Export as JSON, streamed straight from the config
+        json_str = export_config_json(config, redact=not include_credentials)
 
         st.download_button(
             label="📥 Export Configuration as JSON",
             data=json_str,
             file_name=f"{config.basic.worker_name}-config.json",
             mime="application/json",
-            help="Save configuration for later reuse - can be imported on next use",
+            help="Save configuration for later reuse",
             use_container_width=True
         )
 
+        if include_credentials:
+            st.warning("⚠️ The exported file contains your credentials in plain text. Store it securely.")
+        else:
+            st.caption(
+                "🔒 Credentials are replaced with placeholders. "
+                "Re-enter them after importing this file."
+            )
+
     with col2:
         st.info("💡 **Tip:** Export your configuration to reuse it later with the Import feature at the top of the page.")
 
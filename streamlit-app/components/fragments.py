@@ -0,0 +1,48 @@
+"""
+Streamlit fragment support.
+
+A fragment is a function whose widgets rerun only that function instead of
+the whole script. ``st.fragment`` was added in Streamlit 1.37 and
+``st.experimental_fragment`` in 1.33; on older releases ``fragment`` leaves
+the function unchanged and every interaction reruns the full app as before.
+"""
+from typing import Callable, Optional
+
+import streamlit as st
+
+
+def resolve_fragment(module=st) -> Optional[Callable]:
+    """
+    Find the fragment decorator provided by a Streamlit module.
+
+    Args:
+        module: Streamlit module to inspect
+
+    Returns:
+        ``st.fragment``, ``st.experimental_fragment`` or None if unsupported
+    """
+    return getattr(module, 'fragment', None) or getattr(module, 'experimental_fragment', None)
+
+
+_FRAGMENT = resolve_fragment()
+
+# Whether widgets inside fragments rerun independently of the app
+FRAGMENTS_SUPPORTED = _FRAGMENT is not None
+
+
+def fragment(func: Callable) -> Callable:
+    """
+    Render a function as a Streamlit fragment when supported.
+
+    Fragments cannot return values on their own reruns, so fragment
+    functions here store their results in session state.
+
+    Args:
+        func: Function to decorate
+
+    Returns:
+        Fragment function, or ``func`` unchanged on older Streamlit releases
+    """
+    if _FRAGMENT is None:
+        return func
+    return _FRAGMENT(func)
@@ -6,11 +6,12 @@ from utils import (
     validate_worker_name, validate_domain, validate_email,
     validate_phone_number, validate_twilio_sid, validate_twilio_token,
     validate_email_pattern, validate_sender_whitelist,
-    sanitize_user_input, validate_api_credentials,
+    sanitize_user_input, validate_api_credentials, cached_validation,
     PHONE_EXTRACTION_METHODS, CONTENT_SOURCE_OPTIONS,
-    LOG_STORAGE_TYPES, BACKOFF_STRATEGIES, HELP_TEXT,
-    generate_example_email
+    RATE_LIMIT_STORAGE_TYPES, LOG_STORAGE_TYPES, BACKOFF_STRATEGIES, HELP_TEXT,
+    SMS_SEGMENT_PRICE_USD, generate_example_email, analyze_sms
 )
+from .fragments import FRAGMENTS_SUPPORTED, fragment
 
 
 def render_basic_settings() -> BasicConfig:
@@ -35,7 +36,7 @@ def render_basic_settings() -> BasicConfig:
 
         # Sanitize and validate worker name
         worker_name = sanitize_user_input(worker_name, max_length=63)
-        is_valid, error = validate_worker_name(worker_name)
+        is_valid, error = cached_validation(validate_worker_name, worker_name)
         if not is_valid and worker_name:
             st.error(f"❌ {error}")
         elif worker_name:
@@ -53,7 +54,7 @@ def render_basic_settings() -> BasicConfig:
 
         # Sanitize and validate domain
         domain = sanitize_user_input(domain, max_length=255)
-        is_valid, error = validate_domain(domain)
+        is_valid, error = cached_validation(validate_domain, domain)
         if not is_valid and domain:
             st.error(f"❌ {error}")
         elif domain:
@@ -107,7 +108,7 @@ def render_twilio_config() -> TwilioConfig:
         )
 
         # Validate Twilio SID
-        is_valid, error = validate_twilio_sid(account_sid)
+        is_valid, error = cached_validation(validate_twilio_sid, account_sid)
         if not is_valid and account_sid:
             st.error(f"❌ {error}")
         elif account_sid:
@@ -123,7 +124,7 @@ def render_twilio_config() -> TwilioConfig:
         )
 
         # Validate auth token
-        is_valid, error = validate_twilio_token(auth_token)
+        is_valid, error = cached_validation(validate_twilio_token, auth_token)
         if not is_valid and auth_token:
             st.error(f"❌ {error}")
         elif auth_token:
@@ -138,7 +139,7 @@ def render_twilio_config() -> TwilioConfig:
         )
 
         # Validate phone number
-        is_valid, error = validate_phone_number(phone_number)
+        is_valid, error = cached_validation(validate_phone_number, phone_number)
         if not is_valid and phone_number:
             st.error(f"❌ {error}")
         elif phone_number:
@@ -151,6 +152,39 @@ def render_twilio_config() -> TwilioConfig:
     )
 
 
+def render_segment_indicator(max_length: int):
+    """
+    Render live SMS segment and cost estimate for the max message length.
+
+    Args:
+        max_length: Maximum message length in characters
+    """
+    gsm = analyze_sms('a' * max_length, encoding='GSM-7')
+    ucs = analyze_sms('a' * max_length, encoding='UCS-2')
+    st.caption(
+        f"📏 Up to {gsm.segments} segment(s) (~${gsm.estimated_cost(SMS_SEGMENT_PRICE_USD):.4f}) "
+        f"for GSM-7 text, {ucs.segments} segment(s) "
+        f"(~${ucs.estimated_cost(SMS_SEGMENT_PRICE_USD):.4f}) if it contains Unicode"
+    )
+
+    sample = st.text_input(
+        "Preview a sample message",
+        value="",
+        placeholder="Type a message to check its encoding and segments",
+        key='sms_preview_input'
+    )
+
+    if sample:
+        info = analyze_sms(sample[:max_length])
+        st.caption(
+            f"🔤 {info.encoding}: {info.units} {info.unit_name}, "
+            f"{info.segments} segment(s), ~${info.estimated_cost(SMS_SEGMENT_PRICE_USD):.4f}"
+        )
+        if info.non_gsm_chars:
+            offending = ' '.join(repr(char) for char in info.non_gsm_chars[:10])
+            st.caption(f"⚠️ Non-GSM characters force UCS-2: {offending}")
+
+
 def render_routing_options() -> EmailRoutingConfig:
     """
     Render email routing options section.
@@ -198,7 +232,7 @@ def render_routing_options() -> EmailRoutingConfig:
             key='max_length_input'
         )
 
-        st.caption(f"📏 Approximately {max_length // 160} SMS segment(s)")
+        render_segment_indicator(max_length)
 
         col1, col2 = st.columns(2)
 
@@ -228,10 +262,13 @@ def render_routing_options() -> EmailRoutingConfig:
     )
 
 
-def render_advanced_features() -> tuple[RateLimitConfig, LoggingConfig, SecurityConfig, RetryConfig, IntegrationConfig]:
+def render_advanced_features(defer_validation: bool = False) -> tuple[RateLimitConfig, LoggingConfig, SecurityConfig, RetryConfig, IntegrationConfig]:
     """
     Render advanced features section.
 
+    Args:
+        defer_validation: Validate the sender whitelist only when its form is submitted
+
     Returns:
         Tuple of (RateLimitConfig, LoggingConfig, SecurityConfig, RetryConfig, IntegrationConfig)
     """
@@ -269,7 +306,9 @@ def render_advanced_features() -> tuple[RateLimitConfig, LoggingConfig, Security
 
             rate_storage = st.selectbox(
                 "Rate Limit Storage",
-                options=['kv', 'memory'],
+                # The app generates Standard Workers, which cannot host a Durable Object
+                options=[key for key in RATE_LIMIT_STORAGE_TYPES if key != 'durable_objects'],
+                format_func=lambda x: RATE_LIMIT_STORAGE_TYPES[x],
                 index=0,
                 help="KV = persistent, Memory = resets on worker restart",
                 key='rate_storage_input'
@@ -328,15 +367,27 @@ def render_advanced_features() -> tuple[RateLimitConfig, LoggingConfig, Security
 
         whitelist_emails = []
         if enable_whitelist:
-            whitelist_text = st.text_area(
-                "Allowed Sender Emails (one per line)",
-                placeholder="user1@example.com\nuser2@example.com",
-                help="Only these emails can send SMS",
-                key='whitelist_input'
-            )
+            if defer_validation:
+                # Edits are held by the browser until submitted, so large lists
+                # are not re-sent and re-validated while typing
+                with st.form("whitelist_form"):
+                    whitelist_text = st.text_area(
+                        "Allowed Sender Emails (one per line)",
+                        placeholder="user1@example.com\nuser2@example.com",
+                        help="Only these emails can send SMS",
+                        key='whitelist_input'
+                    )
+                    st.form_submit_button("✅ Validate Whitelist")
+            else:
+                whitelist_text = st.text_area(
+                    "Allowed Sender Emails (one per line)",
+                    placeholder="user1@example.com\nuser2@example.com",
+                    help="Only these emails can send SMS",
+                    key='whitelist_input'
+                )
 
             # Validate whitelist
-            is_valid, error, emails = validate_sender_whitelist(whitelist_text)
+            is_valid, error, emails = cached_validation(validate_sender_whitelist, whitelist_text)
             if not is_valid:
                 st.error(f"❌ {error}")
             elif emails:
@@ -420,7 +471,7 @@ def render_advanced_features() -> tuple[RateLimitConfig, LoggingConfig, Security
 
             # Validate notification email
             if notification_email:
-                is_valid, error = validate_email(notification_email)
+                is_valid, error = cached_validation(validate_email, notification_email)
                 if not is_valid:
                     st.error(f"❌ {error}")
                 else:
@@ -458,69 +509,174 @@ def render_advanced_features() -> tuple[RateLimitConfig, LoggingConfig, Security
     )
 
 
-def render_form() -> tuple[WorkerConfig, list[str]]:
+# Session state key holding each section's (config, validation errors)
+FORM_SECTIONS_KEY = '_form_sections'
+
+# Session state key set while render_form runs as part of a full app rerun
+FORM_FULL_RUN_KEY = '_form_full_run'
+
+
+def validate_basic_settings(basic: BasicConfig) -> list[str]:
     """
-    Render complete configuration form.
+    Validate basic settings.
+
+    Args:
+        basic: Basic settings
 
     Returns:
-        Tuple of (Complete WorkerConfig, list of validation errors)
+        List of validation errors
     """
-    validation_errors = []
+    errors = []
 
-    # Render all sections and collect validation errors
-    basic = render_basic_settings()
-    twilio = render_twilio_config()
-    routing = render_routing_options()
-    rate_limit, logging, security, retry, integrations = render_advanced_features()
-
-    # Validate basic settings
     if basic.worker_name:
-        is_valid, error = validate_worker_name(basic.worker_name)
+        is_valid, error = cached_validation(validate_worker_name, basic.worker_name)
         if not is_valid:
-            validation_errors.append(f"Worker Name: {error}")
+            errors.append(f"Worker Name: {error}")
 
     if basic.domain:
-        is_valid, error = validate_domain(basic.domain)
+        is_valid, error = cached_validation(validate_domain, basic.domain)
         if not is_valid:
-            validation_errors.append(f"Domain: {error}")
+            errors.append(f"Domain: {error}")
     else:
-        validation_errors.append("Domain is required")
+        errors.append("Domain is required")
+
+    return errors
+
+
+def validate_twilio_config(twilio: TwilioConfig) -> list[str]:
+    """
+    Validate Twilio configuration.
+
+    Args:
+        twilio: Twilio configuration
+
+    Returns:
+        List of validation errors
+    """
+    errors = []
 
-    # Validate Twilio config
     if twilio.account_sid:
-        is_valid, error = validate_twilio_sid(twilio.account_sid)
+        is_valid, error = cached_validation(validate_twilio_sid, twilio.account_sid)
         if not is_valid:
-            validation_errors.append(f"Twilio SID: {error}")
+            errors.append(f"Twilio SID: {error}")
     else:
-        validation_errors.append("Twilio Account SID is required")
+        errors.append("Twilio Account SID is required")
 
     if twilio.auth_token:
-        is_valid, error = validate_twilio_token(twilio.auth_token)
+        is_valid, error = cached_validation(validate_twilio_token, twilio.auth_token)
         if not is_valid:
-            validation_errors.append(f"Twilio Token: {error}")
+            errors.append(f"Twilio Token: {error}")
     else:
-        validation_errors.append("Twilio Auth Token is required")
+        errors.append("Twilio Auth Token is required")
 
     if twilio.phone_number:
-        is_valid, error = validate_phone_number(twilio.phone_number)
+        is_valid, error = cached_validation(validate_phone_number, twilio.phone_number)
         if not is_valid:
-            validation_errors.append(f"Twilio Phone: {error}")
+            errors.append(f"Twilio Phone: {error}")
     else:
-        validation_errors.append("Twilio Phone Number is required")
+        errors.append("Twilio Phone Number is required")
+
+    return errors
+
+
+def validate_advanced_features(security: SecurityConfig, integrations: IntegrationConfig) -> list[str]:
+    """
+    Validate advanced features.
+
+    Args:
+        security: Security configuration
+        integrations: Integration configuration
+
+    Returns:
+        List of validation errors
+    """
+    errors = []
 
     # Validate security whitelist if enabled
     if security.enable_sender_whitelist:
         if not security.sender_whitelist or len(security.sender_whitelist) == 0:
-            validation_errors.append("Sender whitelist is enabled but no emails configured")
+            errors.append("Sender whitelist is enabled but no emails configured")
 
     # Validate integrations
     if integrations.enable_error_notifications:
         if not integrations.notification_email:
-            validation_errors.append("Notification email is required when error notifications are enabled")
+            errors.append("Notification email is required when error notifications are enabled")
         else:
-            is_valid, error = validate_email(integrations.notification_email)
+            is_valid, error = cached_validation(validate_email, integrations.notification_email)
             if not is_valid:
-                validation_errors.append(f"Notification Email: {error}")
+                errors.append(f"Notification Email: {error}")
+
+    return errors
+
+
+def _store_section(name: str, config, errors: list[str]) -> None:
+    """
+    Store a section's result for render_form.
+
+    When a section reruns on its own as a fragment and its validation errors
+    change, the whole app is rerun so the error list and Generate button
+    stay in sync. Edits that leave the errors unchanged stay within the
+    section.
+
+    Args:
+        name: Section name
+        config: Section configuration
+        errors: Section validation errors
+    """
+    sections = st.session_state.setdefault(FORM_SECTIONS_KEY, {})
+    previous = sections.get(name)
+    sections[name] = (config, errors)
+
+    full_run = st.session_state.get(FORM_FULL_RUN_KEY, False)
+    if FRAGMENTS_SUPPORTED and not full_run and previous is not None and previous[1] != errors:
+        st.rerun()
+
+
+@fragment
+def _basic_section() -> None:
+    """Basic settings fragment."""
+    basic = render_basic_settings()
+    _store_section('basic', basic, validate_basic_settings(basic))
+
+
+@fragment
+def _twilio_section() -> None:
+    """Twilio configuration fragment."""
+    twilio = render_twilio_config()
+    _store_section('twilio', twilio, validate_twilio_config(twilio))
+
+
+@fragment
+def _routing_section() -> None:
+    """Email routing fragment."""
+    _store_section('routing', render_routing_options(), [])
+
+
+@fragment
+def _advanced_section(defer_validation: bool) -> None:
+    """Advanced features fragment."""
+    advanced = render_advanced_features(defer_validation)
+    _store_section('advanced', advanced, validate_advanced_features(advanced[2], advanced[4]))
+
+
+def collect_form() -> tuple[WorkerConfig, list[str]]:
+    """
+    Build the configuration from the sections last rendered by render_form.
+
+    Fragments rerun without render_form, so code outside the form reads
+    the current values through this instead of the config render_form
+    returned on the last full rerun.
+
+    Returns:
+        Tuple of (Complete WorkerConfig, list of validation errors)
+    """
+    sections = st.session_state[FORM_SECTIONS_KEY]
+    basic, basic_errors = sections['basic']
+    twilio, twilio_errors = sections['twilio']
+    routing, _ = sections['routing']
+    (rate_limit, logging, security, retry, integrations), advanced_errors = sections['advanced']
+
+    validation_errors = basic_errors + twilio_errors + advanced_errors
 
     # Build complete config
     config = WorkerConfig(
@@ -535,3 +691,32 @@ def render_form() -> tuple[WorkerConfig, list[str]]:
     )
 
     return config, validation_errors
+
+
+def render_form(defer_validation: bool = False) -> tuple[WorkerConfig, list[str]]:
+    """
+    Render complete configuration form.
+
+    Each section is a fragment (see components.fragments), so editing a
+    field reruns only its own section. Validation results are cached per
+    validator and input value, so fields that did not change since the
+    last rerun are not re-validated.
+
+    Args:
+        defer_validation: Validate expensive inputs (the sender whitelist)
+            only when their form is submitted
+
+    Returns:
+        Tuple of (Complete WorkerConfig, list of validation errors)
+    """
+    # Render all sections; each stores its config and validation errors
+    st.session_state[FORM_FULL_RUN_KEY] = True
+    try:
+        _basic_section()
+        _twilio_section()
+        _routing_section()
+        _advanced_section(defer_validation)
+    finally:
+        st.session_state[FORM_FULL_RUN_KEY] = False
+
+    return collect_form()
@@ -1,4 +1,5 @@
 """Generator modules."""
-from .code_generator import CodeGenerator
+from .code_generator import CodeGenerator, generation_jobs, submit_generation
+from .fleet_generator import FleetEntry, parse_fleet_configs, write_fleet_archive
 
-__all__ = ['CodeGenerator']
+__all__ = ['CodeGenerator', 'generation_jobs', 'submit_generation', 'FleetEntry', 'parse_fleet_configs', 'write_fleet_archive']
@@ -1,10 +1,42 @@
 """Main code generator orchestrator."""
+import json
 import os
+import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
 from jinja2 import Environment, FileSystemLoader, Template
 from markupsafe import escape
 from schemas import WorkerConfig
+from utils.bundle import Bundle
+from utils.constants import GENERATION_WORKERS, RATE_LIMIT_STORAGE_TYPES
+from utils.jobs import Job, JobCancelled, JobScheduler
+from utils.metrics import metrics
+from utils.secret_scanner import scan_bundle
+
+
+# Called after each generated file with (completed count, total files, filename)
+FileProgressCallback = Callable[[int, int, str], None]
+
+
+def _to_json_filter(value):
+    """Convert Python value to JSON string."""
+    return json.dumps(value)
+
+
+@lru_cache(maxsize=None)
+def _get_environment() -> Environment:
+    """Get the process-wide Jinja2 environment (caches compiled templates)."""
+    template_dir = Path(__file__).parent.parent / "templates"
+    env = Environment(
+        loader=FileSystemLoader(str(template_dir)),
+        trim_blocks=True,
+        lstrip_blocks=True
+    )
+
+    # Custom filters
+    env.filters['tojson'] = _to_json_filter
+    return env
 
 
 class CodeGenerator:
@@ -20,21 +52,12 @@ class CodeGenerator:
         self.config = config
         self.config.update_metadata()
 
-        # Setup Jinja2 environment
-        template_dir = Path(__file__).parent.parent / "templates"
-        self.env = Environment(
-            loader=FileSystemLoader(str(template_dir)),
-            trim_blocks=True,
-            lstrip_blocks=True
-        )
-
-        # Custom filters
-        self.env.filters['tojson'] = self._to_json_filter
+        # Jinja2 environment shared by all generators, so templates are compiled once
+        self.env = _get_environment()
 
     def _to_json_filter(self, value):
         """Convert Python value to JSON string."""
-        import json
-        return json.dumps(value)
+        return _to_json_filter(value)
 
     def _sanitize_value(self, value: Any) -> Any:
         """
@@ -105,7 +128,11 @@ class CodeGenerator:
             'integrations': self.config.integrations,
             'cloudflare': self.config.cloudflare,
             'features': self.config.features,
-            'metadata': self.config.metadata
+            'metadata': self.config.metadata,
+            'global_counter': {
+                'shards': self.config.rate_limit.get_global_shard_count(),
+                'overshoot': self.config.rate_limit.get_global_overshoot()
+            }
         }
 
         # Sanitize context to prevent template injection
@@ -267,38 +294,98 @@ class CodeGenerator:
         """
         return self._render_template('email-worker/utils.ts.j2')
 
-    def generate_all_email_worker(self) -> Dict[str, str]:
+    def generate_email_rate_limiter(self) -> str:
         """
-        Generate all Email Worker files.
+        Generate the rate limiter Durable Object for Email Worker.
 
         Returns:
-            Dictionary mapping filenames to content for Email Worker
-        """
-        files = {
-            'src/index.ts': self.generate_email_worker_code(),
-            'src/types.ts': self.generate_email_types(),
-            'src/utils.ts': self.generate_email_utils(),
-            'wrangler.toml': self.generate_email_wrangler_config(),
-            'package.json': self.generate_email_package_json(),
-            'tsconfig.json': self.generate_tsconfig(),
-            '.env.example': self.generate_email_env_example(),
-            '.gitignore': self.generate_gitignore(),
-            'README.md': self.generate_email_readme(),
-            'deploy.sh': self.generate_email_deploy_script()
-        }
+            TypeScript Durable Object class
+        """
+        return self._render_template('email-worker/rate-limiter.ts.j2')
+
+    def _check_for_secrets(self, files: Dict[str, str]) -> None:
+        """
+        Post-generation gate: refuse bundles containing hardcoded secrets.
+
+        Args:
+            files: Dictionary mapping filenames to content
+
+        Raises:
+            RuntimeError: If any file contains a potential secret
+        """
+        findings = scan_bundle(files)
+        if findings:
+            details = '; '.join(str(finding) for finding in findings)
+            raise RuntimeError(f"Generated files contain hardcoded secrets: {details}")
+
+    def _render_files(self, plan: List[Tuple[str, Callable[[], str]]], progress: Optional[FileProgressCallback]) -> Dict[str, str]:
+        """
+        Render files in order, reporting progress after each one.
+
+        Args:
+            plan: List of (filename, render function) pairs
+            progress: Optional callback (see FileProgressCallback)
 
+        Returns:
+            Dictionary mapping filenames to content
+        """
+        files = {}
+        for filename, render in plan:
+            files[filename] = render()
+            if progress:
+                progress(len(files), len(plan), filename)
         return files
 
-    def generate_all(self) -> Dict[str, str]:
+    def generate_all_email_worker(self, compress: bool = False, progress: Optional[FileProgressCallback] = None) -> Bundle:
+        """
+        Generate all Email Worker files.
+
+        Args:
+            compress: Also precompress each file for archive downloads
+            progress: Called after each file with (completed, total, filename)
+
+        Returns:
+            Bundle mapping filenames to content for Email Worker
+
+        Raises:
+            RuntimeError: If a generated file contains a hardcoded secret
+        """
+        plan = [
+            ('src/index.ts', self.generate_email_worker_code),
+            ('src/types.ts', self.generate_email_types),
+            ('src/utils.ts', self.generate_email_utils),
+            ('wrangler.toml', self.generate_email_wrangler_config),
+            ('package.json', self.generate_email_package_json),
+            ('tsconfig.json', self.generate_tsconfig),
+            ('.env.example', self.generate_email_env_example),
+            ('.gitignore', self.generate_gitignore),
+            ('README.md', self.generate_email_readme),
+            ('deploy.sh', self.generate_email_deploy_script)
+        ]
+        rate_limit = self.config.rate_limit
+        if rate_limit.enabled and rate_limit.storage == "durable_objects":
+            plan.insert(3, ('src/rate-limiter.ts', self.generate_email_rate_limiter))
+
+        files = self._render_files(plan, progress)
+
+        self._check_for_secrets(files)
+
+        return Bundle(files, compress=compress)
+
+    def generate_all(self, compress: bool = False, progress: Optional[FileProgressCallback] = None) -> Bundle:
         """
         Generate all files with validation.
 
+        Args:
+            compress: Also precompress each file for archive downloads
+            progress: Called after each file with (completed, total, filename)
+
         Returns:
-            Dictionary mapping filenames to content
+            Bundle mapping filenames to content
 
         Raises:
             ValueError: If configuration is invalid
-            RuntimeError: If file generation fails
+            RuntimeError: If file generation fails or a secret is detected
         """
         # Pre-validation
         is_valid, errors = self.validate_config()
@@ -306,23 +393,25 @@ class CodeGenerator:
             raise ValueError(f"Invalid configuration: {', '.join(errors)}")
 
         try:
-            files = {
-                'src/index.ts': self.generate_worker_code(),
-                'wrangler.toml': self.generate_wrangler_config(),
-                'package.json': self.generate_package_json(),
-                'tsconfig.json': self.generate_tsconfig(),
-                '.env.example': self.generate_env_example(),
-                '.gitignore': self.generate_gitignore(),
-                'README.md': self.generate_readme(),
-                'deploy.sh': self.generate_deploy_script()
-            }
+            files = self._render_files([
+                ('src/index.ts', self.generate_worker_code),
+                ('wrangler.toml', self.generate_wrangler_config),
+                ('package.json', self.generate_package_json),
+                ('tsconfig.json', self.generate_tsconfig),
+                ('.env.example', self.generate_env_example),
+                ('.gitignore', self.generate_gitignore),
+                ('README.md', self.generate_readme),
+                ('deploy.sh', self.generate_deploy_script)
+            ], progress)
 
             # Validate that all files have content
             for filename, content in files.items():
                 if not content or len(content.strip()) == 0:
                     raise RuntimeError(f"Generated file '{filename}' is empty")
 
-            return files
+            self._check_for_secrets(files)
+
+            return Bundle(files, compress=compress)
 
         except Exception as e:
             raise RuntimeError(f"File generation failed: {str(e)}") from e
@@ -368,6 +457,25 @@ class CodeGenerator:
             if self.config.rate_limit.per_recipient < 1:
                 errors.append("Rate limit per recipient must be at least 1")
 
+            if self.config.rate_limit.max_staleness_seconds < 0:
+                errors.append("Rate limit staleness cannot be negative")
+
+            if self.config.rate_limit.local_cache_entries < 1:
+                errors.append("Rate limit local cache must hold at least 1 entry")
+
+            if self.config.rate_limit.global_limit < 1:
+                errors.append("Global rate limit must be at least 1")
+
+            if self.config.rate_limit.expected_peak_per_second <= 0:
+                errors.append("Expected peak email rate must be positive")
+
+            if self.config.rate_limit.storage not in RATE_LIMIT_STORAGE_TYPES:
+                errors.append(f"Unknown rate limit storage: {self.config.rate_limit.storage}")
+
+            # Service-worker format cannot export a Durable Object class
+            if self.config.rate_limit.storage == "durable_objects":
+                errors.append("Durable Object rate limiting requires the Email Worker")
+
         # Validate retry config
         if self.config.retry.enabled:
             if self.config.retry.max_retries < 1 or self.config.retry.max_retries > 5:
@@ -382,3 +490,44 @@ class CodeGenerator:
                 errors.append("Notification email is required when error notifications are enabled")
 
         return len(errors) == 0, errors
+
+
+# Generation jobs from every session share these workers
+generation_jobs = JobScheduler(workers=GENERATION_WORKERS)
+
+
+def submit_generation(config: WorkerConfig, owner: Hashable, worker_type: str = "standard") -> Job:
+    """
+    Generate a precompressed bundle in the background.
+
+    Progress is reported per file and the job can be cancelled between
+    files. The job result is the Bundle.
+
+    Args:
+        config: Worker configuration
+        owner: Owner (session) to schedule the job under
+        worker_type: "standard" or "email"
+
+    Returns:
+        Queued Job
+    """
+    generator = CodeGenerator(config)
+    generate = generator.generate_all_email_worker if worker_type == "email" else generator.generate_all
+
+    submitted = time.perf_counter()
+
+    def run(job: Job) -> Bundle:
+        metrics.observe('generation.queue_ms', (time.perf_counter() - submitted) * 1000)
+        try:
+            with metrics.timer('generation.latency_ms'):
+                bundle = generate(compress=True, progress=job.update)
+        except JobCancelled:
+            metrics.inc('generation.cancelled')
+            raise
+        except Exception:
+            metrics.inc('generation.failed')
+            raise
+        metrics.inc('generation.completed')
+        return bundle
+
+    return generation_jobs.submit(run, owner, label=config.basic.worker_name)
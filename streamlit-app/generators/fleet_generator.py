@@ -0,0 +1,144 @@
+"""Fleet bundle generation: many tenant workers in one streamed archive."""
+import json
+from dataclasses import asdict, dataclass
+from typing import BinaryIO, Callable, Dict, Iterable, List, Optional, Union
+
+from schemas import WorkerConfig
+from utils import bundle_fingerprint, validate_worker_name
+from utils.zip_writer import ParallelZipWriter
+
+from .code_generator import CodeGenerator
+
+
+MANIFEST_FILENAME = 'manifest.json'
+
+# Called after each worker with (completed count, entry)
+ProgressCallback = Callable[[int, 'FleetEntry'], None]
+
+
+@dataclass
+class FleetEntry:
+    """Manifest record for one tenant worker."""
+    worker_name: str
+    domain: str = ''
+    status: str = 'ok'
+    files: int = 0
+    fingerprint: str = ''
+    error: str = ''
+
+
+def parse_fleet_configs(data: Union[str, bytes]) -> List[dict]:
+    """
+    Parse an uploaded list of tenant configurations.
+
+    Accepts a JSON array of exported configurations, an object with a
+    ``workers`` array, or JSON Lines with one configuration per line.
+
+    Args:
+        data: Uploaded file contents
+
+    Returns:
+        List of configuration dictionaries
+
+    Raises:
+        ValueError: If the contents are not a list of configuration objects
+    """
+    if isinstance(data, bytes):
+        data = data.decode('utf-8')
+
+    try:
+        parsed = json.loads(data)
+    except json.JSONDecodeError:
+        try:
+            parsed = [json.loads(line) for line in data.splitlines() if line.strip()]
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid fleet file: {e}") from e
+
+    if isinstance(parsed, dict):
+        parsed = parsed.get('workers', [parsed])
+
+    if not isinstance(parsed, list) or not all(isinstance(item, dict) for item in parsed):
+        raise ValueError("Fleet file must contain a list of configuration objects")
+
+    return parsed
+
+
+def _generate(config_dict: dict, worker_type: str) -> Dict[str, str]:
+    """Generate one tenant bundle."""
+    generator = CodeGenerator(WorkerConfig.from_dict(config_dict))
+    if worker_type == 'email':
+        return generator.generate_all_email_worker()
+    return generator.generate_all()
+
+
+def write_fleet_archive(
+    configs: Iterable[dict],
+    fp: BinaryIO,
+    worker_type: str = 'standard',
+    compression: str = 'deflate',
+    level: Optional[int] = None,
+    on_progress: Optional[ProgressCallback] = None
+) -> List[FleetEntry]:
+    """
+    Stream a fleet archive with one directory per worker plus a manifest.
+
+    Workers are generated and compressed one at a time and written straight
+    to ``fp``, so memory stays flat regardless of fleet size. A worker that
+    fails to generate is recorded in the manifest and skipped.
+
+    Args:
+        configs: Configuration dictionaries, one per tenant
+        fp: Writable binary file-like object (need not be seekable)
+        worker_type: "standard" or "email"
+        compression: 'stored' or 'deflate'
+        level: Deflate level 1-9, or None for the zlib default
+        on_progress: Called after each worker
+
+    Returns:
+        Manifest entries in input order
+    """
+    entries: List[FleetEntry] = []
+    seen = set()
+
+    with ParallelZipWriter(fp, compression, level) as writer:
+        for index, config_dict in enumerate(configs):
+            basic = config_dict.get('basic', {}) if isinstance(config_dict, dict) else {}
+            entry = FleetEntry(
+                worker_name=basic.get('worker_name') or f"worker-{index + 1}",
+                domain=basic.get('domain', '')
+            )
+
+            # Worker names become directory names, so they must be valid and unique
+            is_valid, error = validate_worker_name(entry.worker_name)
+            if not is_valid:
+                entry.status = 'error'
+                entry.error = error
+            elif entry.worker_name in seen:
+                entry.status = 'error'
+                entry.error = "Duplicate worker name"
+            else:
+                seen.add(entry.worker_name)
+                try:
+                    files = _generate(config_dict, worker_type)
+                    writer.write_files(files, prefix=f"{entry.worker_name}/")
+                    entry.files = len(files)
+                    entry.fingerprint = bundle_fingerprint(files, entry.worker_name)
+                except Exception as e:
+                    entry.status = 'error'
+                    entry.error = str(e)
+
+            entries.append(entry)
+            if on_progress:
+                on_progress(index + 1, entry)
+
+        manifest = {
+            'worker_type': worker_type,
+            'workers': [asdict(entry) for entry in entries],
+            'total': len(entries),
+            'failed': sum(1 for entry in entries if entry.status != 'ok'),
+        }
+        writer.write_entries([
+            (MANIFEST_FILENAME, MANIFEST_FILENAME, json.dumps(manifest, indent=2))
+        ])
+
+    return entries
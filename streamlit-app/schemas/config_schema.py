@@ -1,8 +1,18 @@
 """Configuration dataclass schemas."""
+import math
 from dataclasses import dataclass, field, asdict
 from typing import Optional, List, Dict
 from datetime import datetime
 
+# Cloudflare KV sustains about one write per second to the same key
+KV_WRITES_PER_KEY_PER_SECOND = 1
+
+# Seconds for a KV write to be visible in every location
+KV_PROPAGATION_SECONDS = 60
+
+# Upper bound on global rate-limit shards (each aggregated read fetches all of them)
+MAX_GLOBAL_SHARDS = 32
+
 
 @dataclass
 class BasicConfig:
@@ -38,12 +48,73 @@ class EmailRoutingConfig:
 
 @dataclass
 class RateLimitConfig:
-    """Rate limiting configuration."""
+    """
+    Rate limiting configuration.
+
+    With ``kv`` storage the Email Worker keeps recent counters in an
+    in-isolate LRU of ``local_cache_entries`` entries and reads KV only when
+    a counter is older than ``max_staleness_seconds`` or within 20% of its
+    limit. Emails an isolate has counted but not written to KV are written
+    by the next emails it handles once they are ``max_staleness_seconds``
+    old (a bounded batch per email), whichever sender or recipient those
+    emails are for. Workers run no code between requests, so an isolate
+    that handles no further email never writes them. 0 reads and writes KV
+    for every email.
+
+    KV has no compare-and-swap. Each write adds this isolate's unwritten
+    emails to the larger of its own count and a value just read from KV,
+    so counters never move backwards, but emails another isolate writes to
+    the same key in between, or that KV has not yet propagated (up to
+    ``KV_PROPAGATION_SECONDS``), are overwritten. Limits are therefore
+    approximate under concurrent traffic; use ``durable_objects`` storage
+    for exact limits.
+
+    ``global_limit`` is counted across ``get_global_shard_count()`` KV keys
+    so that no single key takes more writes than KV allows (see
+    ``get_global_overshoot()`` for how closely it is enforced).
+    ``expected_peak_per_second`` is the busiest email rate the worker
+    should handle.
+    """
     enabled: bool = True
     per_sender: int = 10
     per_recipient: int = 20
     global_limit: int = 1000
     storage: str = "kv"
+    max_staleness_seconds: int = 10
+    local_cache_entries: int = 1000
+    expected_peak_per_second: float = 5.0
+
+    def get_global_shard_count(self) -> int:
+        """
+        Get the number of KV keys the global counter is spread over.
+
+        Sized so each shard takes at most ``KV_WRITES_PER_KEY_PER_SECOND``
+        at the expected peak, assuming the worst case of one write per email
+        (``max_staleness_seconds = 0``). The local cache usually writes far
+        less often.
+
+        Returns:
+            Shard count between 1 and ``MAX_GLOBAL_SHARDS``
+        """
+        shards = math.ceil(self.expected_peak_per_second / KV_WRITES_PER_KEY_PER_SECOND)
+        return max(1, min(MAX_GLOBAL_SHARDS, shards))
+
+    def get_global_overshoot(self) -> int:
+        """
+        Estimate how many emails past ``global_limit`` may be accepted.
+
+        Each isolate sums the shards at most every ``max_staleness_seconds``
+        (on every email once the total reaches 80% of the limit), and KV
+        takes up to ``KV_PROPAGATION_SECONDS`` to show writes made in other
+        locations. Emails accepted at the expected peak during that window
+        can exceed the limit. Increments can also be lost when two isolates
+        write the same shard at once, which sharding makes less likely. Use
+        ``durable_objects`` storage for an exact limit.
+
+        Returns:
+            Approximate number of extra emails in a window at the expected peak
+        """
+        return math.ceil(self.expected_peak_per_second * (self.max_staleness_seconds + KV_PROPAGATION_SECONDS))
 
 
 @dataclass
@@ -0,0 +1,296 @@
+"""
+Concurrent-session load harness for the Streamlit app.
+
+Runs N simulated users against ``app.py`` with ``streamlit.testing``
+``AppTest``, each in its own thread: open the app, fill in the form,
+generate, then browse the preview and switch archive formats. Every script
+run is timed. The report gives per-rerun latency percentiles, memory growth
+of this process and throughput.
+
+This is a local tool, not part of the test suite (a small smoke run is in
+tests/test_load_harness.py). All sessions share one Python process, like
+users of a single Streamlit server, so they share the process-wide caches
+and background generation workers.
+
+AppTest installs process-global runtime state for the duration of each
+script run, so runs from different sessions cannot overlap; they take
+turns on a lock. Each step reports both its latency (including the wait
+for the lock, as a user would see under load) and its own run time.
+
+Usage:
+    python scripts/load_test.py --sessions 50
+    python scripts/load_test.py --sessions 20 --same-config --json report.json
+"""
+import argparse
+import gc
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+PERCENTILES = (50, 90, 95, 99)
+
+# AppTest.run swaps process-global runtime state, so script runs take turns
+_run_lock = threading.Lock()
+
+
+@dataclass
+class SessionResult:
+    """Timings for one simulated user."""
+    session: int
+    step_ms: Dict[str, float] = field(default_factory=dict)
+    run_ms: Dict[str, float] = field(default_factory=dict)
+    generated: bool = False
+    error: str = ''
+
+
+@dataclass
+class LoadReport:
+    """Aggregated load test results."""
+    sessions: int
+    concurrency: int
+    reruns: int
+    generated: int
+    errors: List[str]
+    wall_seconds: float
+    reruns_per_second: float
+    generations_per_second: float
+    latency_ms: Dict[str, float]
+    run_ms: Dict[str, float]
+    step_latency_ms: Dict[str, Dict[str, float]]
+    rss_start_mb: float
+    rss_end_mb: float
+    rss_peak_mb: float
+
+    @property
+    def rss_growth_mb(self) -> float:
+        """Resident memory growth over the run."""
+        return self.rss_end_mb - self.rss_start_mb
+
+    def to_dict(self) -> dict:
+        """Report as a JSON-serializable dictionary."""
+        return dict(asdict(self), rss_growth_mb=self.rss_growth_mb)
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """
+    Compute latency percentiles (nearest rank).
+
+    Args:
+        values: Samples
+
+    Returns:
+        Dictionary with p50/p90/p95/p99, mean and max ({} if no samples)
+    """
+    if not values:
+        return {}
+    ordered = sorted(values)
+    result = {
+        f"p{p}": ordered[min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))]
+        for p in PERCENTILES
+    }
+    result['mean'] = sum(ordered) / len(ordered)
+    result['max'] = ordered[-1]
+    return result
+
+
+def rss_mb() -> float:
+    """Current resident set size of this process in MB (peak on non-Linux)."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except (OSError, ValueError):
+        return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def _rerun(at: AppTest) -> AppTest:
+    """
+    Rerun the script.
+
+    AppTest sends selectbox state by looking the raw value up in the
+    formatted labels, which fails for selectboxes with a format_func; those
+    are kept at their defaults.
+    """
+    for selectbox in at.selectbox:
+        if str(selectbox.value) not in selectbox.options:
+            selectbox.set_value(selectbox.options[selectbox.proto.default])
+    return at.run()
+
+
+def _timed(result: SessionResult, step: str, action) -> AppTest:
+    """Run one step and record its latency and run time."""
+    start = time.perf_counter()
+    with _run_lock:
+        started = time.perf_counter()
+        at = action()
+    end = time.perf_counter()
+    result.step_ms[step] = (end - start) * 1000
+    result.run_ms[step] = (end - started) * 1000
+    if at.exception:
+        raise RuntimeError(f"{step}: {at.exception[0].message}")
+    return at
+
+
+def run_session(session: int, same_config: bool = False, timeout: float = 60) -> SessionResult:
+    """
+    Simulate one user: load, fill in the form, generate and browse downloads.
+
+    Args:
+        session: Session number (also used in the worker name)
+        same_config: Use the same configuration for every session
+        timeout: Seconds allowed per script run
+
+    Returns:
+        SessionResult with the duration of each step
+    """
+    result = SessionResult(session)
+    worker_name = "load-test-worker" if same_config else f"load-test-worker-{session}"
+    try:
+        at = AppTest.from_file(str(APP_DIR / "app.py"), default_timeout=timeout)
+        _timed(result, 'load', at.run)
+
+        at.text_input(key='worker_name_input').input(worker_name)
+        at.text_input(key='domain_input').input("example.com")
+        at.text_input(key='twilio_sid_input').input("AC" + "0123456789abcdef" * 2)
+        at.text_input(key='twilio_token_input').input("0123456789abcdef" * 2)
+        at.text_input(key='twilio_phone_input').input("+15551234567")
+        _timed(result, 'fill_form', lambda: _rerun(at))
+
+        next(button for button in at.button if "Generate Code" in button.label).click()
+        _timed(result, 'generate', lambda: _rerun(at))
+        result.generated = bool(at.session_state['generated_files'])
+        if not result.generated:
+            raise RuntimeError("generate: no files generated")
+
+        preview = at.radio(key='code_preview_file')
+        preview.set_value(preview.options[-1])
+        _timed(result, 'preview', lambda: _rerun(at))
+
+        at.selectbox(key='archive_format').set_value("Tarball (.tar.gz)")
+        _timed(result, 'download', lambda: _rerun(at))
+
+    except Exception as e:
+        result.error = f"session {session}: {e}"
+    return result
+
+
+def run_load_test(
+    sessions: int,
+    concurrency: Optional[int] = None,
+    same_config: bool = False,
+    timeout: float = 60
+) -> LoadReport:
+    """
+    Run simulated sessions concurrently.
+
+    Args:
+        sessions: Number of simulated users
+        concurrency: Sessions running at once (default: all)
+        same_config: Use the same configuration for every session
+        timeout: Seconds allowed per script run
+
+    Returns:
+        LoadReport
+    """
+    concurrency = concurrency or sessions
+    gc.collect()
+    rss_start = rss_mb()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='session') as pool:
+        results = list(pool.map(lambda n: run_session(n, same_config, timeout), range(sessions)))
+    wall = time.perf_counter() - start
+
+    gc.collect()
+    steps: Dict[str, List[float]] = {}
+    for result in results:
+        for step, ms in result.step_ms.items():
+            steps.setdefault(step, []).append(ms)
+    all_runs = [ms for values in steps.values() for ms in values]
+    run_times = [ms for result in results for ms in result.run_ms.values()]
+    generated = sum(result.generated for result in results)
+
+    return LoadReport(
+        sessions=sessions,
+        concurrency=concurrency,
+        reruns=len(all_runs),
+        generated=generated,
+        errors=[result.error for result in results if result.error],
+        wall_seconds=wall,
+        reruns_per_second=len(all_runs) / wall if wall else 0.0,
+        generations_per_second=generated / wall if wall else 0.0,
+        latency_ms=percentiles(all_runs),
+        run_ms=percentiles(run_times),
+        step_latency_ms={step: percentiles(values) for step, values in steps.items()},
+        rss_start_mb=rss_start,
+        rss_end_mb=rss_mb(),
+        rss_peak_mb=peak_rss_mb()
+    )
+
+
+def format_report(report: LoadReport) -> str:
+    """
+    Format a report as a text table.
+
+    Args:
+        report: Load test results
+
+    Returns:
+        Multi-line summary
+    """
+    columns = [f"p{p}" for p in PERCENTILES] + ['max']
+    lines = [
+        f"Sessions: {report.sessions} ({report.concurrency} concurrent), "
+        f"generated {report.generated}, errors {len(report.errors)}",
+        f"Wall time: {report.wall_seconds:.1f} s, "
+        f"{report.reruns_per_second:.1f} reruns/s, {report.generations_per_second:.2f} generations/s",
+        f"Memory: {report.rss_start_mb:.0f} MB -> {report.rss_end_mb:.0f} MB "
+        f"({report.rss_growth_mb:+.0f} MB, peak {report.rss_peak_mb:.0f} MB)",
+        "",
+        f"{'step (ms)':<12}" + "".join(f"{column:>9}" for column in columns),
+    ]
+    rows = [*report.step_latency_ms.items(), ('all', report.latency_ms), ('run only', report.run_ms)]
+    for step, stats in rows:
+        lines.append(f"{step:<12}" + "".join(f"{stats.get(column, 0):>9.0f}" for column in columns))
+    lines.extend(report.errors)
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, default=50, help="Simulated users (default: 50)")
+    parser.add_argument("--concurrency", type=int, help="Sessions running at once (default: all)")
+    parser.add_argument("--same-config", action="store_true", help="Every session uses one configuration")
+    parser.add_argument("--timeout", type=float, default=60, help="Seconds allowed per script run")
+    parser.add_argument("--json", metavar="PATH", help="Also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = run_load_test(args.sessions, args.concurrency, args.same_config, args.timeout)
+    print(format_report(report))
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report.to_dict(), indent=2))
+
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+Tests for generated file bundles.
+
+Tests precomputed per-file metadata, dict compatibility, and that archives
+built from a Bundle (including precompressed entries) are byte-identical to
+archives built from a plain dictionary.
+"""
+import hashlib
+import time
+import zlib
+import pytest
+
+from components.download_manager import build_zip_archive
+from generators import CodeGenerator
+from utils import Bundle, GeneratedFile, as_bundle, bundle_fingerprint
+from utils import zip_writer
+from utils.archive import build_tar_gz, build_zip
+from utils.zip_writer import build_zip_parallel
+
+
+@pytest.fixture
+def email_bundle(valid_worker_config):
+    """Precompressed email worker bundle."""
+    return CodeGenerator(valid_worker_config).generate_all_email_worker(compress=True)
+
+
+# ========================================
+# Metadata Tests
+# ========================================
+
+@pytest.mark.unit
+class TestGeneratedFile:
+    """Test per-file metadata."""
+
+    def test_metadata(self):
+        """Test bytes, counts, hashes and types computed at creation."""
+        content = "const café = 1;\nexport default café;\n"
+        file = GeneratedFile("src/index.ts", content, compress=True)
+
+        assert file.data == content.encode("utf-8")
+        assert file.size == len(file.data) == file.chars + 2
+        assert file.lines == 2
+        assert file.sha256 == hashlib.sha256(file.data).hexdigest()
+        assert file.crc32 == zlib.crc32(file.data)
+        assert file.mime_type == "application/typescript"
+        assert file.language == "typescript"
+        assert zlib.decompress(file.compressed, -15) == file.data
+
+    def test_slotted(self):
+        """Test that records carry no per-instance dictionary."""
+        file = GeneratedFile("a.txt", "x")
+        assert not hasattr(file, "__dict__")
+        assert not hasattr(Bundle({"a.txt": "x"}), "__dict__")
+        assert file.compressed is None
+
+    @pytest.mark.parametrize("path,mime_type,language", [
+        ("src/index.ts", "application/typescript", "typescript"),
+        ("wrangler.toml", "application/toml", "toml"),
+        ("package.json", "application/json", "json"),
+        ("README.md", "text/markdown", "markdown"),
+        ("deploy.sh", "application/x-sh", "bash"),
+        (".github/ci.yml", "text/plain", "yaml"),
+        (".env.example", "text/plain", "text"),
+        (".gitignore", "text/plain", "text"),
+    ])
+    def test_types_by_extension(self, path, mime_type, language):
+        """Test MIME type and language lookup."""
+        file = GeneratedFile(path, "")
+        assert (file.mime_type, file.language) == (mime_type, language)
+
+
+@pytest.mark.unit
+class TestBundle:
+    """Test bundle behaviour."""
+
+    def test_generators_return_bundles(self, valid_worker_config):
+        """Test that both generators return Bundles that still behave as dicts."""
+        generator = CodeGenerator(valid_worker_config)
+        for files in (generator.generate_all(), generator.generate_all_email_worker()):
+            assert isinstance(files, Bundle) and isinstance(files, dict)
+            assert files == dict(files)
+            assert [meta.path for meta in files.files()] == list(files)
+
+    def test_totals(self, email_bundle):
+        """Test bundle totals against the raw content."""
+        assert email_bundle.total_lines == sum(len(c.splitlines()) for c in email_bundle.values())
+        assert email_bundle.total_chars == sum(len(c) for c in email_bundle.values())
+        assert email_bundle.total_size == sum(len(c.encode()) for c in email_bundle.values())
+
+    def test_replaced_entry_rebuilt(self):
+        """Test that metadata follows content replaced after creation."""
+        bundle = Bundle({"a.md": "one"})
+        first = bundle.file("a.md")
+        assert bundle.file("a.md") is first
+
+        bundle["a.md"] = "one\ntwo"
+        assert bundle.file("a.md").lines == 2
+
+        bundle["b.sh"] = "echo"
+        assert bundle.file("b.sh").language == "bash"
+
+    def test_as_bundle_reuses(self, email_bundle):
+        """Test that as_bundle only wraps plain dictionaries."""
+        assert as_bundle(email_bundle) is email_bundle
+        assert isinstance(as_bundle({"a": "b"}), Bundle)
+
+
+# ========================================
+# Archive Tests
+# ========================================
+
+@pytest.mark.unit
+class TestBundleArchives:
+    """Test archive writers reading precomputed bytes."""
+
+    def test_same_bytes_as_plain_dict(self, email_bundle):
+        """Test ZIP, tar.gz and fingerprint output for Bundle vs dict input."""
+        plain = dict(email_bundle)
+
+        assert build_zip(email_bundle, "w/").data == build_zip(plain, "w/").data
+        assert build_tar_gz(email_bundle, "w/").data == build_tar_gz(plain, "w/").data
+        assert bundle_fingerprint(email_bundle, "w") == bundle_fingerprint(plain, "w")
+
+    @pytest.mark.parametrize("compression,level", [("deflate", None), ("deflate", 6), ("stored", None)])
+    def test_precompressed_entries_reused(self, email_bundle, mocker, compression, level):
+        """Test that precompressed entries skip compression and match build_zip."""
+        spy = mocker.spy(zip_writer, "_compress_entry")
+
+        result = build_zip_archive(email_bundle, "w", compression, level)
+
+        assert spy.call_count == 0
+        assert result.data == build_zip(dict(email_bundle), "w/", compression, level).data
+
+    def test_other_levels_recompress(self, email_bundle, mocker):
+        """Test that a different deflate level is not served from the precompressed bytes."""
+        spy = mocker.spy(zip_writer, "_compress_entry")
+
+        result = build_zip_parallel(email_bundle, "w/", level=9)
+
+        assert spy.call_count == len(email_bundle)
+        assert result.data == build_zip(dict(email_bundle), "w/", level=9).data
+
+
+# ========================================
+# Performance Tests
+# ========================================
+
+@pytest.mark.performance
+class TestBundleRerunCost:
+    """Per-rerun cost of reading metadata vs recomputing it."""
+
+    def test_stats_and_archive_reruns(self, email_bundle):
+        """Compare recomputing stats and archives per rerun with reading the Bundle."""
+        plain = dict(email_bundle)
+        runs = 50
+
+        start = time.perf_counter()
+        for _ in range(runs):
+            sum(len(c.splitlines()) for c in plain.values())
+            build_zip(plain, "w/")
+        recomputed = (time.perf_counter() - start) / runs
+
+        start = time.perf_counter()
+        for _ in range(runs):
+            email_bundle.total_lines
+            build_zip_archive(email_bundle, "w")
+        precomputed = (time.perf_counter() - start) / runs
+
+        print(f"email bundle: recomputed {recomputed * 1000:.2f} ms, precomputed {precomputed * 1000:.2f} ms per rerun")
+        assert precomputed < recomputed
@@ -0,0 +1,269 @@
+"""
+Tests for bundle diffs and patches.
+
+Tests per-file change detection, reading downloaded archives back, that
+generated patches apply cleanly with git, and diff speed on large files
+compared with difflib on full strings.
+"""
+import difflib
+import shutil
+import subprocess
+import time
+import pytest
+
+from components.download_manager import build_tar_archive, build_zip_archive, get_deployment_package
+from generators import CodeGenerator
+from utils import bundle_patch, diff_bundles, read_archive
+from utils.archive import build_zip
+from utils.bundle_diff import diff_lines
+
+try:
+    from streamlit.testing.v1 import AppTest
+    STREAMLIT_TESTING_AVAILABLE = True
+except ImportError:
+    STREAMLIT_TESTING_AVAILABLE = False
+    AppTest = None
+
+
+@pytest.fixture
+def bundles(valid_worker_config):
+    """Email worker bundles before and after changing one setting."""
+    old = CodeGenerator(valid_worker_config).generate_all_email_worker()
+    valid_worker_config.rate_limit.per_sender = 987
+    new = CodeGenerator(valid_worker_config).generate_all_email_worker()
+    return old, new
+
+
+# ========================================
+# Diff Tests
+# ========================================
+
+@pytest.mark.unit
+class TestDiffBundles:
+    """Test per-file change detection."""
+
+    def test_one_setting_changes_few_files(self, bundles):
+        """Test that only files mentioning the setting are reported as modified."""
+        old, new = bundles
+        diffs = {diff.path: diff for diff in diff_bundles(old, new)}
+
+        modified = [path for path, diff in diffs.items() if diff.status == 'modified']
+        assert modified and len(modified) < len(new)
+        assert all(diff.patch == '' for diff in diffs.values() if diff.status == 'unchanged')
+        assert any(line.startswith("+") and "987" in line for diff in diffs.values() for line in diff.patch.splitlines())
+
+    def test_added_and_removed_files(self):
+        """Test files present on only one side."""
+        diffs = diff_bundles({"gone.txt": "a\n", "same.txt": "x\n"}, {"new.txt": "b\n", "same.txt": "x\n"})
+
+        assert [(d.path, d.status, d.added, d.removed) for d in diffs] == [
+            ("gone.txt", "removed", 0, 1),
+            ("new.txt", "added", 1, 0),
+            ("same.txt", "unchanged", 0, 0),
+        ]
+        assert diffs[0].patch.startswith("--- a/gone.txt\n+++ /dev/null\n@@ -1 +0,0 @@\n-a\n")
+        assert diffs[1].patch.startswith("--- /dev/null\n+++ b/new.txt\n@@ -0,0 +1 @@\n+b\n")
+
+    def test_matches_difflib_format(self):
+        """Test hunk headers and context against difflib.unified_diff."""
+        old = [f"line {i}\n" for i in range(40)]
+        new = list(old)
+        new[5] = "changed\n"
+        new.insert(30, "inserted\n")
+
+        hunks, added, removed = diff_lines(old, new)
+        expected = list(difflib.unified_diff(old, new))[2:]
+
+        assert ''.join(hunks) == ''.join(expected)
+        assert (added, removed) == (2, 1)
+
+    def test_missing_final_newline(self):
+        """Test the no-newline marker."""
+        hunks, _, _ = diff_lines(["a\n", "b"], ["a\n", "c"])
+        assert hunks == ["@@ -1,2 +1,2 @@\n a\n-b\n\\ No newline at end of file\n+c\n\\ No newline at end of file\n"]
+
+
+# ========================================
+# Archive Reading Tests
+# ========================================
+
+@pytest.mark.unit
+class TestReadArchive:
+    """Test reading downloaded bundles back."""
+
+    @pytest.mark.parametrize("build", [build_zip_archive, build_tar_archive])
+    def test_round_trip(self, bundles, build):
+        """Test that ZIP and tar.gz downloads read back to the generated files."""
+        old, _ = bundles
+        assert read_archive(build(old, "my-worker").data) == old
+
+    def test_deployment_package(self, bundles):
+        """Test that the deployment package only adds its quick start guide."""
+        old, _ = bundles
+        files = read_archive(get_deployment_package(old, "my-worker").data)
+        assert set(files) - set(old) == {"QUICK_START.md"}
+
+    def test_rejects_non_archives_and_oversized(self, bundles):
+        """Test invalid uploads."""
+        with pytest.raises(ValueError):
+            read_archive(b"not an archive")
+        with pytest.raises(ValueError):
+            read_archive(build_zip(bundles[0]).data, max_size=100)
+
+
+# ========================================
+# Patch Tests
+# ========================================
+
+@pytest.mark.integration
+@pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+class TestPatchApplies:
+    """Test that generated patches apply to the previous bundle."""
+
+    def test_git_apply(self, bundles, tmp_path):
+        """Test applying the bundle patch to an extracted previous bundle."""
+        old, new = bundles
+        old = dict(old, **{"notes.txt": "no newline", "removed.md": "bye\n"})
+        new = dict(new, **{"notes.txt": "still none", "added.sh": "echo hi\n"})
+
+        for path, content in old.items():
+            target = tmp_path / path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(content)
+        (tmp_path / "bundle.patch").write_text(bundle_patch(diff_bundles(old, new)))
+
+        check = subprocess.run(
+            ["git", "apply", "--unsafe-paths", "--directory=", "bundle.patch"],
+            cwd=tmp_path, capture_output=True, text=True
+        )
+        assert check.returncode == 0, check.stderr
+
+        (tmp_path / "bundle.patch").unlink()
+        result = {
+            str(path.relative_to(tmp_path)): path.read_text()
+            for path in tmp_path.rglob("*") if path.is_file()
+        }
+        assert result == new
+
+    def test_git_apply_empty_files(self, tmp_path):
+        """Test that empty files added or removed survive git apply."""
+        old = {"README.md": "# Worker\n", "old.keep": ""}
+        new = {"README.md": "# Worker\n", "src/.keep": ""}
+
+        for path, content in old.items():
+            (tmp_path / path).write_text(content)
+        (tmp_path / "bundle.patch").write_text(bundle_patch(diff_bundles(old, new)))
+
+        check = subprocess.run(
+            ["git", "apply", "--unsafe-paths", "--directory=", "bundle.patch"],
+            cwd=tmp_path, capture_output=True, text=True
+        )
+        assert check.returncode == 0, check.stderr
+
+        assert (tmp_path / "src" / ".keep").read_text() == ""
+        assert not (tmp_path / "old.keep").exists()
+
+
+# ========================================
+# Performance Tests
+# ========================================
+
+@pytest.mark.performance
+class TestDiffPerformance:
+    """Line-hashed diffs against difflib on full strings."""
+
+    def test_large_file_diff(self):
+        """Compare diff time for a large file with a few scattered changes."""
+        old = [f"export const value{i} = {i * 7} // generated\n" for i in range(50_000)]
+        new = list(old)
+        for index in (100, 25_000, 49_000):
+            new[index] = "export const changed = true;\n"
+
+        start = time.perf_counter()
+        hunks, added, removed = diff_lines(old, new)
+        hashed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        expected = list(difflib.unified_diff(old, new))
+        naive = time.perf_counter() - start
+
+        print(f"50,000 lines: line hashing {hashed * 1000:.1f} ms, difflib {naive * 1000:.1f} ms")
+        assert (added, removed) == (3, 3)
+        assert ''.join(hunks) == ''.join(expected[2:])
+        assert hashed < 0.2
+        assert hashed < naive
+
+
+# ========================================
+# UI Tests
+# ========================================
+
+def _diff_app():
+    """Script rendering the diff section against a previous generation."""
+    import streamlit as st
+    from components.download_manager import render_diff_section
+
+    st.session_state.previous_files = {"src/index.ts": "const a = 1;\n", "old.txt": "x\n"}
+    render_diff_section({"src/index.ts": "const a = 2;\n", "new.txt": "y\n"}, "my-worker")
+
+
+def _upload_diff_app():
+    """Script diffing a fixed uploaded archive through the upload cache."""
+    import io
+    import zipfile
+    import streamlit as st
+    from components.download_manager import _diff_uploaded_archive
+
+    class Upload:
+        file_id = st.session_state.get("upload_id", "upload-1")
+
+        def getvalue(self):
+            buffer = io.BytesIO()
+            with zipfile.ZipFile(buffer, "w") as archive:
+                archive.writestr("my-worker/src/index.ts", "const a = 1;\n")
+            return buffer.getvalue()
+
+    files = {"src/index.ts": st.session_state.get("content", "const a = 2;\n")}
+    diffs = _diff_uploaded_archive(Upload(), files)
+    st.text(",".join(f"{diff.path}:{diff.status}" for diff in diffs))
+
+
+@pytest.mark.ui
+@pytest.mark.skipif(not STREAMLIT_TESTING_AVAILABLE, reason="Streamlit testing framework not available")
+class TestDiffSectionUI:
+    """Test the diff section."""
+
+    def test_previous_generation(self):
+        """Test summary metrics and the selected file's diff."""
+        at = AppTest.from_function(_diff_app)
+        at.run()
+
+        assert not at.exception
+        assert [metric.value for metric in at.metric] == ["3", "2", "2"]
+        assert at.code[0].value.startswith("--- /dev/null\n+++ b/new.txt")
+
+        at.radio[1].set_value("🟡 src/index.ts (+1 -1)").run()
+        assert not at.exception
+        assert "+const a = 2;" in at.code[0].value
+
+    def test_uploaded_archive_diffed_once(self, mocker):
+        """Test that reruns reuse the diff until the upload or bundle changes."""
+        from components import download_manager
+
+        read_spy = mocker.spy(download_manager, "read_archive")
+        diff_spy = mocker.spy(download_manager, "diff_bundles")
+
+        at = AppTest.from_function(_upload_diff_app)
+        at.run()
+        at.run()
+        assert not at.exception
+        assert at.text[0].value == "src/index.ts:modified"
+        assert (read_spy.call_count, diff_spy.call_count) == (1, 1)
+
+        at.session_state["content"] = "const a = 1;\n"
+        at.run()
+        assert at.text[0].value == "src/index.ts:unchanged"
+
+        at.session_state["upload_id"] = "upload-2"
+        at.run()
+        assert (read_spy.call_count, diff_spy.call_count) == (3, 3)
@@ -0,0 +1,155 @@
+"""
+Tests for the content-addressed bundle store.
+
+Tests deduplication across bundles, compressed storage, reference counting
+through BundleRef lifetimes, LRU eviction of unreferenced content under the
+memory cap, and memory use for many sessions with similar configurations.
+"""
+import gc
+import pytest
+
+from generators import CodeGenerator
+from utils import Bundle, BundleRef, BundleStore, load_bundle
+
+
+@pytest.fixture
+def store():
+    """Store large enough that nothing is evicted."""
+    return BundleStore(max_bytes=64 * 1024 * 1024)
+
+
+@pytest.fixture
+def email_bundle(valid_worker_config):
+    """Precompressed email worker bundle."""
+    return CodeGenerator(valid_worker_config).generate_all_email_worker(compress=True)
+
+
+# ========================================
+# Storage Tests
+# ========================================
+
+@pytest.mark.unit
+class TestBundleStore:
+    """Test storing and loading bundles."""
+
+    def test_round_trip(self, store, email_bundle):
+        """Test that a ref loads the same files, also after the loaded copy is dropped."""
+        ref = store.put(email_bundle)
+
+        assert isinstance(ref, BundleRef)
+        assert len(ref) == len(email_bundle) and list(ref) == list(email_bundle)
+        assert "src/index.ts" in ref
+        assert store.get(ref) is email_bundle
+
+        store.clear()
+        loaded = store.get(ref)
+        assert loaded is not email_bundle
+        assert isinstance(loaded, Bundle) and loaded.compress
+        assert loaded == email_bundle
+
+    def test_identical_content_stored_once(self, store, email_bundle):
+        """Test that repeated and shared files add references, not copies."""
+        first = store.put(email_bundle)
+        stored = (store.blob_count, store.total_bytes)
+
+        second = store.put(email_bundle)
+        changed = store.put(dict(email_bundle, **{"README.md": "changed\n"}))
+
+        assert (store.blob_count, store.total_bytes) > stored
+        assert store.blob_count == stored[0] + 1
+        assert first.key == second.key != changed.key
+        assert store.references(email_bundle.file("src/index.ts").sha256) == 3
+        assert store.references(email_bundle.file("README.md").sha256) == 2
+
+    def test_compressed_storage(self, email_bundle):
+        """Test that precompressed bytes are reused and smaller than raw content."""
+        compressed, raw = BundleStore(), BundleStore(compress=False)
+        refs = compressed.put(email_bundle), raw.put(email_bundle)
+
+        assert raw.total_bytes == email_bundle.total_size
+        assert compressed.total_bytes == sum(len(meta.compressed) for meta in email_bundle.files())
+        assert compressed.total_bytes < raw.total_bytes / 2
+        assert all(store.get(ref) == email_bundle for store, ref in zip((compressed, raw), refs))
+
+    def test_load_bundle_passes_dicts_through(self, store):
+        """Test that plain file maps are returned unchanged."""
+        files = {"a.txt": "x"}
+        assert load_bundle(files) is files
+        assert load_bundle(None) is None
+        assert load_bundle(store.put(files)) == files
+
+
+@pytest.mark.unit
+class TestReferenceCounting:
+    """Test reference lifetimes and eviction."""
+
+    def test_released_when_ref_collected(self, store):
+        """Test that dropping a ref (e.g. a closed session) releases its content."""
+        ref = store.put({"a.txt": "alpha"})
+        digest = ref.manifest[0][1]
+        assert store.references(digest) == 1
+
+        del ref
+        gc.collect()
+        assert store.references(digest) == 0
+        assert store.blob_count == 1
+
+    def test_released_ref_rejected(self, store):
+        """Test that a released ref can no longer be loaded."""
+        ref = store.put({"a.txt": "alpha"})
+        ref.release()
+        ref.release()
+
+        assert ref.released
+        assert store.references(ref.manifest[0][1]) == 0
+        with pytest.raises(KeyError):
+            store.get(ref)
+        with pytest.raises(KeyError):
+            BundleStore().get(store.put({"b.txt": "beta"}))
+
+    def test_evicts_unreferenced_lru_only(self):
+        """Test that the cap evicts least recently used unreferenced content."""
+        store = BundleStore(max_bytes=25, compress=False)
+        old = store.put({"old.txt": "o" * 10})
+        recent = store.put({"recent.txt": "r" * 10})
+        live = store.put({"live.txt": "l" * 10})
+        assert store.total_bytes == 30
+
+        store.put({"old.txt": "o" * 10}).release()
+        old.release()
+        recent.release()
+
+        assert store.total_bytes == 20
+        assert store.references(live.manifest[0][1]) == 1
+        assert store.references(recent.manifest[0][1]) == 0
+        assert store.get(live) == {"live.txt": "l" * 10}
+
+        big = store.put({"big.txt": "b" * 100})
+        assert store.references(big.manifest[0][1]) == 1
+        assert store.total_bytes == 110
+        assert store.get(live) == {"live.txt": "l" * 10}
+
+
+# ========================================
+# Memory Tests
+# ========================================
+
+@pytest.mark.performance
+class TestStoreMemory:
+    """Memory for many sessions regenerating similar configurations."""
+
+    def test_sessions_share_content(self, valid_worker_config):
+        """Compare per-session copies with stored content for 50 sessions."""
+        store = BundleStore()
+        refs, per_session = [], 0
+        for session in range(50):
+            valid_worker_config.rate_limit.per_sender = 10 + session % 5
+            files = CodeGenerator(valid_worker_config).generate_all_email_worker(compress=True)
+            per_session += files.total_size
+            refs.append(store.put(files))
+
+        print(
+            f"50 sessions: per-session copies {per_session / 1024:.0f} KB, "
+            f"store {store.total_bytes / 1024:.0f} KB in {store.blob_count} blobs"
+        )
+        assert store.total_bytes < per_session / 5
@@ -0,0 +1,264 @@
+"""
+Tests for code display components.
+
+Tests shared lexer and formatter instances, cached syntax highlighting,
+the st.code fallback for large files, and lazy preview rendering.
+"""
+import time
+import pytest
+from pygments import highlight
+from pygments.formatters import HtmlFormatter
+from pygments.lexers import TypeScriptLexer
+
+from components import code_display
+from components.code_display import (
+    get_formatter,
+    get_lexer_for_file,
+    highlight_cache,
+    syntax_highlight,
+)
+
+try:
+    from streamlit.testing.v1 import AppTest
+    STREAMLIT_TESTING_AVAILABLE = True
+except ImportError:
+    STREAMLIT_TESTING_AVAILABLE = False
+    AppTest = None
+
+
+@pytest.fixture(autouse=True)
+def clear_highlight_cache():
+    """Start every test with an empty highlight cache."""
+    highlight_cache.clear()
+    yield
+    highlight_cache.clear()
+
+
+@pytest.fixture
+def worker_index_ts(valid_worker_config):
+    """
+    TypeScript source of 300+ lines.
+
+    Generated index.ts is ~270 lines with every feature enabled, so the
+    email worker's utils.ts is appended to reach the size of larger outputs.
+    """
+    from generators import CodeGenerator
+
+    valid_worker_config.security.enable_sender_whitelist = True
+    valid_worker_config.security.sender_whitelist = ["alerts@example.com"]
+    valid_worker_config.security.enable_content_filtering = True
+    valid_worker_config.integrations.enable_error_notifications = True
+    valid_worker_config.integrations.notification_email = "ops@example.com"
+    files = CodeGenerator(valid_worker_config).generate_all_email_worker()
+    return files["src/index.ts"] + "\n" + files["src/utils.ts"]
+
+
+def _highlight_app():
+    """Script rendering one TypeScript tab."""
+    from components.code_display import render_code_tab
+
+    render_code_tab("src/index.ts", "const answer: number = 42;\n" * 50)
+
+
+def _email_files():
+    """Ten-file email worker bundle."""
+    from generators import CodeGenerator
+    from schemas import WorkerConfig
+
+    config = WorkerConfig.from_dict({
+        "basic": {"worker_name": "email-to-sms", "domain": "example.com"},
+        "twilio": {
+            "account_sid": "AC" + "1" * 32,
+            "auth_token": "a" * 32,
+            "phone_number": "+15551234567",
+        },
+    })
+    return CodeGenerator(config).generate_all_email_worker()
+
+
+def _preview_app():
+    """Script rendering the lazy preview of an email worker bundle."""
+    from components.code_display import render_code_tabs
+    from tests.test_code_display import _email_files
+
+    render_code_tabs(_email_files(), worker_type="email")
+
+
+def _all_tabs_app():
+    """Script rendering every file into its own tab (the eager layout)."""
+    import streamlit as st
+    from components.code_display import render_code_tab
+    from tests.test_code_display import _email_files
+
+    files = _email_files()
+    for tab, (filename, code) in zip(st.tabs(list(files)), files.items()):
+        with tab:
+            render_code_tab(filename, code, preview_lines=10**6)
+
+
+def _payload(at) -> int:
+    """Characters of markdown and code sent to the browser."""
+    return sum(len(md.value) for md in at.markdown) + sum(len(code.value) for code in at.code)
+
+
+# ========================================
+# Highlighting Tests
+# ========================================
+
+@pytest.mark.unit
+class TestSyntaxHighlight:
+    """Test cached highlighting."""
+
+    def test_lexers_and_formatter_are_shared(self):
+        """Test that lexer and formatter instances are reused."""
+        assert get_lexer_for_file("src/index.ts") is get_lexer_for_file("src/types.ts")
+        assert get_lexer_for_file("notes.txt") is get_lexer_for_file(".gitignore")
+        assert get_formatter("monokai") is get_formatter("monokai")
+        assert get_formatter("monokai") is not get_formatter("nord")
+
+    def test_output_matches_uncached_pygments(self, worker_index_ts):
+        """Test that cached highlighting produces the same HTML as Pygments."""
+        expected = highlight(
+            worker_index_ts,
+            TypeScriptLexer(),
+            HtmlFormatter(style="monokai", noclasses=True, linenos="table", cssclass="highlight")
+        )
+        assert syntax_highlight(worker_index_ts, "src/index.ts") == expected
+
+    def test_cache_key_is_content_lexer_and_style(self, worker_index_ts, mocker):
+        """Test that unchanged content is highlighted once per lexer and style."""
+        spy = mocker.spy(code_display, "highlight")
+
+        first = syntax_highlight(worker_index_ts, "src/index.ts")
+        assert syntax_highlight(worker_index_ts, "other/path.ts") is first
+        assert spy.call_count == 1
+
+        syntax_highlight(worker_index_ts, "src/index.ts", style="nord")
+        syntax_highlight(worker_index_ts, "index.json")
+        syntax_highlight(worker_index_ts + "\n", "src/index.ts")
+        assert spy.call_count == 4
+
+
+@pytest.mark.ui
+@pytest.mark.skipif(not STREAMLIT_TESTING_AVAILABLE, reason="Streamlit testing framework not available")
+class TestCodeTabRendering:
+    """Test Pygments HTML vs st.code selection."""
+
+    def test_small_file_uses_highlighted_html(self):
+        """Test that small files render cached Pygments HTML."""
+        at = AppTest.from_function(_highlight_app)
+        at.run()
+
+        assert not at.exception
+        assert len(at.code) == 0
+        assert any('class="highlight' in md.value for md in at.markdown)
+
+    def test_large_file_uses_st_code(self, mocker):
+        """Test that files above the threshold fall back to st.code."""
+        mocker.patch.object(code_display, "HIGHLIGHT_MAX_CHARS", 100)
+        at = AppTest.from_function(_highlight_app)
+        at.run()
+
+        assert not at.exception
+        assert len(at.code) == 1
+
+
+@pytest.mark.ui
+@pytest.mark.skipif(not STREAMLIT_TESTING_AVAILABLE, reason="Streamlit testing framework not available")
+class TestLazyPreview:
+    """Test that only the selected file is rendered."""
+
+    def test_only_selected_file_rendered(self):
+        """Test that the selector defaults to the first file and switches on selection."""
+        at = AppTest.from_function(_preview_app)
+        at.run()
+
+        assert not at.exception
+        assert len(at.get("download_button")) == 1
+        assert at.markdown[0].value == "**File:** `src/index.ts`"
+
+        at.radio[0].set_value("⚙️ wrangler.toml").run()
+        assert not at.exception
+        assert len(at.get("download_button")) == 1
+        assert at.markdown[0].value == "**File:** `wrangler.toml`"
+
+    def test_large_file_truncated_until_show_all(self, mocker):
+        """Test the preview window and the show-all toggle."""
+        mocker.patch.object(code_display, "PREVIEW_MAX_LINES", 20)
+        at = AppTest.from_function(_preview_app)
+        at.run()
+
+        assert not at.exception
+        assert any("Showing the first 20 of" in caption.value for caption in at.caption)
+        truncated = _payload(at)
+
+        at.toggle[0].set_value(True).run()
+        assert not at.exception
+        assert not any("Showing the first" in caption.value for caption in at.caption)
+        assert _payload(at) > truncated * 3
+
+    def test_truncated_markdown_closes_code_fence(self):
+        """Test that a README cut inside a code block stays well-formed."""
+        from components.code_display import _preview
+        from utils import GeneratedFile
+
+        readme = GeneratedFile("README.md", "# Title\n```bash\nnpm install\nnpm run deploy\n```\n")
+        preview, digest = _preview(readme, 3)
+        assert preview.endswith("npm install\n```")
+        assert digest is None
+
+
+# ========================================
+# Highlighting Benchmarks
+# ========================================
+
+@pytest.mark.performance
+class TestHighlightBenchmarks:
+    """Highlighting cost for generated index.ts."""
+
+    def test_index_ts_rerun_cost(self, worker_index_ts):
+        """Compare fresh lexer/formatter per call with cached highlighting."""
+        lines = len(worker_index_ts.splitlines())
+        assert lines >= 300
+
+        runs = 20
+        start = time.perf_counter()
+        for _ in range(runs):
+            highlight(
+                worker_index_ts,
+                TypeScriptLexer(),
+                HtmlFormatter(style="monokai", noclasses=True, linenos="table", cssclass="highlight")
+            )
+        uncached = (time.perf_counter() - start) / runs
+
+        syntax_highlight(worker_index_ts, "src/index.ts")
+        start = time.perf_counter()
+        for _ in range(runs):
+            syntax_highlight(worker_index_ts, "src/index.ts")
+        cached = (time.perf_counter() - start) / runs
+
+        print(f"index.ts ({lines} lines): uncached {uncached * 1000:.2f} ms, cached {cached * 1000:.3f} ms")
+        assert cached < uncached / 20
+
+    def test_lazy_preview_payload_and_rerun(self):
+        """Compare rendering every tab with rendering only the selected file."""
+        eager = AppTest.from_function(_all_tabs_app, default_timeout=30)
+        lazy = AppTest.from_function(_preview_app, default_timeout=30)
+
+        def rerun_time(at):
+            at.run()  # warm highlight cache
+            start = time.perf_counter()
+            for _ in range(5):
+                at.run()
+            return (time.perf_counter() - start) / 5
+
+        eager_time, lazy_time = rerun_time(eager), rerun_time(lazy)
+        assert not eager.exception and not lazy.exception
+        eager_payload, lazy_payload = _payload(eager), _payload(lazy)
+
+        print(
+            f"10-file email bundle: all tabs {eager_payload / 1024:.0f} KB / {eager_time * 1000:.0f} ms, "
+            f"selected file {lazy_payload / 1024:.0f} KB / {lazy_time * 1000:.0f} ms per rerun"
+        )
+        assert lazy_payload < eager_payload / 2
+        assert lazy_time < eager_time
@@ -415,6 +415,157 @@ class TestAccessibility:
         pytest.skip("Requires error simulation")
 
 
+# ========================================
+# Validation Caching Tests
+# ========================================
+
+LARGE_WHITELIST = "\n".join(f"sender{i}@example{i % 50}.com" for i in range(5000))
+
+
+def _form_app():
+    """Script rendering only the configuration form."""
+    import streamlit as st
+    from components.input_form import render_form
+
+    config, errors = render_form(defer_validation=st.session_state.get('defer', False))
+    st.session_state.whitelist_size = len(config.security.sender_whitelist)
+
+
+def _rerun(at):
+    """
+    Rerun the script, keeping selectboxes at their defaults.
+
+    AppTest sends selectbox state by looking the raw value up in the
+    formatted labels, which fails for selectboxes with a format_func.
+    """
+    for selectbox in at.selectbox:
+        selectbox.set_value(selectbox.options[selectbox.proto.default])
+    return at.run()
+
+
+def _load_whitelist(defer: bool = False):
+    """Run the form with the sender whitelist enabled and loaded."""
+    at = AppTest.from_function(_form_app, default_timeout=30)
+    at.session_state['defer'] = defer
+    at.run()
+    at.checkbox(key='whitelist_enabled_input').check()
+    _rerun(at)
+    at.text_area(key='whitelist_input').input(LARGE_WHITELIST)
+    _rerun(at)
+    return at
+
+
+@pytest.mark.ui
+@pytest.mark.skipif(not STREAMLIT_TESTING_AVAILABLE, reason="Streamlit testing framework not available")
+class TestValidationCachingUI:
+    """Test cached and deferred validation in render_form."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        """Start every test with an empty validation cache."""
+        from utils.validators import validation_cache
+
+        validation_cache.clear()
+        yield
+        validation_cache.clear()
+
+    def test_unchanged_whitelist_not_revalidated(self, mocker):
+        """Test that reruns from other widgets reuse the whitelist result."""
+        from utils import validators
+
+        at = _load_whitelist()
+        assert at.session_state['whitelist_size'] == 5000
+
+        spy = mocker.spy(validators, "validate_email")
+        at.number_input(key='rate_sender_input').increment()
+        _rerun(at)
+
+        assert not at.exception
+        assert spy.call_count == 0
+        assert at.session_state['whitelist_size'] == 5000
+
+    def test_deferred_whitelist_in_form(self):
+        """Test that deferred validation puts the whitelist in a submit form."""
+        at = _load_whitelist(defer=True)
+
+        assert not at.exception
+        assert len(at.button) == 1
+        assert at.session_state['whitelist_size'] == 5000
+
+
+# ========================================
+# Fragment Tests
+# ========================================
+
+@pytest.mark.unit
+class TestFragments:
+    """Test fragment detection and per-section form state."""
+
+    def test_resolve_fragment(self):
+        """Test preferring st.fragment, then st.experimental_fragment."""
+        from types import SimpleNamespace
+        from components.fragments import resolve_fragment
+
+        stable, experimental = object(), object()
+        assert resolve_fragment(SimpleNamespace(fragment=stable, experimental_fragment=experimental)) is stable
+        assert resolve_fragment(SimpleNamespace(experimental_fragment=experimental)) is experimental
+        assert resolve_fragment(SimpleNamespace()) is None
+
+    def test_fragment_falls_back_to_plain_function(self, mocker):
+        """Test that functions are left unchanged without fragment support."""
+        from components import fragments
+
+        def section():
+            return 42
+
+        mocker.patch.object(fragments, "_FRAGMENT", None)
+        assert fragments.fragment(section) is section
+
+        decorator = mocker.Mock(side_effect=lambda func: func)
+        mocker.patch.object(fragments, "_FRAGMENT", decorator)
+        fragments.fragment(section)
+        decorator.assert_called_once_with(section)
+
+    def test_section_rerun_escalates_on_error_change(self, mocker):
+        """Test that a lone section rerun reruns the app only when its errors change."""
+        from components import input_form
+
+        st = mocker.patch.object(input_form, "st")
+        st.session_state = {}
+        mocker.patch.object(input_form, "FRAGMENTS_SUPPORTED", True)
+
+        input_form._store_section('basic', 'first', [])
+        input_form._store_section('basic', 'edited', [])
+        assert st.rerun.call_count == 0
+
+        input_form._store_section('basic', 'invalid', ["Domain is required"])
+        assert st.rerun.call_count == 1
+
+        st.session_state[input_form.FORM_FULL_RUN_KEY] = True
+        input_form._store_section('basic', 'fixed', [])
+        assert st.rerun.call_count == 1
+        assert st.session_state[input_form.FORM_SECTIONS_KEY]['basic'] == ('fixed', [])
+
+
+@pytest.mark.ui
+@pytest.mark.skipif(not STREAMLIT_TESTING_AVAILABLE, reason="Streamlit testing framework not available")
+class TestFragmentFormUI:
+    """Test the form assembled from section fragments."""
+
+    def test_errors_in_section_order(self):
+        """Test that render_form collects every section's errors."""
+        at = AppTest.from_function(_form_app)
+        at.run()
+        at.text_input(key='domain_input').input("")
+        _rerun(at)
+
+        assert not at.exception
+        sections = at.session_state['_form_sections']
+        assert list(sections) == ['basic', 'twilio', 'routing', 'advanced']
+        assert sections['basic'][1] == ["Domain is required"]
+        assert "Twilio Account SID is required" in sections['twilio'][1]
+
+
 # ========================================
 # Performance Tests
 # ========================================
@@ -441,3 +592,26 @@ class TestUIPerformance:
     def test_form_render_performance(self):
         """Test that form renders quickly."""
         pytest.skip("Requires detailed performance measurement")
+
+    def test_rerun_with_large_whitelist(self, mocker):
+        """Compare rerun time with and without cached validation (5,000-line whitelist)."""
+        import time
+        from components import input_form
+        from utils.validators import validation_cache
+
+        def rerun_time(at, runs=5):
+            start = time.perf_counter()
+            for _ in range(runs):
+                at.number_input(key='rate_sender_input').increment()
+                _rerun(at)
+            return (time.perf_counter() - start) / runs
+
+        validation_cache.clear()
+        cached = rerun_time(_load_whitelist())
+
+        mocker.patch.object(input_form, "cached_validation", lambda validator, value: validator(value))
+        uncached = rerun_time(_load_whitelist())
+        validation_cache.clear()
+
+        print(f"form rerun with 5,000 whitelisted senders: uncached {uncached * 1000:.0f} ms, cached {cached * 1000:.0f} ms")
+        assert cached < uncached
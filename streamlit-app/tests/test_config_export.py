@@ -0,0 +1,128 @@
+"""
+Unit tests for streaming configuration export.
+
+Tests output parity with json.dumps, on-the-fly redaction,
+copy-on-write sanitization and memory/throughput against the
+deepcopy-based export path.
+"""
+import copy
+import io
+import json
+import pytest
+from utils.config_export import (
+    export_config_json,
+    is_placeholder,
+    placeholder_for,
+    write_config_json,
+)
+from utils.helpers import sanitize_config_for_export
+
+
+def _legacy_export(config) -> str:
+    """The previous export path: asdict, deepcopy, redact, dumps."""
+    safe = copy.deepcopy(config.to_dict())
+    for section, key in [('twilio', 'account_sid'), ('twilio', 'auth_token'),
+                         ('twilio', 'phone_number'), ('integrations', 'notification_email')]:
+        safe[section][key] = placeholder_for(key)
+    return json.dumps(safe, indent=2)
+
+
+@pytest.fixture
+def large_config(valid_worker_config):
+    """Worker config with a 100k-entry sender whitelist."""
+    valid_worker_config.security.enable_sender_whitelist = True
+    valid_worker_config.security.sender_whitelist = [f"user{i}@example.com" for i in range(100_000)]
+    return valid_worker_config
+
+
+# ========================================
+# Export Tests
+# ========================================
+
+@pytest.mark.unit
+class TestConfigExport:
+    """Test streaming JSON export."""
+
+    def test_unredacted_matches_json_dumps(self, valid_worker_config):
+        """Test byte-for-byte parity with json.dumps(to_dict())."""
+        valid_worker_config.security.sender_whitelist = ["a@example.com", "ü@example.com"]
+        valid_worker_config.integrations.custom_headers = {"X-Test": "1"}
+        expected = json.dumps(valid_worker_config.to_dict(), indent=2)
+        assert export_config_json(valid_worker_config, redact=False) == expected
+
+    def test_redacts_sensitive_fields(self, valid_worker_config):
+        """Test that credentials never reach the output."""
+        output = export_config_json(valid_worker_config)
+        assert valid_worker_config.twilio.account_sid not in output
+        assert valid_worker_config.twilio.auth_token not in output
+
+        data = json.loads(output)
+        assert data["twilio"]["account_sid"] == "<ACCOUNT_SID_PLACEHOLDER>"
+        assert data["integrations"]["notification_email"] == "<NOTIFICATION_EMAIL_PLACEHOLDER>"
+        assert data["basic"]["worker_name"] == valid_worker_config.basic.worker_name
+
+    def test_writes_to_any_file_like(self, valid_worker_config, tmp_path):
+        """Test writing to a real file."""
+        path = tmp_path / "config.json"
+        with open(path, "w") as fp:
+            write_config_json(valid_worker_config, fp)
+        assert json.loads(path.read_text()) == json.loads(export_config_json(valid_worker_config))
+
+    def test_placeholder_detection(self):
+        """Test that placeholders are recognized on import."""
+        assert is_placeholder("<AUTH_TOKEN_PLACEHOLDER>")
+        assert not is_placeholder("AC1234567890abcdef1234567890abcdef")
+        assert not is_placeholder(None)
+
+    def test_sanitize_shares_untouched_sections(self, valid_worker_config):
+        """Test copy-on-write sanitization of a config dict."""
+        config_dict = valid_worker_config.to_dict()
+        safe = sanitize_config_for_export(config_dict)
+
+        assert safe["security"] is config_dict["security"]
+        assert safe["twilio"] is not config_dict["twilio"]
+        assert config_dict["twilio"]["auth_token"] == valid_worker_config.twilio.auth_token
+        assert safe == json.loads(export_config_json(valid_worker_config))
+
+
+# ========================================
+# Performance Tests
+# ========================================
+
+@pytest.mark.performance
+class TestConfigExportPerformance:
+    """Compare streaming export with the deepcopy path."""
+
+    def test_peak_memory_lower_than_deepcopy(self, large_config, tmp_path):
+        """Test that streaming to a file avoids intermediate copies."""
+        import tracemalloc
+
+        tracemalloc.start()
+        legacy = _legacy_export(large_config)
+        _, legacy_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        path = tmp_path / "config.json"
+        tracemalloc.start()
+        with open(path, "w") as fp:
+            write_config_json(large_config, fp)
+        _, streaming_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert path.read_text() == legacy
+        assert streaming_peak * 10 < legacy_peak, \
+            f"Streaming peak {streaming_peak / 1024:.0f} KB vs deepcopy {legacy_peak / 1024:.0f} KB"
+
+    def test_throughput_not_worse_than_deepcopy(self, large_config):
+        """Test that streaming export is at least as fast as the old path."""
+        import time
+
+        start = time.perf_counter()
+        _legacy_export(large_config)
+        legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        write_config_json(large_config, io.StringIO())
+        streaming = time.perf_counter() - start
+
+        assert streaming < legacy, f"Streaming {streaming:.3f}s vs deepcopy {legacy:.3f}s"
@@ -0,0 +1,174 @@
+"""
+Unit tests for layered configuration overlays.
+
+Tests copy-on-write merging, compiled paths, fingerprint-keyed
+caching and selective re-resolution when a layer changes.
+"""
+import pytest
+from schemas import WorkerConfig
+from utils.config_overlay import (
+    ConfigOverlayResolver,
+    compile_path,
+    overlay_merge,
+)
+from utils.helpers import deep_get, merge_configs
+
+
+ORG_DEFAULTS = {
+    "twilio": {"phone_number": "+15551234567"},
+    "rate_limit": {"per_sender": 10, "per_recipient": 20},
+    "security": {"sender_whitelist": [f"user{i}@example.com" for i in range(1000)]},
+}
+
+
+def _build_resolver(tenant_count: int = 3) -> ConfigOverlayResolver:
+    """Build a resolver with org, two environments and per-tenant layers."""
+    resolver = ConfigOverlayResolver()
+    resolver.set_layer("org", ORG_DEFAULTS)
+    resolver.set_layer("env:prod", {"logging": {"log_level": "warn"}})
+    resolver.set_layer("env:staging", {"logging": {"log_level": "debug"}})
+
+    for i in range(tenant_count):
+        env = "env:prod" if i % 2 == 0 else "env:staging"
+        resolver.set_layer(f"tenant:{i}", {"basic": {"worker_name": f"tenant-{i}", "domain": f"t{i}.example.com"}})
+        resolver.register_tenant(f"t{i}", ["org", env, f"tenant:{i}"])
+    return resolver
+
+
+# ========================================
+# Merge Tests
+# ========================================
+
+@pytest.mark.unit
+class TestOverlayMerge:
+    """Test copy-on-write merging."""
+
+    def test_untouched_subtrees_are_shared(self):
+        """Test that sections the override does not touch are not copied."""
+        merged = overlay_merge(ORG_DEFAULTS, {"rate_limit": {"per_sender": 5}})
+        assert merged["security"] is ORG_DEFAULTS["security"]
+        assert merged["rate_limit"] == {"per_sender": 5, "per_recipient": 20}
+
+    def test_inputs_not_modified(self):
+        """Test that neither input is mutated."""
+        base = {"a": {"b": 1}}
+        overlay_merge(base, {"a": {"b": 2, "c": 3}})
+        assert base == {"a": {"b": 1}}
+
+    def test_noop_override_returns_base(self):
+        """Test that empty or identical overrides return base itself."""
+        assert overlay_merge(ORG_DEFAULTS, {}) is ORG_DEFAULTS
+        assert overlay_merge(ORG_DEFAULTS, {"twilio": ORG_DEFAULTS["twilio"]}) is ORG_DEFAULTS
+
+    def test_matches_merge_configs(self):
+        """Test parity with the recursive copy merge."""
+        override = {"rate_limit": {"per_sender": 1}, "basic": {"domain": "x.com"}}
+        assert overlay_merge(ORG_DEFAULTS, override) == merge_configs(ORG_DEFAULTS, override)
+
+    def test_compiled_paths_cached(self):
+        """Test that dotted paths are split once."""
+        assert compile_path("basic.worker_name") is compile_path("basic.worker_name")
+        assert deep_get(ORG_DEFAULTS, "rate_limit.per_sender") == 10
+        assert deep_get(ORG_DEFAULTS, "rate_limit.missing", "d") == "d"
+
+
+# ========================================
+# Resolver Tests
+# ========================================
+
+@pytest.mark.unit
+class TestConfigOverlayResolver:
+    """Test cached resolution of tenant configs."""
+
+    def test_resolves_layers_in_precedence_order(self):
+        """Test that later layers override earlier ones."""
+        resolver = _build_resolver()
+        config = resolver.resolve("t1")
+
+        assert isinstance(config, WorkerConfig)
+        assert config.basic.worker_name == "tenant-1"
+        assert config.logging.log_level == "debug"
+        assert config.rate_limit.per_sender == 10
+
+    def test_repeated_resolution_hits_cache(self):
+        """Test that unchanged stacks are not re-resolved."""
+        resolver = _build_resolver()
+        first = resolver.resolve("t0")
+        assert resolver.resolve("t0") is first
+        assert resolver.resolutions == 1
+        assert resolver.cache_hits == 1
+
+    def test_unchanged_layer_update_is_noop(self):
+        """Test that re-setting identical content keeps the cache."""
+        resolver = _build_resolver()
+        resolver.resolve_all()
+        assert not resolver.set_layer("org", dict(ORG_DEFAULTS))
+        resolver.resolve_all()
+        assert resolver.resolutions == 3
+
+    def test_layer_change_reresolves_only_affected_tenants(self):
+        """Test selective invalidation when one environment changes."""
+        resolver = _build_resolver(tenant_count=10)
+        before = resolver.resolve_all()
+        assert resolver.resolutions == 10
+
+        resolver.set_layer("env:staging", {"logging": {"log_level": "error"}})
+        after = resolver.resolve_all()
+
+        staging = resolver.affected_tenants("env:staging")
+        assert len(staging) == 5
+        assert resolver.resolutions == 15
+        for tenant in resolver.tenants():
+            if tenant in staging:
+                assert after[tenant] is not before[tenant]
+                assert after[tenant].logging.log_level == "error"
+            else:
+                assert after[tenant] is before[tenant]
+
+    def test_resolve_all_empty_selection(self):
+        """Test that an explicit empty tenant list resolves nothing."""
+        resolver = _build_resolver()
+        assert resolver.resolve_all([]) == {}
+        assert resolver.resolutions == 0
+
+    def test_shared_resolution_kept_until_last_tenant_invalidated(self):
+        """Test that tenants with identical stacks share one cache entry."""
+        resolver = ConfigOverlayResolver()
+        resolver.set_layer("org", ORG_DEFAULTS)
+        resolver.register_tenant("a", ["org"])
+        resolver.register_tenant("b", ["org"])
+        shared = resolver.resolve("a")
+        assert resolver.resolve("b") is shared
+
+        resolver.register_tenant("a", ["org"])
+        assert resolver.resolve("b") is shared
+
+        resolver.register_tenant("b", ["org"])
+        assert resolver.resolve("b") is not shared
+        assert resolver.resolutions == 2
+
+    def test_unknown_tenant_and_layer(self):
+        """Test errors for missing tenants and layers."""
+        resolver = _build_resolver()
+        with pytest.raises(KeyError):
+            resolver.resolve("nope")
+
+        resolver.register_tenant("broken", ["org", "missing"])
+        with pytest.raises(KeyError, match="missing"):
+            resolver.resolve("broken")
+
+    @pytest.mark.performance
+    def test_fleet_resolution_performance(self):
+        """Test resolving hundreds of tenants and re-resolving after a change."""
+        import time
+
+        resolver = _build_resolver(tenant_count=500)
+
+        start = time.time()
+        resolver.resolve_all()
+        resolver.set_layer("env:prod", {"logging": {"log_level": "info"}})
+        resolver.resolve_all()
+        duration = time.time() - start
+
+        assert resolver.resolutions == 750
+        assert duration < 2.0, f"Fleet resolution took {duration:.2f}s (too slow)"
@@ -0,0 +1,477 @@
+"""
+Tests for archive creation and download caching.
+
+Tests ZIP and tar.gz archive contents, reproducible output, compression
+options and spooling, fingerprint-keyed archive caching across reruns, and
+cache bounds.
+"""
+import hashlib
+import io
+import shutil
+import subprocess
+import tarfile
+import zipfile
+import pytest
+
+from components import download_manager
+from components.download_manager import (
+    archive_cache,
+    create_deployment_package,
+    create_zip_archive,
+    get_deployment_package,
+    get_tar_archive,
+    get_zip_archive,
+)
+from utils import LRUCache, bundle_fingerprint
+from utils.archive import (
+    build_archive,
+    build_tar_gz,
+    build_zip,
+    extend_zip,
+    spool_zip,
+    validate_compression,
+)
+
+try:
+    from streamlit.testing.v1 import AppTest
+    STREAMLIT_TESTING_AVAILABLE = True
+except ImportError:
+    STREAMLIT_TESTING_AVAILABLE = False
+    AppTest = None
+
+
+@pytest.fixture(autouse=True)
+def clear_archive_cache():
+    """Start every test with an empty process-wide archive cache."""
+    archive_cache.clear()
+    yield
+    archive_cache.clear()
+
+
+@pytest.fixture
+def email_worker_files(valid_worker_config):
+    """Generated email worker bundle."""
+    from generators import CodeGenerator
+
+    return CodeGenerator(valid_worker_config).generate_all_email_worker()
+
+
+def _download_app():
+    """Minimal script rendering the download section for a fixed bundle."""
+    import streamlit as st
+    from components.download_manager import render_download_section
+
+    st.text_input("Unrelated input", key="unrelated")
+    files = {"src/index.ts": "export default {};\n" * 200, "README.md": "# Worker\n"}
+    render_download_section(files, "my-worker", worker_type="email")
+
+
+def _export_app():
+    """Minimal script rendering the Save Configuration options."""
+    from components.download_manager import render_export_options
+    from schemas import WorkerConfig
+
+    render_export_options(WorkerConfig())
+
+
+# ========================================
+# Archive Content Tests
+# ========================================
+
+@pytest.mark.unit
+class TestArchiveContents:
+    """Test archive structure."""
+
+    def test_zip_archive_paths(self, email_worker_files):
+        """Test that files are stored under the worker directory."""
+        data = create_zip_archive(email_worker_files, "my-worker")
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            assert sorted(archive.namelist()) == sorted(f"my-worker/{path}" for path in email_worker_files)
+            assert archive.read("my-worker/src/index.ts").decode() == email_worker_files["src/index.ts"]
+
+    def test_deployment_package_adds_quick_start(self, email_worker_files):
+        """Test that the deployment package includes QUICK_START.md."""
+        data = create_deployment_package(email_worker_files, "my-worker")
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            assert "my-worker/QUICK_START.md" in archive.namelist()
+            assert len(archive.namelist()) == len(email_worker_files) + 1
+
+
+# ========================================
+# Reproducibility Tests
+# ========================================
+
+@pytest.mark.unit
+class TestReproducibleArchives:
+    """Test that identical bundles produce identical bytes."""
+
+    @pytest.mark.parametrize("archive_format", ["zip", "tar.gz"])
+    def test_identical_bytes_regardless_of_order_and_time(self, email_worker_files, archive_format, mocker):
+        """Test that insertion order and wall-clock time do not affect output."""
+        first = build_archive(email_worker_files, "w/", archive_format)
+
+        mocker.patch("time.time", return_value=2_000_000_000)
+        reordered = dict(reversed(list(email_worker_files.items())))
+        second = build_archive(reordered, "w/", archive_format)
+
+        assert first.data == second.data
+        assert first.sha256 == second.sha256 == hashlib.sha256(first.data).hexdigest()
+
+    def test_zip_entries_sorted_with_fixed_metadata(self, email_worker_files):
+        """Test ZIP entry order, timestamps and permissions."""
+        result = build_zip(email_worker_files, "w/")
+        with zipfile.ZipFile(io.BytesIO(result.data)) as archive:
+            infos = archive.infolist()
+
+        assert [info.filename for info in infos] == sorted(f"w/{path}" for path in email_worker_files)
+        for info in infos:
+            mode = (info.external_attr >> 16) & 0o777
+            assert info.date_time == (1980, 1, 1, 0, 0, 0)
+            assert mode == (0o755 if info.filename == "w/deploy.sh" else 0o644)
+
+    def test_tar_entries_sorted_with_fixed_metadata(self, email_worker_files):
+        """Test tarball entry order, mtimes, ownership and permissions."""
+        result = build_tar_gz(email_worker_files, "w/")
+        with tarfile.open(fileobj=io.BytesIO(result.data), mode="r:gz") as archive:
+            members = archive.getmembers()
+            assert archive.extractfile("w/README.md").read().decode() == email_worker_files["README.md"]
+
+        assert [member.name for member in members] == sorted(f"w/{path}" for path in email_worker_files)
+        for member in members:
+            assert member.mtime == 315532800
+            assert member.uid == member.gid == 0
+            assert member.mode == (0o755 if member.name == "w/deploy.sh" else 0o644)
+
+    def test_different_content_changes_hash(self, email_worker_files):
+        """Test that the content hash tracks bundle changes."""
+        changed = dict(email_worker_files, **{"README.md": "changed"})
+        assert build_zip(email_worker_files).sha256 != build_zip(changed).sha256
+
+    @pytest.mark.skipif(shutil.which("unzip") is None, reason="unzip not installed")
+    def test_unzip_extracts_executable_deploy_script(self, email_worker_files, tmp_path):
+        """Test that standard unzip restores the executable bit."""
+        archive_path = tmp_path / "w.zip"
+        archive_path.write_bytes(get_zip_archive(email_worker_files, "w").data)
+        subprocess.run(["unzip", "-q", str(archive_path), "-d", str(tmp_path)], check=True)
+
+        assert (tmp_path / "w" / "deploy.sh").stat().st_mode & 0o111
+        assert not (tmp_path / "w" / "README.md").stat().st_mode & 0o111
+
+    def test_tar_archive_cached(self, email_worker_files):
+        """Test that tarballs share the archive cache."""
+        assert get_tar_archive(email_worker_files, "w") is get_tar_archive(dict(email_worker_files), "w")
+
+
+# ========================================
+# Deployment Package Tests
+# ========================================
+
+@pytest.mark.unit
+class TestIncrementalDeploymentPackage:
+    """Test deriving the deployment package from the base archive."""
+
+    def test_base_entries_copied_raw(self, email_worker_files):
+        """Test that base entries are copied byte-for-byte, not recompressed."""
+        base = download_manager.build_zip_archive(email_worker_files, "w")
+        package = download_manager.build_deployment_package(email_worker_files, "w", base=base)
+
+        with zipfile.ZipFile(io.BytesIO(base.data)) as archive:
+            entries_end = archive.start_dir
+
+        assert package.data[:entries_end] == base.data[:entries_end]
+        assert package.entries == base.entries + 1
+        with zipfile.ZipFile(io.BytesIO(package.data)) as archive:
+            assert archive.namelist()[-1] == "w/QUICK_START.md"
+            assert archive.testzip() is None
+
+    def test_matches_full_rebuild_contents(self, email_worker_files):
+        """Test that the derived package has the same contents as a full build."""
+        derived = create_deployment_package(email_worker_files, "w", "bzip2", 5)
+        full = build_zip(
+            dict(email_worker_files, **{"QUICK_START.md": download_manager.quick_start_guide("w")}),
+            "w/", "bzip2", 5
+        )
+
+        with zipfile.ZipFile(io.BytesIO(derived)) as a, \
+                zipfile.ZipFile(io.BytesIO(full.data)) as b:
+            assert {n: a.read(n) for n in a.namelist()} == {n: b.read(n) for n in b.namelist()}
+            assert {i.compress_type for i in a.infolist()} == {zipfile.ZIP_BZIP2}
+
+    def test_render_compresses_bundle_once(self, email_worker_files, mocker):
+        """Test that both downloads together compress the worker files once."""
+        spy = mocker.spy(download_manager, "build_zip")
+
+        get_zip_archive(email_worker_files, "w")
+        get_deployment_package(email_worker_files, "w")
+
+        assert spy.call_count == 1
+
+    def test_tarballs_cannot_be_extended(self, email_worker_files):
+        """Test that extend_zip rejects non-ZIP bases."""
+        with pytest.raises(ValueError):
+            extend_zip(build_tar_gz(email_worker_files), {"x": "y"})
+
+    @pytest.mark.skipif(shutil.which("unzip") is None, reason="unzip not installed")
+    def test_unzip_reads_both_archives(self, email_worker_files, tmp_path):
+        """Test both archives with the standard unzip integrity check."""
+        for name, result in (
+            ("base.zip", get_zip_archive(email_worker_files, "w")),
+            ("deploy.zip", get_deployment_package(email_worker_files, "w")),
+        ):
+            path = tmp_path / name
+            path.write_bytes(result.data)
+            check = subprocess.run(["unzip", "-t", str(path)], capture_output=True, text=True)
+            assert check.returncode == 0, check.stdout + check.stderr
+            assert "No errors detected" in check.stdout
+
+
+# ========================================
+# Compression Option Tests
+# ========================================
+
+@pytest.mark.unit
+class TestCompressionOptions:
+    """Test configurable compression and spooling."""
+
+    @pytest.mark.parametrize("compression,level,expected", [
+        ("stored", None, zipfile.ZIP_STORED),
+        ("deflate", 1, zipfile.ZIP_DEFLATED),
+        ("deflate", 9, zipfile.ZIP_DEFLATED),
+        ("bzip2", 9, zipfile.ZIP_BZIP2),
+        ("lzma", None, zipfile.ZIP_LZMA),
+    ])
+    def test_methods_round_trip(self, email_worker_files, compression, level, expected):
+        """Test that every method produces a readable archive with the chosen method."""
+        result = build_zip(email_worker_files, "w/", compression, level)
+
+        assert result.entries == len(email_worker_files)
+        assert result.compressed_size == len(result.data)
+        with zipfile.ZipFile(io.BytesIO(result.data)) as archive:
+            assert all(info.compress_type == expected for info in archive.infolist())
+            assert archive.read("w/README.md").decode() == email_worker_files["README.md"]
+
+    def test_stored_is_larger_than_deflate(self, email_worker_files):
+        """Test that reported sizes reflect the chosen method."""
+        stored = build_zip(email_worker_files, compression="stored")
+        deflated = build_zip(email_worker_files, compression="deflate", level=9)
+
+        assert stored.compressed_size > stored.uncompressed_size
+        assert deflated.ratio < 0.5
+
+    @pytest.mark.parametrize("compression,level", [
+        ("zstd", None), ("deflate", 0), ("deflate", 10), ("stored", 5), ("lzma", 9),
+    ])
+    def test_invalid_options(self, compression, level):
+        """Test that unsupported methods and levels are rejected."""
+        with pytest.raises(ValueError):
+            validate_compression(compression, level)
+
+    def test_spools_to_disk_above_threshold(self, email_worker_files):
+        """Test that large archives roll over to a temporary file."""
+        small, _ = spool_zip(email_worker_files, spool_threshold=10 * 1024 * 1024)
+        large, _ = spool_zip(email_worker_files, compression="stored", spool_threshold=1024)
+
+        with small, large:
+            assert not small._rolled
+            assert large._rolled
+            with zipfile.ZipFile(large) as archive:
+                assert len(archive.namelist()) == len(email_worker_files)
+
+    def test_options_are_part_of_cache_key(self, email_worker_files):
+        """Test that different compression settings are cached separately."""
+        deflated = get_zip_archive(email_worker_files, "w", "deflate", 9)
+        stored = get_zip_archive(email_worker_files, "w", "stored")
+
+        assert deflated.compressed_size < stored.compressed_size
+        assert len(archive_cache) == 2
+
+
+# ========================================
+# Archive Cache Tests
+# ========================================
+
+@pytest.mark.unit
+class TestArchiveCache:
+    """Test fingerprint-keyed archive caching."""
+
+    def test_fingerprint_depends_on_content_and_name(self, email_worker_files):
+        """Test that fingerprints change with content or worker name only."""
+        fingerprint = bundle_fingerprint(email_worker_files, "my-worker")
+        reordered = dict(reversed(list(email_worker_files.items())))
+        changed = dict(email_worker_files, **{"README.md": "changed"})
+
+        assert bundle_fingerprint(reordered, "my-worker") == fingerprint
+        assert bundle_fingerprint(email_worker_files, "other-worker") != fingerprint
+        assert bundle_fingerprint(changed, "my-worker") != fingerprint
+
+    def test_repeat_calls_compress_once(self, email_worker_files, mocker):
+        """Test that an unchanged bundle is compressed only once."""
+        spy = mocker.spy(download_manager, "build_zip_archive")
+
+        first = get_zip_archive(email_worker_files, "my-worker")
+        for _ in range(5):
+            assert get_zip_archive(dict(email_worker_files), "my-worker") is first
+
+        assert spy.call_count == 1
+
+    def test_changed_bundle_recompresses(self, email_worker_files, mocker):
+        """Test that content or name changes produce a new archive."""
+        spy = mocker.spy(download_manager, "build_deployment_package")
+
+        get_deployment_package(email_worker_files, "my-worker")
+        get_deployment_package(email_worker_files, "renamed-worker")
+        get_deployment_package(dict(email_worker_files, **{"README.md": "x"}), "my-worker")
+
+        assert spy.call_count == 3
+
+    def test_zip_and_deployment_cached_separately(self, email_worker_files):
+        """Test that both archive kinds for one bundle are cached side by side."""
+        assert get_zip_archive(email_worker_files, "w").data != get_deployment_package(email_worker_files, "w").data
+        assert len(archive_cache) == 2
+
+    def test_lru_bounds(self):
+        """Test eviction by entry count and total size."""
+        cache = LRUCache(max_entries=2, max_bytes=10)
+        cache.put("a", b"1234")
+        cache.put("b", b"1234")
+        cache.get("a")
+        cache.put("c", b"1234")
+
+        assert "a" in cache and "c" in cache and "b" not in cache
+
+        cache.put("d", b"12345678")
+        assert len(cache) == 1 and cache.total_bytes == 8
+
+        cache.put("huge", b"x" * 11)
+        assert "huge" not in cache
+
+
+@pytest.mark.ui
+@pytest.mark.skipif(not STREAMLIT_TESTING_AVAILABLE, reason="Streamlit testing framework not available")
+class TestDownloadSectionReruns:
+    """Test archive reuse across Streamlit reruns."""
+
+    def test_no_recompression_on_unrelated_reruns(self, mocker):
+        """Test that widget interactions do not recompress the bundle."""
+        zip_spy = mocker.spy(download_manager, "build_zip_archive")
+        deploy_spy = mocker.spy(download_manager, "build_deployment_package")
+
+        at = AppTest.from_function(_download_app)
+        at.run()
+        assert not at.exception
+
+        for value in ("a", "b", "c"):
+            at.text_input(key="unrelated").input(value).run()
+            assert not at.exception
+
+        assert zip_spy.call_count == 1
+        assert deploy_spy.call_count == 1
+
+    @pytest.mark.parametrize("compression", ["Stored (no compression, fastest)", "LZMA (smallest, slowest)"])
+    def test_tarball_with_unleveled_zip_method(self, compression):
+        """Test that the gzip level is not passed to a ZIP method without levels."""
+        at = AppTest.from_function(_download_app)
+        at.run()
+
+        at.selectbox(key="archive_compression").set_value(compression)
+        at.selectbox(key="archive_format").set_value("Tarball (.tar.gz)")
+        at.run()
+
+        assert not at.exception
+        assert at.slider(key=f"archive_level_{'stored' if 'Stored' in compression else 'lzma'}").value == 6
+
+    def test_new_session_reuses_archive(self, mocker):
+        """Test that a separate session with the same bundle hits the shared cache."""
+        AppTest.from_function(_download_app).run()
+
+        zip_spy = mocker.spy(download_manager, "build_zip_archive")
+        AppTest.from_function(_download_app).run()
+
+        assert zip_spy.call_count == 0
+
+
+@pytest.mark.ui
+@pytest.mark.skipif(not STREAMLIT_TESTING_AVAILABLE, reason="Streamlit testing framework not available")
+class TestExportOptions:
+    """Test the Save Configuration credential choice."""
+
+    def test_credentials_redacted_unless_requested(self, mocker):
+        """Test that credentials are only exported after opting in, with a notice either way."""
+        export_spy = mocker.spy(download_manager, "export_config_json")
+
+        at = AppTest.from_function(_export_app)
+        at.run()
+        assert not at.exception
+        assert export_spy.call_args.kwargs["redact"] is True
+        assert "Re-enter them after importing" in at.caption[0].value
+
+        at.checkbox(key="export_include_credentials").check().run()
+        assert not at.exception
+        assert export_spy.call_args.kwargs["redact"] is False
+        assert "plain text" in at.warning[0].value
+
+
+# ========================================
+# Compression Benchmarks
+# ========================================
+
+@pytest.mark.performance
+class TestCompressionBenchmarks:
+    """Size/time trade-off of each compression method."""
+
+    SETTINGS = [
+        ("stored", None), ("deflate", 1), ("deflate", 6), ("deflate", 9),
+        ("bzip2", 9), ("lzma", None),
+    ]
+
+    def _benchmark(self, files):
+        results = {}
+        for compression, level in self.SETTINGS:
+            result = build_zip(files, "w/", compression, level)
+            results[(compression, level)] = result
+            print(
+                f"{compression:>8} {str(level or '-'):>2}: "
+                f"{result.compressed_size / 1024:9.1f} KB ({result.ratio:6.1%}) "
+                f"in {result.duration * 1000:8.1f} ms"
+            )
+        return results
+
+    def test_typical_bundle(self, email_worker_files):
+        """Test trade-off on a single email worker bundle."""
+        results = self._benchmark(email_worker_files)
+
+        assert results[("deflate", 9)].compressed_size <= results[("deflate", 1)].compressed_size
+        assert all(result.duration < 0.5 for result in results.values())
+
+    @pytest.mark.slow
+    def test_very_large_bundle(self, email_worker_files):
+        """Test trade-off on a 400-worker bundle (~10 MB uncompressed)."""
+        fleet = {
+            f"worker-{i:03d}/{path}": content.replace("email-to-sms", f"tenant-{i}")
+            for i in range(400)
+            for path, content in email_worker_files.items()
+        }
+        results = self._benchmark(fleet)
+
+        stored = results[("stored", None)]
+        fast = results[("deflate", 1)]
+        assert fast.compressed_size < stored.compressed_size / 2
+        assert fast.duration < 5.0, f"Deflate level 1 took {fast.duration:.2f}s (too slow)"
+
+    def test_derived_package_cost(self, email_worker_files):
+        """Test that deriving the deployment package costs far less than rebuilding it."""
+        fleet = {
+            f"worker-{i:03d}/{path}": content
+            for i in range(50)
+            for path, content in email_worker_files.items()
+        }
+        base = download_manager.build_zip_archive(fleet, "fleet")
+        rebuilt = build_zip(dict(fleet, **{"QUICK_START.md": "# Quick start"}), "fleet/")
+        derived = download_manager.build_deployment_package(fleet, "fleet", base=base)
+        print(
+            f"base {base.duration * 1000:.1f} ms, rebuild {rebuilt.duration * 1000:.1f} ms, "
+            f"derived {derived.duration * 1000:.1f} ms"
+        )
+
+        # Base + derived replaces two full builds, roughly halving render CPU
+        assert derived.duration < rebuilt.duration / 4
@@ -0,0 +1,172 @@
+"""
+Tests for the offline email replay simulator.
+
+Tests recipient extraction, content selection and truncation against
+the generated worker's logic, plus process-pool replay of a corpus.
+"""
+import io
+import pytest
+from email.message import EmailMessage
+from utils.email_replay import (
+    STATUS_BLOCKED,
+    STATUS_EMPTY,
+    STATUS_ERROR,
+    STATUS_NO_RECIPIENT,
+    STATUS_OK,
+    find_emails,
+    main,
+    replay_email,
+    replay_paths,
+    write_results_csv,
+)
+
+
+def _make_email(to="15551234567@sms.example.com", subject="Hello", text="Plain body",
+                html=None, sender="alice@example.com", headers=None) -> bytes:
+    """Build a raw email."""
+    message = EmailMessage()
+    message["From"] = sender
+    message["To"] = to
+    message["Subject"] = subject
+    for name, value in (headers or {}).items():
+        message[name] = value
+    message.set_content(text)
+    if html:
+        message.add_alternative(html, subtype="html")
+    return bytes(message)
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    """Directory of 50 emails with one unparseable file."""
+    for i in range(50):
+        raw = _make_email(to=f"1555000{i:04d}@sms.example.com", text=f"Message {i} " * 30)
+        (tmp_path / f"{i:03d}.eml").write_bytes(raw)
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "nested" / "broken.eml").write_bytes(b"\x00" * 10)
+    return tmp_path
+
+
+# ========================================
+# Pipeline Tests
+# ========================================
+
+@pytest.mark.unit
+class TestReplayPipeline:
+    """Test predicted recipient and SMS text."""
+
+    def test_email_prefix_recipient(self, valid_worker_config):
+        """Test that the country code is prepended like the worker does."""
+        valid_worker_config.routing.default_country_code = "+44"
+        result = replay_email(_make_email(to="7700900123@sms.example.com"), valid_worker_config)
+        assert result.status == STATUS_OK
+        assert result.recipient == "+447700900123"
+
+    def test_subject_and_header_extraction(self, valid_worker_config):
+        """Test subject-line and custom-header extraction methods."""
+        valid_worker_config.routing.phone_extraction_method = "subject_line"
+        result = replay_email(_make_email(to="sms@example.com", subject="To: +1 555 123 4567"), valid_worker_config)
+        assert result.recipient == "+15551234567"
+
+        valid_worker_config.routing.phone_extraction_method = "custom_header"
+        raw = _make_email(to="sms@example.com", headers={"X-SMS-To": "+15550001111"})
+        assert replay_email(raw, valid_worker_config).recipient == "+15550001111"
+
+    def test_no_recipient(self, valid_worker_config):
+        """Test emails with no extractable phone number."""
+        result = replay_email(_make_email(to="hello@example.com"), valid_worker_config)
+        assert result.status == STATUS_NO_RECIPIENT
+
+    def test_truncation_and_segments(self, valid_worker_config):
+        """Test that long bodies are truncated to max_message_length."""
+        result = replay_email(_make_email(text="word " * 200), valid_worker_config)
+        assert len(result.sms_text) == 160
+        assert result.sms_text.endswith("...")
+        assert result.segments == 1
+        assert result.encoding == "GSM-7"
+
+    def test_html_content_source(self, valid_worker_config):
+        """Test HTML bodies are stripped the way the worker strips them."""
+        valid_worker_config.routing.content_source = "body_html"
+        raw = _make_email(html="<p>Hi <b>there</b></p>\n<p>friend</p>")
+        assert replay_email(raw, valid_worker_config).sms_text == "Hi there friend"
+
+    def test_sender_whitelist(self, valid_worker_config):
+        """Test that non-whitelisted senders are blocked."""
+        valid_worker_config.security.enable_sender_whitelist = True
+        valid_worker_config.security.sender_whitelist = ["bob@example.com"]
+        assert replay_email(_make_email(), valid_worker_config).status == STATUS_BLOCKED
+        assert replay_email(_make_email(sender="bob@example.com"), valid_worker_config).status == STATUS_OK
+
+    def test_sender_whitelist_is_case_sensitive(self, valid_worker_config):
+        """Test the exact comparison the worker's whitelist uses."""
+        valid_worker_config.security.enable_sender_whitelist = True
+        valid_worker_config.security.sender_whitelist = ["bob@example.com"]
+        assert replay_email(_make_email(sender="Bob@Example.com"), valid_worker_config).status == STATUS_BLOCKED
+
+    def test_empty_content(self, valid_worker_config):
+        """Test that an email with no SMS text is reported like the worker's 400."""
+        valid_worker_config.routing.content_source = "body_text"
+        valid_worker_config.routing.include_sender_info = False
+        result = replay_email(_make_email(text="  \n\t\n"), valid_worker_config)
+        assert result.status == STATUS_EMPTY
+        assert result.recipient
+
+
+# ========================================
+# Corpus Replay Tests
+# ========================================
+
+@pytest.mark.integration
+class TestCorpusReplay:
+    """Test replaying directories of .eml files."""
+
+    def test_process_pool_matches_in_process(self, corpus, valid_worker_config):
+        """Test that pooled replay returns the same ordered results."""
+        paths = find_emails(corpus)
+        serial = list(replay_paths(paths, valid_worker_config, workers=1))
+        pooled = list(replay_paths(paths, valid_worker_config, workers=2, chunksize=8))
+
+        assert pooled == serial
+        assert len(serial) == 51
+
+    def test_errors_captured_per_file(self, corpus, valid_worker_config):
+        """Test that one bad file does not abort the replay."""
+        results = list(replay_paths(find_emails(corpus), valid_worker_config, workers=1))
+        statuses = {result.status for result in results}
+        assert STATUS_OK in statuses
+        assert all(r.status in (STATUS_OK, STATUS_NO_RECIPIENT, STATUS_ERROR) for r in results)
+
+    def test_csv_summary(self, corpus, valid_worker_config):
+        """Test CSV output and summary counts."""
+        output = io.StringIO()
+        summary = write_results_csv(replay_paths(find_emails(corpus), valid_worker_config, workers=1), output)
+        assert summary["total"] == 51
+        assert summary[STATUS_OK] == 50
+        assert output.getvalue().startswith("path,status,recipient,sms_text,segments")
+
+    def test_cli(self, corpus, tmp_path):
+        """Test the command-line entry point."""
+        output = tmp_path / "predictions.csv"
+        assert main([str(corpus), "--output", str(output), "--workers", "1"]) == 0
+        assert len(output.read_text().splitlines()) == 52
+
+    @pytest.mark.performance
+    def test_replay_throughput(self, tmp_path, valid_worker_config):
+        """Test per-email replay cost stays well under a millisecond-scale budget."""
+        import time
+
+        raw = _make_email(text="Hello there " * 50, html="<p>Hello</p>" * 50)
+        paths = []
+        for i in range(1000):
+            path = tmp_path / f"{i}.eml"
+            path.write_bytes(raw)
+            paths.append(path)
+
+        start = time.time()
+        results = list(replay_paths(paths, valid_worker_config, workers=1))
+        duration = time.time() - start
+
+        assert len(results) == 1000
+        # 100k emails on one core would take under 5 minutes at this rate
+        assert duration < 3.0, f"Replaying 1000 emails took {duration:.2f}s (too slow)"
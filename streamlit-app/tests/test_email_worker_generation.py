@@ -282,6 +282,137 @@ class TestEmailRateLimiting:
 
         assert wrangler is not None
 
+    def test_durable_object_bundle(self, valid_worker_config):
+        """Test the Durable Object limiter class, bindings and migration."""
+        from generators import CodeGenerator
+
+        config = valid_worker_config
+        config.rate_limit.enabled = True
+        config.rate_limit.storage = "durable_objects"
+        config.rate_limit.global_limit = 500
+
+        files = CodeGenerator(config).generate_all_email_worker()
+
+        limiter = files['src/rate-limiter.ts']
+        assert "export class RateLimiter" in limiter
+        assert "global: 500" in limiter
+
+        index = files['src/index.ts']
+        assert "export { RateLimiter } from './rate-limiter';" in index
+        assert index.count("limiter.fetch(") == 1
+        assert "RATE_LIMIT_KV" not in index
+
+        wrangler = files['wrangler.toml']
+        assert 'class_name = "RateLimiter"' in wrangler
+        assert 'new_sqlite_classes = ["RateLimiter"]' in wrangler
+        assert "[[env.production.durable_objects.bindings]]" in wrangler
+        assert "kv_namespaces" not in wrangler
+
+    def test_kv_bundle_has_no_durable_object(self, valid_worker_config):
+        """Test that KV storage does not emit the limiter class."""
+        from generators import CodeGenerator
+
+        config = valid_worker_config
+        config.rate_limit.enabled = True
+        config.rate_limit.storage = "kv"
+
+        files = CodeGenerator(config).generate_all_email_worker()
+
+        assert 'src/rate-limiter.ts' not in files
+        assert "durable_objects" not in files['wrangler.toml']
+
+    def test_kv_local_cache(self, valid_worker_config):
+        """Test the in-isolate counter cache in front of KV."""
+        from generators import CodeGenerator
+
+        config = valid_worker_config
+        config.rate_limit.enabled = True
+        config.rate_limit.storage = "kv"
+        config.rate_limit.max_staleness_seconds = 30
+        config.rate_limit.local_cache_entries = 250
+
+        code = CodeGenerator(config).generate_email_worker_code()
+
+        assert "const MAX_STALENESS_MS = 30 * 1000;" in code
+        assert "const LOCAL_CACHE_ENTRIES = 250;" in code
+        assert "Promise.all(toSync.map(" in code
+        assert "checkRateLimit(env, ctx, from, phoneNumber)" in code
+        assert "flushStaleCounters(env, ctx, now);" in code
+        assert "await env.RATE_LIMIT_KV.put" not in code
+
+        # Stale counters come off a sync-ordered queue and are re-read before writing
+        assert "syncQueue[syncQueueHead]" in code
+        assert "flushed < STALE_FLUSH_BATCH" in code
+        assert "counter.synced = Math.max(counter.synced, remote);" in code
+        assert "localCounters.forEach" not in code
+
+    def test_kv_local_cache_validation(self, valid_worker_config):
+        """Test staleness and cache size bounds."""
+        from generators import CodeGenerator
+
+        config = valid_worker_config
+        config.rate_limit.max_staleness_seconds = 0
+        assert CodeGenerator(config).validate_config()[0]
+
+        config.rate_limit.max_staleness_seconds = -1
+        config.rate_limit.local_cache_entries = 0
+        is_valid, errors = CodeGenerator(config).validate_config()
+        assert not is_valid
+        assert len(errors) == 2
+
+    def test_durable_objects_rejected_for_standard_worker(self, valid_worker_config):
+        """Test that the service-worker format refuses a Durable Object limiter."""
+        from generators import CodeGenerator
+
+        config = valid_worker_config
+        config.rate_limit.enabled = True
+        config.rate_limit.storage = "durable_objects"
+
+        is_valid, errors = CodeGenerator(config).validate_config()
+
+        assert not is_valid
+        assert any("Durable Object" in error for error in errors)
+
+
+@pytest.mark.unit
+class TestGlobalRateLimit:
+    """Test the sharded global rate limit counter."""
+
+    def test_shard_count_from_throughput(self):
+        """Test shard count derived from the expected peak rate."""
+        from schemas import RateLimitConfig
+
+        assert RateLimitConfig(expected_peak_per_second=0.5).get_global_shard_count() == 1
+        assert RateLimitConfig(expected_peak_per_second=7.2).get_global_shard_count() == 8
+        assert RateLimitConfig(expected_peak_per_second=10_000).get_global_shard_count() == 32
+
+    def test_overshoot_estimate(self):
+        """Test the documented accuracy bound."""
+        from schemas import RateLimitConfig
+
+        config = RateLimitConfig(expected_peak_per_second=2, max_staleness_seconds=10)
+
+        assert config.get_global_overshoot() == 140
+
+    def test_sharded_counter_emitted(self, valid_worker_config):
+        """Test global limit enforcement across shard keys."""
+        from generators import CodeGenerator
+
+        config = valid_worker_config
+        config.rate_limit.enabled = True
+        config.rate_limit.storage = "kv"
+        config.rate_limit.global_limit = 750
+        config.rate_limit.expected_peak_per_second = 12
+
+        files = CodeGenerator(config).generate_all_email_worker()
+        code = files['src/index.ts']
+
+        assert "const GLOBAL_LIMIT = 750;" in code
+        assert "const GLOBAL_SHARDS = 12;" in code
+        assert "rate:global:${window}:${shard}" in code
+        assert "'Global rate limit exceeded'" in code
+        assert "12 KV keys" in files['README.md']
+
 
 # ========================================
 # Email Content Processing Tests
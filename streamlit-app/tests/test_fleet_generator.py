@@ -0,0 +1,223 @@
+"""
+Tests for fleet bundle generation.
+
+Tests parsing tenant configuration uploads, archive layout and manifest,
+per-worker error isolation, progress reporting and flat memory use.
+"""
+import io
+import json
+import os
+import tracemalloc
+import zipfile
+import pytest
+
+from generators import parse_fleet_configs, write_fleet_archive
+from utils import export_config_json
+
+try:
+    from streamlit.testing.v1 import AppTest
+    STREAMLIT_TESTING_AVAILABLE = True
+except ImportError:
+    STREAMLIT_TESTING_AVAILABLE = False
+    AppTest = None
+
+
+def _tenant(valid_worker_config, index: int) -> dict:
+    """Exported (redacted) configuration for one tenant."""
+    valid_worker_config.basic.worker_name = f"tenant-{index}"
+    valid_worker_config.basic.domain = f"tenant{index}.example.com"
+    return json.loads(export_config_json(valid_worker_config))
+
+
+@pytest.fixture
+def tenants(valid_worker_config):
+    """Five tenant configurations."""
+    return [_tenant(valid_worker_config, i) for i in range(5)]
+
+
+# ========================================
+# Upload Parsing Tests
+# ========================================
+
+@pytest.mark.unit
+class TestParseFleetConfigs:
+    """Test accepted upload formats."""
+
+    def test_json_array(self, tenants):
+        """Test a JSON array of configurations."""
+        assert parse_fleet_configs(json.dumps(tenants)) == tenants
+
+    def test_workers_object(self, tenants):
+        """Test an object with a workers array."""
+        assert parse_fleet_configs(json.dumps({"workers": tenants}).encode()) == tenants
+
+    def test_json_lines(self, tenants):
+        """Test one configuration per line."""
+        data = "\n".join(json.dumps(tenant) for tenant in tenants) + "\n"
+        assert parse_fleet_configs(data) == tenants
+
+    @pytest.mark.parametrize("data", ["not json\n{", "[1, 2]", '"text"'])
+    def test_invalid(self, data):
+        """Test that malformed uploads raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_fleet_configs(data)
+
+
+# ========================================
+# Archive Tests
+# ========================================
+
+@pytest.mark.integration
+class TestFleetArchive:
+    """Test streamed fleet archives."""
+
+    def test_directory_per_worker_and_manifest(self, tenants):
+        """Test archive layout and manifest contents."""
+        buffer = io.BytesIO()
+        entries = write_fleet_archive(tenants, buffer, worker_type="email")
+
+        with zipfile.ZipFile(buffer) as archive:
+            names = archive.namelist()
+            manifest = json.loads(archive.read("manifest.json"))
+            index_ts = archive.read("tenant-3/src/index.ts").decode()
+
+        assert {name.split("/")[0] for name in names} == {f"tenant-{i}" for i in range(5)} | {"manifest.json"}
+        assert sum(name.startswith("tenant-0/") for name in names) == 10
+        assert "export default" in index_ts
+        assert manifest["total"] == 5 and manifest["failed"] == 0
+        assert [worker["worker_name"] for worker in manifest["workers"]] == [e.worker_name for e in entries]
+        assert all(len(worker["fingerprint"]) == 64 for worker in manifest["workers"])
+
+    def test_failures_are_isolated(self, tenants):
+        """Test that bad tenants are reported without aborting the fleet."""
+        tenants[1]["basic"]["worker_name"] = "tenant-0"       # duplicate
+        tenants[2]["basic"]["worker_name"] = "../escape"      # invalid directory name
+        tenants[3]["twilio"]["account_sid"] = ""              # fails validation
+
+        buffer = io.BytesIO()
+        entries = write_fleet_archive(tenants, buffer)
+
+        assert [entry.status for entry in entries] == ["ok", "error", "error", "error", "ok"]
+        assert entries[1].error == "Duplicate worker name"
+        with zipfile.ZipFile(buffer) as archive:
+            assert not any(name.startswith("../") for name in archive.namelist())
+            assert json.loads(archive.read("manifest.json"))["failed"] == 3
+
+    def test_progress_reported_per_worker(self, tenants):
+        """Test that progress is reported once per worker, in order."""
+        calls = []
+        write_fleet_archive(tenants, io.BytesIO(), on_progress=lambda done, entry: calls.append((done, entry.worker_name)))
+        assert calls == [(i + 1, f"tenant-{i}") for i in range(5)]
+
+    @pytest.mark.performance
+    def test_memory_flat_in_fleet_size(self, valid_worker_config, tmp_path):
+        """Test that peak memory does not grow with the number of workers."""
+        def peak_for(count):
+            configs = (_tenant(valid_worker_config, i) for i in range(count))
+            with open(tmp_path / f"fleet-{count}.zip", "wb") as fp:
+                tracemalloc.start()
+                write_fleet_archive(configs, fp, worker_type="email")
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            return peak
+
+        from generators import CodeGenerator
+
+        bundle_bytes = sum(
+            len(content.encode()) for content in CodeGenerator(valid_worker_config).generate_all_email_worker().values()
+        )
+        peak_for(5)  # warm template cache
+        small, large = peak_for(20), peak_for(200)
+        per_worker = (large - small) / 180
+        print(f"peak: 20 workers {small / 1024:.0f} KB, 200 workers {large / 1024:.0f} KB, "
+              f"{per_worker / 1024:.1f} KB per extra worker (bundle {bundle_bytes / 1024:.0f} KB)")
+
+        assert os.path.getsize(tmp_path / "fleet-200.zip") > 5 * os.path.getsize(tmp_path / "fleet-20.zip")
+        # Only manifest and ZIP central directory records (~110 B per file) grow;
+        # bundle contents are never retained
+        assert per_worker < bundle_bytes * 0.2
+
+
+# ========================================
+# UI Tests
+# ========================================
+
+def _fleet_app():
+    """Script rendering only the fleet section."""
+    from components.download_manager import render_fleet_section
+
+    render_fleet_section()
+
+
+def _fleet_download_app():
+    """Script rendering the download controls of a built archive."""
+    import streamlit as st
+    from components.download_manager import _render_fleet_download
+
+    _render_fleet_download(st.session_state['fleet_archive'])
+
+
+@pytest.mark.ui
+@pytest.mark.skipif(not STREAMLIT_TESTING_AVAILABLE, reason="Streamlit testing framework not available")
+class TestFleetSectionUI:
+    """Test the fleet download section renders."""
+
+    def test_renders_without_upload(self):
+        """Test the section renders its controls before an upload."""
+        at = AppTest.from_function(_fleet_app)
+        at.run()
+
+        assert not at.exception
+        assert len(at.radio) == 1
+        assert len(at.button) == 0
+
+    def test_archive_discarded_without_upload(self):
+        """Test that an archive built from a removed upload is deleted."""
+        from components.download_manager import _FleetArchive
+
+        fleet = _FleetArchive("old-upload", [])
+        at = AppTest.from_function(_fleet_app)
+        at.session_state['fleet_archive'] = fleet
+        at.run()
+
+        assert not at.exception
+        assert 'fleet_archive' not in at.session_state
+        assert not os.path.exists(fleet.path)
+
+    def test_download_offered_only_after_prepare(self):
+        """Test that the archive is registered for download for one run only."""
+        from components.download_manager import _FleetArchive
+
+        fleet = _FleetArchive("upload", [])
+        at = AppTest.from_function(_fleet_download_app)
+        at.session_state['fleet_archive'] = fleet
+        at.run()
+
+        assert not at.exception
+        assert len(at.get("download_button")) == 0
+
+        at.button(key="fleet_prepare").click().run()
+        assert len(at.get("download_button")) == 1
+
+        at.run()
+        assert len(at.get("download_button")) == 0
+        fleet.discard()
+
+
+@pytest.mark.unit
+class TestFleetArchiveFile:
+    """Test the on-disk fleet archive kept by a session."""
+
+    def test_file_removed_with_session(self):
+        """Test that the file goes away when the session drops the archive."""
+        import gc
+        from components.download_manager import _FleetArchive
+
+        fleet = _FleetArchive("upload", [])
+        path = fleet.path
+        assert os.path.exists(path)
+
+        del fleet
+        gc.collect()
+
+        assert not os.path.exists(path)
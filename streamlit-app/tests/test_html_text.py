@@ -0,0 +1,124 @@
+"""
+Unit tests for streaming HTML-to-text conversion.
+
+Tests entity decoding, script/style removal, whitespace
+normalization, chunked input and character budgets.
+"""
+import pytest
+from utils.html_text import HtmlTextExtractor, html_to_text
+from utils.helpers import strip_html_tags
+
+
+def _make_html(target_bytes: int) -> str:
+    """Build a realistic HTML email body of roughly target_bytes."""
+    block = (
+        "<div class=\"row\"><p>Order <b>#12345</b> shipped &amp; on its way.</p>"
+        "<style>.row{color:red}</style><a href=\"https://example.com\">Track</a></div>\n"
+    )
+    return "<html><body>" + block * (target_bytes // len(block)) + "</body></html>"
+
+
+# ========================================
+# Conversion Tests
+# ========================================
+
+@pytest.mark.unit
+class TestHtmlToText:
+    """Test HTML-to-text conversion."""
+
+    def test_strips_tags_and_collapses_whitespace(self):
+        """Test basic tag removal and whitespace normalization."""
+        assert html_to_text("<p>Hello\n\n   <b>world</b></p>") == "Hello world"
+
+    def test_decodes_entities(self):
+        """Test that named and numeric entities are decoded."""
+        assert html_to_text("Tom &amp; Jerry &#8364;5 &lt;3") == "Tom & Jerry €5 <3"
+
+    def test_drops_script_and_style(self):
+        """Test that script and style contents are removed."""
+        html = "<style>p {color: red}</style><p>Hi</p><script>alert('x')</script>"
+        assert html_to_text(html) == "Hi"
+
+    def test_block_tags_separate_words(self):
+        """Test that block elements do not glue words together."""
+        assert html_to_text("<p>one</p><p>two</p>line<br>break") == "one two line break"
+
+    def test_inline_tags_do_not_add_spaces(self):
+        """Test that inline markup inside a word is preserved."""
+        assert html_to_text("un<b>believ</b>able") == "unbelievable"
+
+    def test_budget_stops_early(self):
+        """Test that conversion stops once max_chars is reached."""
+        extractor = HtmlTextExtractor(max_chars=10)
+        extractor.feed("<p>" + "word " * 100 + "</p>")
+        assert extractor.done
+        assert extractor.truncated
+        assert len(extractor.get_text()) <= 10
+
+    def test_exact_budget_not_truncated(self):
+        """Test that text exactly filling the budget is not marked truncated."""
+        extractor = HtmlTextExtractor(max_chars=5)
+        extractor.feed("<p>hello</p>")
+        extractor.close()
+        assert extractor.get_text() == "hello"
+        assert not extractor.truncated
+
+    def test_chunked_input_matches_whole(self):
+        """Test that chunk boundaries inside tags and entities are handled."""
+        html = _make_html(4096)
+        chunks = [html[i:i + 7] for i in range(0, len(html), 7)]
+        assert html_to_text(chunks) == html_to_text(html)
+
+    def test_strip_html_tags_wrapper(self):
+        """Test the helper wrapper applies the budget."""
+        assert strip_html_tags("<p>a &amp; b</p>") == "a & b"
+        assert strip_html_tags("<p>" + "x" * 500 + "</p>", max_length=160) == "x" * 160
+
+
+# ========================================
+# Performance Tests
+# ========================================
+
+@pytest.mark.performance
+class TestHtmlToTextPerformance:
+    """Benchmark conversion of large HTML bodies."""
+
+    def test_1mb_full_conversion(self):
+        """Test converting a 1 MB body without a budget."""
+        import time
+
+        html = _make_html(1024 * 1024)
+
+        start = time.time()
+        text = html_to_text(html)
+        duration = time.time() - start
+
+        assert "Order #12345 shipped & on its way." in text
+        assert duration < 5.0, f"1 MB conversion took {duration:.2f}s (too slow)"
+
+    def test_25mb_budgeted_conversion(self):
+        """Test that a 25 MB body stops after the SMS budget is met."""
+        import time
+
+        html = _make_html(25 * 1024 * 1024)
+
+        start = time.time()
+        text = html_to_text(html, max_chars=1600)
+        duration = time.time() - start
+
+        assert len(text) <= 1600
+        assert duration < 0.5, f"25 MB budgeted conversion took {duration:.2f}s (too slow)"
+
+    @pytest.mark.slow
+    def test_25mb_full_conversion(self):
+        """Test converting a 25 MB body (the Email Worker size cap) without a budget."""
+        import time
+
+        html = _make_html(25 * 1024 * 1024)
+
+        start = time.time()
+        text = html_to_text(html)
+        duration = time.time() - start
+
+        assert text.endswith("Track")
+        assert duration < 120.0, f"25 MB conversion took {duration:.2f}s (too slow)"
@@ -0,0 +1,196 @@
+"""
+Tests for background jobs.
+
+Tests progress reporting, cancellation, failures, round-robin scheduling
+across owners, and background bundle generation.
+"""
+import threading
+import pytest
+
+from generators import CodeGenerator, submit_generation
+from utils import Bundle, JobCancelled, JobScheduler, load_bundle
+from utils.jobs import CANCELLED, DONE, FAILED
+
+try:
+    from streamlit.testing.v1 import AppTest
+    STREAMLIT_TESTING_AVAILABLE = True
+except ImportError:
+    STREAMLIT_TESTING_AVAILABLE = False
+    AppTest = None
+
+
+@pytest.fixture
+def scheduler():
+    """Single-worker scheduler, so jobs run strictly one at a time."""
+    scheduler = JobScheduler(workers=1)
+    yield scheduler
+    scheduler.shutdown()
+
+
+def _blocker(scheduler):
+    """Submit a job that holds the only worker until the returned event is set."""
+    release, started = threading.Event(), threading.Event()
+
+    def hold(job):
+        started.set()
+        release.wait(5)
+
+    job = scheduler.submit(hold, owner='blocker')
+    assert started.wait(5)
+    return job, release
+
+
+# ========================================
+# Job Tests
+# ========================================
+
+@pytest.mark.unit
+class TestJobScheduler:
+    """Test job lifecycle."""
+
+    def test_result_and_progress(self, scheduler):
+        """Test that progress updates are visible and the result is attached."""
+        def work(job):
+            for step in range(1, 4):
+                job.update(step, 3, f"step {step}")
+            return "done"
+
+        job = scheduler.submit(work, owner='a', label='three steps')
+        assert job.wait(5)
+        assert job.status == DONE
+        assert job.result == "done"
+        assert (job.completed, job.total, job.current, job.fraction) == (3, 3, "step 3", 1.0)
+
+    def test_failure_recorded(self, scheduler):
+        """Test that exceptions mark the job failed instead of escaping."""
+        def fail(job):
+            raise RuntimeError("boom")
+
+        job = scheduler.submit(fail, owner='a')
+        assert job.wait(5)
+        assert job.status == FAILED
+        assert str(job.error) == "boom"
+
+    def test_cancel_queued(self, scheduler):
+        """Test that a queued job is removed and never runs."""
+        blocker, release = _blocker(scheduler)
+        ran = []
+        job = scheduler.submit(lambda job: ran.append(1), owner='a')
+
+        scheduler.cancel(job)
+        assert job.finished and job.status == CANCELLED
+        assert scheduler.pending() == 0
+
+        release.set()
+        assert blocker.wait(5)
+        assert ran == []
+
+    def test_cancel_running_between_steps(self, scheduler):
+        """Test that cancellation stops a running job at its next update, past except Exception."""
+        started, steps = threading.Event(), []
+
+        def work(job):
+            for step in range(1000):
+                try:
+                    job.update(step, 1000)
+                except Exception:
+                    pytest.fail("JobCancelled caught by except Exception")
+                steps.append(step)
+                started.set()
+                threading.Event().wait(0.001)
+
+        job = scheduler.submit(work, owner='a')
+        assert started.wait(5)
+        scheduler.cancel(job)
+
+        assert job.wait(5)
+        assert job.status == CANCELLED
+        assert len(steps) < 1000
+        assert issubclass(JobCancelled, BaseException) and not issubclass(JobCancelled, Exception)
+
+    def test_round_robin_across_owners(self, scheduler):
+        """Test that one owner's backlog does not delay another owner's job."""
+        blocker, release = _blocker(scheduler)
+        order = []
+        jobs = [scheduler.submit(lambda job, n=n: order.append(f"a{n}"), owner='a') for n in range(3)]
+        jobs += [scheduler.submit(lambda job, n=n: order.append(f"b{n}"), owner='b') for n in range(2)]
+        assert scheduler.pending('a') == 3 and scheduler.pending() == 5
+
+        release.set()
+        assert all(job.wait(5) for job in jobs)
+        assert order == ["a0", "b0", "a1", "b1", "a2"]
+
+
+# ========================================
+# Generation Job Tests
+# ========================================
+
+@pytest.mark.unit
+class TestGenerationJobs:
+    """Test background bundle generation."""
+
+    def test_progress_callback(self, valid_worker_config):
+        """Test that generators report each file as it is rendered."""
+        calls = []
+        files = CodeGenerator(valid_worker_config).generate_all_email_worker(
+            progress=lambda done, total, filename: calls.append((done, total, filename))
+        )
+
+        assert [filename for _, _, filename in calls] == list(files)
+        assert calls[-1][:2] == (len(files), len(files))
+
+    def test_submit_generation(self, valid_worker_config):
+        """Test that the job result matches inline generation."""
+        job = submit_generation(valid_worker_config, owner='session')
+
+        assert job.wait(10)
+        assert job.status == DONE
+        assert isinstance(job.result, Bundle) and job.result.compress
+        assert list(job.result) == list(CodeGenerator(valid_worker_config).generate_all())
+        assert job.completed == job.total == len(job.result)
+
+
+# ========================================
+# UI Tests
+# ========================================
+
+@pytest.mark.ui
+@pytest.mark.skipif(not STREAMLIT_TESTING_AVAILABLE, reason="Streamlit testing framework not available")
+class TestGenerationJobUI:
+    """Test attaching finished jobs to the session."""
+
+    def test_finished_job_attached(self, valid_worker_config):
+        """Test that a finished job's bundle becomes the session's generated files."""
+        job = submit_generation(valid_worker_config, owner='ui')
+        assert job.wait(10)
+
+        at = AppTest.from_file("app.py", default_timeout=30)
+        at.session_state['generation_job'] = job
+        at.run()
+
+        assert not at.exception
+        assert at.session_state['generation_job'] is None
+        assert load_bundle(at.session_state['generated_files']) is job.result
+        assert any("Successfully generated" in success.value for success in at.success)
+
+    def test_running_job_polled_until_cancelled(self, scheduler):
+        """Test that the page polls a running job and reports its cancellation."""
+        def work(job):
+            for step in range(10_000):
+                job.update(step, 10_000, "src/index.ts")
+                threading.Event().wait(0.01)
+
+        job = scheduler.submit(work, owner='ui')
+        timer = threading.Timer(0.6, job.cancel)
+        timer.start()
+
+        at = AppTest.from_file("app.py", default_timeout=30)
+        at.session_state['generation_job'] = job
+        at.run()
+        timer.join()
+
+        assert not at.exception
+        assert job.status == CANCELLED
+        assert at.session_state['generation_job'] is None
+        assert at.session_state['generated_files'] == {}
+        assert any("cancelled" in warning.value for warning in at.warning)
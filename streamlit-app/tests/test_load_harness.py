@@ -0,0 +1,60 @@
+"""
+Smoke test for the concurrent-session load harness.
+
+Runs a few simulated sessions so scripts/load_test.py keeps working as the
+app changes; full load runs are local only (make load-test).
+"""
+import json
+import pytest
+
+try:
+    from streamlit.testing.v1 import AppTest
+    STREAMLIT_TESTING_AVAILABLE = True
+except ImportError:
+    STREAMLIT_TESTING_AVAILABLE = False
+    AppTest = None
+
+if STREAMLIT_TESTING_AVAILABLE:
+    from scripts.load_test import format_report, main, percentiles, run_load_test
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not STREAMLIT_TESTING_AVAILABLE, reason="Streamlit testing framework not available")
+class TestPercentiles:
+    """Test latency statistics."""
+
+    def test_nearest_rank(self):
+        """Test percentiles over 1..100."""
+        stats = percentiles([float(n) for n in range(100, 0, -1)])
+        assert (stats['p50'], stats['p90'], stats['p99'], stats['max']) == (50, 90, 99, 100)
+        assert stats['mean'] == 50.5
+        assert percentiles([]) == {}
+
+
+@pytest.mark.slow
+@pytest.mark.performance
+@pytest.mark.skipif(not STREAMLIT_TESTING_AVAILABLE, reason="Streamlit testing framework not available")
+class TestLoadHarness:
+    """Run the harness with a few sessions."""
+
+    def test_sessions_generate_and_download(self):
+        """Test that every session reaches the download step."""
+        report = run_load_test(sessions=3, timeout=30)
+
+        print(format_report(report))
+        assert report.errors == []
+        assert report.generated == 3
+        assert set(report.step_latency_ms) == {'load', 'fill_form', 'generate', 'preview', 'download'}
+        assert report.reruns == 15
+        assert report.latency_ms['p50'] >= report.run_ms['p50'] > 0
+
+    def test_json_report(self, tmp_path, monkeypatch):
+        """Test the command line with a JSON report."""
+        monkeypatch.chdir(tmp_path)
+        path = tmp_path / "report.json"
+
+        assert main(["--sessions", "2", "--same-config", "--json", str(path)]) == 0
+
+        report = json.loads(path.read_text())
+        assert report['generated'] == 2
+        assert {'rss_growth_mb', 'reruns_per_second', 'latency_ms'} <= set(report)
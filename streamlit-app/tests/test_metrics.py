@@ -0,0 +1,209 @@
+"""
+Tests for application metrics.
+
+Tests counters and histograms, JSON and structured log export, the
+instrumented validation, archive and generation paths, the sidebar
+diagnostics panel, and the cost of recording a timing.
+"""
+import json
+import logging
+import time
+import pytest
+
+from components.download_manager import archive_cache, get_tar_archive, get_zip_archive
+from generators import submit_generation
+from utils import Histogram, MetricsRegistry, cached_validation, validate_domain
+from utils.metrics import SIZE_BUCKETS_BYTES, metrics
+from utils.validators import validation_cache
+from tests.test_components import _rerun
+
+try:
+    from streamlit.testing.v1 import AppTest
+    STREAMLIT_TESTING_AVAILABLE = True
+except ImportError:
+    STREAMLIT_TESTING_AVAILABLE = False
+    AppTest = None
+
+
+@pytest.fixture
+def registry():
+    """Fresh registry."""
+    return MetricsRegistry()
+
+
+@pytest.fixture
+def clean_metrics():
+    """Reset the process-wide metrics around a test."""
+    metrics.reset()
+    yield metrics
+    metrics.reset()
+
+
+# ========================================
+# Metric Type Tests
+# ========================================
+
+@pytest.mark.unit
+class TestMetricTypes:
+    """Test counters and histograms."""
+
+    def test_histogram_statistics(self):
+        """Test count, sum, extremes, buckets and percentiles."""
+        histogram = Histogram(buckets=(10, 100))
+        for value in range(1, 201):
+            histogram.observe(value)
+
+        snapshot = histogram.snapshot()
+        assert (snapshot['count'], snapshot['sum'], snapshot['min'], snapshot['max']) == (200, 20100, 1, 200)
+        assert snapshot['buckets'] == {'le_10': 10, 'le_100': 90, 'inf': 100}
+        assert (snapshot['p50'], snapshot['p95'], snapshot['p99']) == (100, 190, 198)
+        assert histogram.percentile(50) == 100
+
+    def test_percentiles_use_recent_samples(self):
+        """Test that percentiles follow the most recent window only."""
+        histogram = Histogram(recent=10)
+        for value in [1000] * 10 + [1] * 10:
+            histogram.observe(value)
+
+        assert histogram.percentile(99) == 1
+        assert histogram.snapshot()['max'] == 1000
+        assert Histogram().percentile(50) is None
+
+    def test_registry_counters_and_timer(self, registry):
+        """Test named metrics and timing into a per-rerun dictionary."""
+        registry.inc('reruns')
+        registry.inc('reruns', 2)
+        timings = {}
+        with registry.timer('section.form_ms', into=timings):
+            time.sleep(0.01)
+
+        snapshot = registry.snapshot()
+        assert snapshot['counters'] == {'reruns': 3}
+        assert snapshot['histograms']['section.form_ms']['count'] == 1
+        assert timings['section.form_ms'] >= 10
+        assert registry.histogram('section.form_ms') is registry.histogram('section.form_ms')
+
+
+# ========================================
+# Export Tests
+# ========================================
+
+@pytest.mark.unit
+class TestMetricsExport:
+    """Test JSON file and structured log output."""
+
+    def test_write_json(self, registry, tmp_path):
+        """Test that the snapshot file is valid JSON."""
+        registry.observe('archive.zip.size_bytes', 2048, SIZE_BUCKETS_BYTES)
+        path = tmp_path / "metrics.json"
+        registry.write_json(str(path))
+
+        data = json.loads(path.read_text())
+        assert data['histograms']['archive.zip.size_bytes']['buckets']['le_4096'] == 1
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_flush_interval_and_env(self, registry, tmp_path, monkeypatch):
+        """Test that METRICS_FILE is written at most once per interval."""
+        path = tmp_path / "metrics.json"
+        assert not registry.maybe_flush()
+
+        monkeypatch.setenv('METRICS_FILE', str(path))
+        assert registry.maybe_flush(interval=60)
+        assert not registry.maybe_flush(interval=60)
+        assert path.exists()
+
+    def test_structured_log(self, registry, caplog):
+        """Test one JSON object per event on the metrics logger."""
+        with caplog.at_level(logging.INFO, logger='email_to_sms.metrics'):
+            registry.emit('rerun', timings={'rerun_ms': 12.5}, session='abc')
+
+        record = json.loads(caplog.records[0].getMessage())
+        assert record['event'] == 'rerun'
+        assert record['timings'] == {'rerun_ms': 12.5}
+        assert record['session'] == 'abc'
+
+
+# ========================================
+# Instrumentation Tests
+# ========================================
+
+@pytest.mark.unit
+class TestInstrumentation:
+    """Test metrics recorded by the app's hot paths."""
+
+    def test_validation(self, clean_metrics):
+        """Test validation time on misses and hit/miss counters."""
+        validation_cache.clear()
+        cached_validation(validate_domain, "example.com")
+        cached_validation(validate_domain, "example.com")
+
+        snapshot = clean_metrics.snapshot()
+        assert snapshot['counters']['validation.cache_misses'] == 1
+        assert snapshot['counters']['validation.cache_hits'] == 1
+        assert snapshot['histograms']['validation.validate_domain_ms']['count'] == 1
+
+    def test_archives_recorded_once_per_build(self, clean_metrics):
+        """Test archive size and build time, not counting cache hits."""
+        archive_cache.clear()
+        files = {"src/index.ts": "export default {};\n" * 100}
+        for _ in range(3):
+            zip_result = get_zip_archive(files, "w")
+        get_tar_archive(files, "w")
+
+        snapshot = clean_metrics.snapshot()
+        assert snapshot['counters']['archive.zip.built'] == 1
+        assert snapshot['histograms']['archive.zip.size_bytes']['max'] == zip_result.compressed_size
+        assert snapshot['histograms']['archive.tar.gz.build_ms']['count'] == 1
+
+    def test_generation(self, clean_metrics, valid_worker_config):
+        """Test generation latency, queue time and outcome counters."""
+        job = submit_generation(valid_worker_config, owner='metrics')
+        assert job.wait(10)
+
+        snapshot = clean_metrics.snapshot()
+        assert snapshot['counters']['generation.completed'] == 1
+        assert snapshot['histograms']['generation.latency_ms']['count'] == 1
+        assert snapshot['histograms']['generation.queue_ms']['count'] == 1
+
+
+@pytest.mark.ui
+@pytest.mark.skipif(not STREAMLIT_TESTING_AVAILABLE, reason="Streamlit testing framework not available")
+class TestDiagnosticsPanel:
+    """Test the sidebar diagnostics panel."""
+
+    def test_panel_shows_last_rerun(self, clean_metrics):
+        """Test rerun and section timings in the panel."""
+        at = AppTest.from_file("app.py", default_timeout=30)
+        at.run()
+        assert len(at.sidebar.table) == 0
+
+        at.sidebar.toggle(key='show_diagnostics').set_value(True)
+        _rerun(at)
+
+        assert not at.exception
+        last_rerun = at.sidebar.table[0].value
+        assert {'form', 'results', 'rerun'} <= set(last_rerun['Section'])
+        assert 'rerun_ms' in set(at.sidebar.table[1].value['Metric'])
+        assert clean_metrics.counter('reruns').value == 2
+
+
+# ========================================
+# Performance Tests
+# ========================================
+
+@pytest.mark.performance
+class TestMetricsOverhead:
+    """Cost of recording a timing."""
+
+    def test_timer_overhead(self, registry):
+        """Measure a timed empty block."""
+        runs = 20_000
+        timings = {}
+        start = time.perf_counter()
+        for _ in range(runs):
+            with registry.timer('noop_ms', into=timings):
+                pass
+        per_call = (time.perf_counter() - start) / runs
+
+        print(f"timer overhead: {per_call * 1e6:.2f} µs per timed section")
+        assert per_call < 50e-6
@@ -0,0 +1,156 @@
+"""
+Security tests for the generated-bundle secret scanner.
+
+Tests single-pass detection, line reporting, the post-generation
+gate in CodeGenerator and scanner overhead.
+"""
+import pytest
+from utils.secret_scanner import _compile_scanner, scan_bundle, scan_text
+from utils.helpers import validate_no_hardcoded_secrets
+
+
+TWILIO_SID = "AC1234567890abcdef1234567890abcdef"
+
+
+# ========================================
+# Scanner Tests
+# ========================================
+
+@pytest.mark.security
+class TestSecretScanner:
+    """Test secret detection and reporting."""
+
+    def test_clean_code_has_no_findings(self):
+        """Test that code using env bindings is clean."""
+        code = "const sid = env.TWILIO_ACCOUNT_SID;\nconst token = env.TWILIO_AUTH_TOKEN;"
+        assert scan_text(code) == []
+
+    def test_reports_file_line_and_type(self):
+        """Test that findings carry file, line and secret type."""
+        code = "line one\nline two\nconst sid = '" + TWILIO_SID + "';\n"
+        findings = scan_text(code, "src/index.ts")
+
+        types = {finding.secret_type for finding in findings}
+        assert types == {"Twilio SID", "Auth Token"}
+        assert all(finding.file == "src/index.ts" for finding in findings)
+        assert all(finding.line == 3 for finding in findings)
+
+    def test_sid_prefix_is_case_sensitive(self):
+        """Test that lowercase "ac" inside hex is not reported as a SID."""
+        assert scan_text("ns = 0f2ac74b498b48028cb68387c421e279ffff") == []
+        assert scan_text("AC" + "f" * 32)[0].secret_type == "Twilio SID"
+
+    def test_password_assignment_detected(self):
+        """Test that password literals are detected case-insensitively."""
+        findings = scan_text('\n\nPASSWORD = "hunter2"')
+        assert [(f.line, f.secret_type) for f in findings] == [(3, "Password")]
+
+    def test_overlapping_types_at_one_position_all_reported(self):
+        """Test that every type matching at the same offset is reported."""
+        scanner, group_names = _compile_scanner({"Long": r"key_[0-9]{8}", "Short": r"key_[0-9]{4}"})
+        matches = [
+            sorted(group_names[group] for group, value in match.groupdict().items() if value)
+            for match in scanner.finditer("key_1234 key_12345678")
+        ]
+        assert matches == [["Short"], ["Long", "Short"]]
+
+    def test_bundle_findings_sorted_by_file(self):
+        """Test that bundle scans report every offending file."""
+        files = {
+            "wrangler.toml": f'sid = "{TWILIO_SID}"',
+            "README.md": "# Clean",
+            "src/index.ts": "const api = 'sk_" + "a" * 32 + "';",
+        }
+        findings = scan_bundle(files)
+        assert [f.file for f in findings] == ["src/index.ts", "wrangler.toml", "wrangler.toml"]
+
+    def test_validate_no_hardcoded_secrets_wrapper(self):
+        """Test the helper keeps its (is_safe, warnings) contract."""
+        is_safe, warnings = validate_no_hardcoded_secrets(f"sid = {TWILIO_SID}")
+        assert not is_safe
+        assert warnings == ["Potential hardcoded Twilio SID detected"]
+        assert validate_no_hardcoded_secrets("const x = 1;") == (True, [])
+
+
+# ========================================
+# Post-Generation Gate Tests
+# ========================================
+
+@pytest.mark.security
+class TestGenerationGate:
+    """Test that generation refuses bundles containing secrets."""
+
+    def test_generated_bundles_pass_gate(self, valid_worker_config):
+        """Test that real credentials never reach generated files."""
+        from generators import CodeGenerator
+
+        generator = CodeGenerator(valid_worker_config)
+        assert scan_bundle(generator.generate_all()) == []
+        assert scan_bundle(generator.generate_all_email_worker()) == []
+
+    def test_kv_namespace_id_passes_gate(self, valid_worker_config):
+        """Test that a real 32-hex KV namespace ID is not mistaken for a secret."""
+        from generators import CodeGenerator
+
+        valid_worker_config.cloudflare.kv_namespace_id = "0f2ac74b498b48028cb68387c421e279"
+        generator = CodeGenerator(valid_worker_config)
+
+        http_files = generator.generate_all()
+        email_files = generator.generate_all_email_worker()
+        assert "0f2ac74b498b48028cb68387c421e279" in http_files["wrangler.toml"]
+        assert "0f2ac74b498b48028cb68387c421e279" in email_files["wrangler.toml"]
+        assert scan_bundle(http_files) == []
+        assert scan_bundle(email_files) == []
+
+    def test_gate_blocks_leaking_template(self, valid_worker_config, mocker):
+        """Test that a template leaking a secret fails generation."""
+        from generators import CodeGenerator
+
+        generator = CodeGenerator(valid_worker_config)
+        mocker.patch.object(generator, "generate_readme", return_value=f"SID: {TWILIO_SID}")
+
+        with pytest.raises(RuntimeError, match="README.md:1"):
+            generator.generate_all()
+
+
+# ========================================
+# Performance Tests
+# ========================================
+
+@pytest.mark.performance
+class TestScannerPerformance:
+    """Benchmark scanner overhead relative to generation."""
+
+    def test_gate_overhead_is_negligible(self, valid_worker_config):
+        """Test that scanning costs a small fraction of generation."""
+        import time
+        from generators import CodeGenerator
+
+        generator = CodeGenerator(valid_worker_config)
+
+        start = time.perf_counter()
+        files = generator.generate_all()
+        generation = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(10):
+            scan_bundle(files)
+        scan = (time.perf_counter() - start) / 10
+
+        assert scan < 0.05, f"Scanning took {scan * 1000:.2f}ms (too slow)"
+        assert scan < generation, f"Scan {scan * 1000:.2f}ms vs generation {generation * 1000:.2f}ms"
+
+    @pytest.mark.slow
+    def test_large_bundle_scan(self):
+        """Test scanning a large bundle across processes."""
+        import time
+
+        files = {f"worker-{i}/src/index.ts": "const x = env.VALUE;\n" * 20_000 for i in range(20)}
+        files["worker-7/wrangler.toml"] = f'sid = "{TWILIO_SID}"'
+
+        start = time.time()
+        findings = scan_bundle(files)
+        duration = time.time() - start
+
+        assert {f.file for f in findings} == {"worker-7/wrangler.toml"}
+        assert duration < 30.0, f"Large bundle scan took {duration:.2f}s (too slow)"
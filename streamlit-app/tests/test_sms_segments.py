@@ -0,0 +1,154 @@
+"""
+Unit tests for SMS segment calculation.
+
+Tests GSM-7/UCS-2 detection, extension character costs,
+segment boundaries and the batch API.
+"""
+import pytest
+from utils.sms_segments import (
+    GSM7,
+    UCS2,
+    analyze_sms,
+    analyze_sms_batch,
+    detect_encoding,
+)
+from utils.helpers import calculate_sms_segments
+
+
+# ========================================
+# Encoding Detection Tests
+# ========================================
+
+@pytest.mark.unit
+class TestEncodingDetection:
+    """Test automatic encoding detection."""
+
+    def test_plain_ascii_is_gsm7(self):
+        """Test that ordinary text uses GSM-7."""
+        encoding, non_gsm = detect_encoding("Hello, meet at 5pm?")
+        assert encoding == GSM7
+        assert non_gsm == ()
+
+    def test_gsm7_accented_characters(self):
+        """Test that accented characters in the GSM table stay GSM-7."""
+        encoding, _ = detect_encoding("Café à Zürich, ¿qué?")
+        assert encoding == GSM7
+
+    def test_emoji_forces_ucs2(self, unicode_test_data):
+        """Test that emoji forces UCS-2 and is reported."""
+        encoding, non_gsm = detect_encoding(unicode_test_data["emoji"])
+        assert encoding == UCS2
+        assert non_gsm == ("🎉", "🚀")
+
+    def test_non_gsm_chars_deduplicated(self):
+        """Test that offending characters are reported once, in order."""
+        _, non_gsm = detect_encoding("`a` ç `b`")
+        assert non_gsm == ("`", "ç")
+
+
+# ========================================
+# Segment Count Tests
+# ========================================
+
+@pytest.mark.unit
+class TestSegmentCounts:
+    """Test segment counting for both encodings."""
+
+    @pytest.mark.parametrize("length,expected", [
+        (0, 1), (160, 1), (161, 2), (306, 2), (307, 3), (1600, 11),
+    ])
+    def test_gsm7_lengths(self, length, expected):
+        """Test GSM-7 single and concatenated limits."""
+        assert analyze_sms("a" * length).segments == expected
+
+    @pytest.mark.parametrize("length,expected", [
+        (70, 1), (71, 2), (134, 2), (135, 3),
+    ])
+    def test_ucs2_lengths(self, length, expected):
+        """Test UCS-2 single and concatenated limits."""
+        assert analyze_sms("你" * length).segments == expected
+
+    def test_extension_chars_cost_two_septets(self):
+        """Test that extension characters count double."""
+        info = analyze_sms("€" * 80)
+        assert info.encoding == GSM7
+        assert info.units == 160
+        assert info.segments == 1
+        assert analyze_sms("€" * 81).segments == 2
+
+    def test_extension_char_not_split_across_segments(self):
+        """Test that an escape sequence stays in one segment."""
+        text = "a" * 152 + "{" + "a" * 10
+        info = analyze_sms(text)
+        assert info.boundaries[0] == (0, 152)
+        assert info.boundaries[1][0] == 152
+
+    def test_surrogate_pairs_count_two_units(self):
+        """Test that astral characters take two UCS-2 code units."""
+        info = analyze_sms("🚀" * 35)
+        assert info.units == 70
+        assert info.segments == 1
+        assert analyze_sms("🚀" * 36).segments == 2
+
+    def test_boundaries_cover_text(self):
+        """Test that boundaries are contiguous and span the text."""
+        text = "Привет мир " * 40
+        info = analyze_sms(text)
+        assert info.boundaries[0][0] == 0
+        assert info.boundaries[-1][1] == len(text)
+        for (_, end), (start, _) in zip(info.boundaries, info.boundaries[1:]):
+            assert end == start
+        assert len(info.boundaries) == info.segments
+
+    def test_forced_encoding(self):
+        """Test explicit encoding overrides detection."""
+        assert analyze_sms("a" * 100, encoding=UCS2).segments == 2
+        with pytest.raises(ValueError):
+            analyze_sms("a", encoding="UTF-8")
+
+    def test_forced_gsm7_substitutes_unsupported_chars(self):
+        """Test forced GSM-7 counts unsupported characters as one septet each."""
+        info = analyze_sms("日本€", encoding=GSM7)
+        assert info.units == 4
+        assert info.non_gsm_chars == ("日", "本")
+
+    def test_calculate_sms_segments_auto_detects(self):
+        """Test the helper wrapper auto-detects UCS-2."""
+        assert calculate_sms_segments("a" * 100) == 1
+        assert calculate_sms_segments("a" * 99 + "😀") == 2
+        assert calculate_sms_segments("a" * 100, encoding="GSM-7") == 1
+
+
+# ========================================
+# Batch API Tests
+# ========================================
+
+@pytest.mark.unit
+class TestBatchAnalysis:
+    """Test batch segment analysis."""
+
+    def test_batch_preserves_order(self):
+        """Test that results match input order."""
+        texts = ["short", "a" * 200, "emoji 🎉"]
+        results = analyze_sms_batch(texts)
+        assert [r.segments for r in results] == [1, 2, 1]
+        assert [r.encoding for r in results] == [GSM7, GSM7, UCS2]
+
+    def test_batch_reuses_duplicates(self):
+        """Test that duplicate texts share one result."""
+        results = analyze_sms_batch(["same text"] * 3)
+        assert results[0] is results[1] is results[2]
+
+    @pytest.mark.performance
+    def test_batch_throughput(self):
+        """Test that segmenting 10k max-length messages is fast."""
+        import time
+
+        texts = [f"Message {i} " + "x" * 1580 for i in range(10_000)]
+
+        start = time.time()
+        results = analyze_sms_batch(texts)
+        duration = time.time() - start
+
+        assert len(results) == 10_000
+        assert duration < 5.0, f"Batch segmentation took {duration:.2f}s (too slow)"
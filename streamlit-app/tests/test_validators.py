@@ -20,6 +20,8 @@ from utils.validators import (
     validate_positive_integer,
     sanitize_filename,
     validate_sender_whitelist,
+    cached_validation,
+    validation_cache,
 )
 
 
@@ -523,6 +525,58 @@ class TestValidationSecurity:
             assert "\\" not in sanitized
 
 
+# ========================================
+# Cached Validation Tests
+# ========================================
+
+@pytest.mark.unit
+class TestCachedValidation:
+    """Test validation result caching."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        """Start every test with an empty validation cache."""
+        validation_cache.clear()
+        yield
+        validation_cache.clear()
+
+    def test_same_results_as_validator(self):
+        """Test that cached results match direct calls."""
+        for validator, value in [
+            (validate_domain, "example.com"),
+            (validate_domain, "not a domain"),
+            (validate_phone_number, "+15551234567"),
+            (validate_sender_whitelist, "a@example.com\nb@example.com"),
+            (validate_sender_whitelist, "a@example.com\nbad"),
+        ]:
+            assert cached_validation(validator, value) == validator(value)
+            assert cached_validation(validator, value) == validator(value)
+
+    def test_cached_per_validator_and_value(self, mocker):
+        """Test that each (validator, value) pair is validated once."""
+        validator = mocker.Mock(return_value=(True, None))
+        validator.__module__, validator.__qualname__ = "tests", "validator"
+
+        for value in ["a", "b", "a", "b", "a"]:
+            cached_validation(validator, value)
+
+        assert [call.args for call in validator.call_args_list] == [("a",), ("b",)]
+        assert validation_cache.hits == 3
+        assert cached_validation(validate_email, "a") != cached_validation(validate_domain, "a")
+
+    def test_secrets_not_stored_in_keys(self):
+        """Test that cache keys hold a hash rather than the input."""
+        token = "a1b2c3d4e5f6a7b8c9d0e1f2a3b4c5d6"
+        cached_validation(validate_twilio_token, token)
+        assert token not in repr(list(validation_cache._data))
+
+    def test_returned_lists_are_copies(self):
+        """Test that callers cannot modify the cached whitelist."""
+        _, _, emails = cached_validation(validate_sender_whitelist, "a@example.com")
+        emails.append("injected@example.com")
+        assert cached_validation(validate_sender_whitelist, "a@example.com")[2] == ["a@example.com"]
+
+
 # ========================================
 # Edge Case Tests
 # ========================================
@@ -0,0 +1,143 @@
+"""
+Tests for the parallel ZIP writer.
+
+Tests byte-identical output with the serial writer, deterministic entry
+order under concurrency, non-seekable output, and throughput against the
+serial create_zip_archive path.
+"""
+import io
+import shutil
+import subprocess
+import time
+import zipfile
+import pytest
+
+from components.download_manager import create_zip_archive
+from utils.archive import build_zip
+from utils.zip_writer import ParallelZipWriter, build_zip_parallel
+
+
+class _NonSeekable(io.RawIOBase):
+    """Write-only stream that rejects seek/tell."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def seekable(self):
+        return False
+
+
+@pytest.fixture
+def fleet_files(valid_worker_config):
+    """Bundle of 100 email workers (~1,000 entries)."""
+    from generators import CodeGenerator
+
+    files = CodeGenerator(valid_worker_config).generate_all_email_worker()
+    return {
+        f"tenant-{i:03d}/{path}": content.replace("email-to-sms", f"tenant-{i}")
+        for i in range(100)
+        for path, content in files.items()
+    }
+
+
+# ========================================
+# Output Tests
+# ========================================
+
+@pytest.mark.unit
+class TestParallelZipOutput:
+    """Test archive correctness."""
+
+    @pytest.mark.parametrize("compression,level", [
+        ("deflate", None), ("deflate", 1), ("deflate", 9), ("stored", None),
+    ])
+    def test_identical_to_serial_writer(self, fleet_files, compression, level):
+        """Test that parallel output is byte-identical to the serial writer."""
+        parallel = build_zip_parallel(fleet_files, "fleet/", compression, level, workers=4)
+        serial = build_zip(fleet_files, "fleet/", compression, level)
+
+        assert parallel.data == serial.data
+        assert parallel.sha256 == serial.sha256
+        assert parallel.entries == serial.entries == len(fleet_files)
+        assert parallel.uncompressed_size == serial.uncompressed_size
+
+    def test_deterministic_across_pool_sizes(self, fleet_files):
+        """Test that the pool size never changes entry order or bytes."""
+        digests = {build_zip_parallel(fleet_files, workers=workers).sha256 for workers in (1, 2, 8)}
+        assert len(digests) == 1
+
+    def test_unicode_names_and_modes(self):
+        """Test UTF-8 filenames and executable scripts."""
+        files = {"docs/résumé.md": "héllo", "deploy.sh": "#!/bin/bash\n"}
+        result = build_zip_parallel(files, "w/")
+
+        with zipfile.ZipFile(io.BytesIO(result.data)) as archive:
+            assert archive.read("w/docs/résumé.md").decode() == "héllo"
+            assert (archive.getinfo("w/deploy.sh").external_attr >> 16) & 0o777 == 0o755
+
+    def test_multiple_bundles_in_one_archive(self):
+        """Test appending several bundles with different prefixes."""
+        buffer = io.BytesIO()
+        with ParallelZipWriter(buffer, workers=2) as writer:
+            writer.write_files({"b.txt": "2", "a.txt": "1"}, prefix="one/")
+            writer.write_files({"a.txt": "3"}, prefix="two/")
+
+        with zipfile.ZipFile(buffer) as archive:
+            assert archive.namelist() == ["one/a.txt", "one/b.txt", "two/a.txt"]
+            assert archive.read("two/a.txt") == b"3"
+
+    def test_non_seekable_output(self, fleet_files):
+        """Test streaming to an output that cannot seek."""
+        stream = _NonSeekable()
+        with ParallelZipWriter(stream, workers=2) as writer:
+            writer.write_files(fleet_files)
+
+        data = b"".join(stream.chunks)
+        assert data == build_zip(fleet_files).data
+
+    @pytest.mark.parametrize("compression,level", [("bzip2", None), ("stored", 5), ("deflate", 0)])
+    def test_unsupported_options(self, compression, level):
+        """Test that unsupported methods and levels are rejected."""
+        with pytest.raises(ValueError):
+            ParallelZipWriter(io.BytesIO(), compression, level)
+
+    @pytest.mark.skipif(shutil.which("unzip") is None, reason="unzip not installed")
+    def test_unzip_integrity(self, fleet_files, tmp_path):
+        """Test the archive with the standard unzip integrity check."""
+        path = tmp_path / "fleet.zip"
+        path.write_bytes(build_zip_parallel(fleet_files, "fleet/").data)
+        check = subprocess.run(["unzip", "-tq", str(path)], capture_output=True, text=True)
+        assert check.returncode == 0, check.stdout + check.stderr
+
+
+# ========================================
+# Throughput Tests
+# ========================================
+
+@pytest.mark.performance
+class TestParallelZipThroughput:
+    """Throughput against the serial create_zip_archive path."""
+
+    def test_throughput_vs_serial(self, fleet_files):
+        """Report MB/s for serial and parallel compression of a fleet bundle."""
+        size_mb = sum(len(content.encode()) for content in fleet_files.values()) / 1024 / 1024
+
+        start = time.perf_counter()
+        create_zip_archive(fleet_files, "fleet")
+        serial = time.perf_counter() - start
+
+        parallel = build_zip_parallel(fleet_files, "fleet/", level=6).duration
+
+        print(
+            f"{size_mb:.1f} MB: serial {size_mb / serial:.1f} MB/s, "
+            f"parallel {size_mb / parallel:.1f} MB/s ({serial / parallel:.2f}x)"
+        )
+        # Must never be meaningfully slower, even on a single core
+        assert parallel < serial * 1.5
@@ -14,7 +14,8 @@ from .validators import (
     validate_cloudflare_api_token,
     sanitize_credential,
     validate_api_credentials,
-    sanitize_user_input
+    sanitize_user_input,
+    cached_validation
 )
 
 from .helpers import (
@@ -38,6 +39,57 @@ from .helpers import (
     sanitize_config_for_export
 )
 
+from .bundle import Bundle, GeneratedFile, as_bundle
+
+from .bundle_store import BundleRef, BundleStore, load_bundle
+
+from .archive import (
+    ArchiveResult,
+    build_archive,
+    build_zip,
+    build_tar_gz,
+    extend_zip,
+    spool_zip,
+    spool_tar_gz,
+    write_zip,
+    write_tar_gz,
+    read_archive
+)
+
+from .bundle_diff import FileDiff, diff_bundles, bundle_patch
+
+from .zip_writer import ParallelZipWriter, build_zip_parallel
+
+from .cache import LRUCache, bundle_fingerprint
+
+from .jobs import Job, JobCancelled, JobScheduler
+
+from .metrics import Counter, Histogram, MetricsRegistry
+
+from .config_export import (
+    write_config_json,
+    export_config_json,
+    is_placeholder
+)
+
+from .config_overlay import (
+    ConfigLayer,
+    ConfigOverlayResolver,
+    compile_path,
+    overlay_merge
+)
+
+from .html_text import HtmlTextExtractor, html_to_text
+
+from .secret_scanner import SecretFinding, scan_text, scan_bundle
+
+from .sms_segments import (
+    SmsSegmentInfo,
+    detect_encoding,
+    analyze_sms,
+    analyze_sms_batch
+)
+
 from .constants import *
 
 __all__ = [
@@ -57,6 +109,7 @@ __all__ = [
     'sanitize_credential',
     'validate_api_credentials',
     'sanitize_user_input',
+    'cached_validation',
     # Helpers
     'format_phone_e164',
     'parse_email_pattern',
@@ -75,5 +128,61 @@ __all__ = [
     'generate_example_email',
     'mask_sensitive_value',
     'validate_no_hardcoded_secrets',
-    'sanitize_config_for_export'
+    'sanitize_config_for_export',
+    # Bundles
+    'Bundle',
+    'GeneratedFile',
+    'as_bundle',
+    'BundleRef',
+    'BundleStore',
+    'load_bundle',
+    # Archives
+    'ArchiveResult',
+    'build_archive',
+    'build_zip',
+    'build_tar_gz',
+    'extend_zip',
+    'spool_zip',
+    'spool_tar_gz',
+    'write_zip',
+    'write_tar_gz',
+    'read_archive',
+    'ParallelZipWriter',
+    'build_zip_parallel',
+    # Bundle diffs
+    'FileDiff',
+    'diff_bundles',
+    'bundle_patch',
+    # Caching
+    'LRUCache',
+    'bundle_fingerprint',
+    # Background jobs
+    'Job',
+    'JobCancelled',
+    'JobScheduler',
+    # Metrics
+    'Counter',
+    'Histogram',
+    'MetricsRegistry',
+    # Config export
+    'write_config_json',
+    'export_config_json',
+    'is_placeholder',
+    # Config overlays
+    'ConfigLayer',
+    'ConfigOverlayResolver',
+    'compile_path',
+    'overlay_merge',
+    # HTML to text
+    'HtmlTextExtractor',
+    'html_to_text',
+    # Secret scanning
+    'SecretFinding',
+    'scan_text',
+    'scan_bundle',
+    # SMS segments
+    'SmsSegmentInfo',
+    'detect_encoding',
+    'analyze_sms',
+    'analyze_sms_batch'
 ]
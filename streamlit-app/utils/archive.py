@@ -0,0 +1,462 @@
+"""
+Archive writers for generated file bundles.
+
+Output is reproducible: entries are written in sorted order with a fixed
+timestamp and fixed permissions, so identical bundles produce identical
+bytes in both ZIP and tar.gz formats.
+"""
+import gzip
+import hashlib
+import io
+import posixpath
+import tarfile
+import tempfile
+import time
+import zipfile
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Dict, Optional, Tuple
+
+from .bundle import encoded
+
+
+# Supported ZIP compression methods
+COMPRESSION_METHODS = {
+    'stored': zipfile.ZIP_STORED,
+    'deflate': zipfile.ZIP_DEFLATED,
+    'bzip2': zipfile.ZIP_BZIP2,
+    'lzma': zipfile.ZIP_LZMA,
+}
+
+# Methods that accept a compression level (1-9); zipfile ignores levels for the others
+LEVELED_METHODS = ('deflate', 'bzip2')
+
+# Supported archive formats and their MIME types
+ARCHIVE_FORMATS = {
+    'zip': 'application/zip',
+    'tar.gz': 'application/gzip',
+}
+
+# Fixed entry metadata (1980-01-01 00:00:00 UTC, the earliest ZIP timestamp)
+FIXED_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+FIXED_MTIME = 315532800
+FILE_MODE = 0o644
+EXECUTABLE_MODE = 0o755
+
+# Archives larger than this are spooled to a temporary file while being built
+DEFAULT_SPOOL_THRESHOLD = 8 * 1024 * 1024
+
+# Uploaded archives are rejected once their contents exceed this size
+MAX_READ_SIZE = 64 * 1024 * 1024
+
+
+@dataclass
+class ArchiveResult:
+    """Archive bytes with build statistics."""
+    data: bytes
+    sha256: str
+    archive_format: str
+    compression: str
+    level: Optional[int]
+    entries: int
+    uncompressed_size: int
+    duration: float
+
+    @property
+    def compressed_size(self) -> int:
+        """Archive size in bytes."""
+        return len(self.data)
+
+    @property
+    def ratio(self) -> float:
+        """Compressed size as a fraction of the uncompressed content size."""
+        return self.compressed_size / self.uncompressed_size if self.uncompressed_size else 0.0
+
+
+def validate_compression(compression: str, level: Optional[int] = None) -> None:
+    """
+    Validate a compression method and level.
+
+    Args:
+        compression: Method name from COMPRESSION_METHODS
+        level: Compression level, or None for the method default
+
+    Raises:
+        ValueError: If the method or level is not supported
+    """
+    if compression not in COMPRESSION_METHODS:
+        raise ValueError(
+            f"Unsupported compression method: {compression} "
+            f"(expected one of {', '.join(COMPRESSION_METHODS)})"
+        )
+    if level is None:
+        return
+    if compression not in LEVELED_METHODS:
+        raise ValueError(f"Compression method {compression} does not take a level")
+    if not 1 <= level <= 9:
+        raise ValueError(f"Compression level must be between 1 and 9, got {level}")
+
+
+def entry_mode(path: str) -> int:
+    """
+    Get the fixed permission bits for an archive entry.
+
+    Args:
+        path: Entry path
+
+    Returns:
+        0o755 for shell scripts (e.g. deploy.sh), otherwise 0o644
+    """
+    return EXECUTABLE_MODE if posixpath.basename(path).endswith('.sh') else FILE_MODE
+
+
+def write_zip(
+    fp: BinaryIO,
+    files: Dict[str, str],
+    prefix: str = '',
+    compression: str = 'deflate',
+    level: Optional[int] = None
+) -> int:
+    """
+    Write a bundle as a reproducible ZIP archive to a seekable binary file.
+
+    Args:
+        fp: Writable, seekable binary file-like object
+        files: Dictionary mapping filenames to content
+        prefix: Path prefix for every entry (e.g. "worker-name/")
+        compression: Method name from COMPRESSION_METHODS
+        level: Compression level, or None for the method default
+
+    Returns:
+        Total uncompressed content size in bytes
+    """
+    validate_compression(compression, level)
+    method = COMPRESSION_METHODS[compression]
+
+    with zipfile.ZipFile(fp, 'w', method, compresslevel=level) as zip_file:
+        return _write_zip_entries(zip_file, files, prefix, method, level)
+
+
+def _write_zip_entries(
+    zip_file: zipfile.ZipFile,
+    files: Dict[str, str],
+    prefix: str,
+    method: int,
+    level: Optional[int]
+) -> int:
+    """Write sorted entries with fixed metadata to an open ZipFile."""
+    uncompressed_size = 0
+
+    for filepath in sorted(files):
+        data = encoded(files, filepath)
+        uncompressed_size += len(data)
+
+        info = zipfile.ZipInfo(prefix + filepath, date_time=FIXED_DATE_TIME)
+        info.create_system = 3  # Unix, so extractors apply the mode bits
+        info.external_attr = (0o100000 | entry_mode(filepath)) << 16
+        info.compress_type = method
+        zip_file.writestr(info, data, compresslevel=level)
+
+    return uncompressed_size
+
+
+def write_tar_gz(
+    fp: BinaryIO,
+    files: Dict[str, str],
+    prefix: str = '',
+    level: Optional[int] = None
+) -> int:
+    """
+    Write a bundle as a reproducible gzip-compressed tarball.
+
+    Args:
+        fp: Writable binary file-like object
+        files: Dictionary mapping filenames to content
+        prefix: Path prefix for every entry (e.g. "worker-name/")
+        level: Gzip level 1-9, or None for the default (9)
+
+    Returns:
+        Total uncompressed content size in bytes
+    """
+    validate_compression('deflate', level)
+    uncompressed_size = 0
+
+    # An empty filename and zero mtime keep the gzip header constant
+    with gzip.GzipFile(filename='', mode='wb', fileobj=fp, compresslevel=level or 9, mtime=0) as gz:
+        with tarfile.open(fileobj=gz, mode='w', format=tarfile.GNU_FORMAT) as tar:
+            for filepath in sorted(files):
+                data = encoded(files, filepath)
+                uncompressed_size += len(data)
+
+                info = tarfile.TarInfo(prefix + filepath)
+                info.size = len(data)
+                info.mtime = FIXED_MTIME
+                info.mode = entry_mode(filepath)
+                info.uid = info.gid = 0
+                info.uname = info.gname = ''
+                tar.addfile(info, io.BytesIO(data))
+
+    return uncompressed_size
+
+
+def _spool(writer: Callable[[BinaryIO], int], spool_threshold: int) -> Tuple[BinaryIO, int]:
+    """Run an archive writer against a spooled temporary file."""
+    spool = tempfile.SpooledTemporaryFile(max_size=spool_threshold)
+    try:
+        uncompressed_size = writer(spool)
+    except Exception:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool, uncompressed_size
+
+
+def spool_zip(
+    files: Dict[str, str],
+    prefix: str = '',
+    compression: str = 'deflate',
+    level: Optional[int] = None,
+    spool_threshold: int = DEFAULT_SPOOL_THRESHOLD
+) -> Tuple[BinaryIO, int]:
+    """
+    Build a ZIP archive in memory, rolling over to a temporary file past a threshold.
+
+    Args:
+        files: Dictionary mapping filenames to content
+        prefix: Path prefix for every entry
+        compression: Method name from COMPRESSION_METHODS
+        level: Compression level, or None for the method default
+        spool_threshold: Bytes kept in memory before spilling to disk
+
+    Returns:
+        Tuple of (spooled file rewound to the start, uncompressed size).
+        The caller is responsible for closing the file.
+    """
+    return _spool(lambda fp: write_zip(fp, files, prefix, compression, level), spool_threshold)
+
+
+def spool_tar_gz(
+    files: Dict[str, str],
+    prefix: str = '',
+    level: Optional[int] = None,
+    spool_threshold: int = DEFAULT_SPOOL_THRESHOLD
+) -> Tuple[BinaryIO, int]:
+    """
+    Build a tar.gz archive in memory, rolling over to a temporary file past a threshold.
+
+    Args:
+        files: Dictionary mapping filenames to content
+        prefix: Path prefix for every entry
+        level: Gzip level 1-9, or None for the default
+        spool_threshold: Bytes kept in memory before spilling to disk
+
+    Returns:
+        Tuple of (spooled file rewound to the start, uncompressed size).
+        The caller is responsible for closing the file.
+    """
+    return _spool(lambda fp: write_tar_gz(fp, files, prefix, level), spool_threshold)
+
+
+def build_archive(
+    files: Dict[str, str],
+    prefix: str = '',
+    archive_format: str = 'zip',
+    compression: str = 'deflate',
+    level: Optional[int] = None,
+    spool_threshold: int = DEFAULT_SPOOL_THRESHOLD
+) -> ArchiveResult:
+    """
+    Build a reproducible archive and report its hash, size and build time.
+
+    Args:
+        files: Dictionary mapping filenames to content
+        prefix: Path prefix for every entry
+        archive_format: Format name from ARCHIVE_FORMATS
+        compression: ZIP method name from COMPRESSION_METHODS (tar.gz always uses gzip)
+        level: Compression level, or None for the method default
+        spool_threshold: Bytes kept in memory before spilling to disk
+
+    Returns:
+        ArchiveResult
+
+    Raises:
+        ValueError: If the format, method or level is not supported
+    """
+    start = time.perf_counter()
+
+    if archive_format == 'zip':
+        spool, uncompressed_size = spool_zip(files, prefix, compression, level, spool_threshold)
+    elif archive_format == 'tar.gz':
+        compression = 'gzip'
+        spool, uncompressed_size = spool_tar_gz(files, prefix, level, spool_threshold)
+    else:
+        raise ValueError(
+            f"Unsupported archive format: {archive_format} "
+            f"(expected one of {', '.join(ARCHIVE_FORMATS)})"
+        )
+
+    with spool:
+        data = spool.read()
+
+    return ArchiveResult(
+        data=data,
+        sha256=hashlib.sha256(data).hexdigest(),
+        archive_format=archive_format,
+        compression=compression,
+        level=level,
+        entries=len(files),
+        uncompressed_size=uncompressed_size,
+        duration=time.perf_counter() - start,
+    )
+
+
+def build_zip(
+    files: Dict[str, str],
+    prefix: str = '',
+    compression: str = 'deflate',
+    level: Optional[int] = None,
+    spool_threshold: int = DEFAULT_SPOOL_THRESHOLD
+) -> ArchiveResult:
+    """
+    Build a reproducible ZIP archive and report its hash, size and build time.
+
+    Args:
+        files: Dictionary mapping filenames to content
+        prefix: Path prefix for every entry
+        compression: Method name from COMPRESSION_METHODS
+        level: Compression level, or None for the method default
+        spool_threshold: Bytes kept in memory before spilling to disk
+
+    Returns:
+        ArchiveResult
+    """
+    return build_archive(files, prefix, 'zip', compression, level, spool_threshold)
+
+
+def extend_zip(
+    base: ArchiveResult,
+    files: Dict[str, str],
+    prefix: str = '',
+    compression: Optional[str] = None,
+    level: Optional[int] = None
+) -> ArchiveResult:
+    """
+    Derive a ZIP archive from an existing one by appending entries.
+
+    Entries already in ``base`` are copied as compressed bytes, never
+    decompressed or recompressed; only ``files`` are compressed. New entries
+    follow the base entries in sorted order, so output stays reproducible.
+
+    Args:
+        base: ZIP ArchiveResult to extend
+        files: Dictionary mapping filenames to content for the new entries
+        prefix: Path prefix for the new entries
+        compression: Method name for the new entries (defaults to the base method)
+        level: Compression level, or None for the method default
+
+    Returns:
+        ArchiveResult for the combined archive
+    """
+    if base.archive_format != 'zip':
+        raise ValueError(f"Only ZIP archives can be extended, got {base.archive_format}")
+
+    start = time.perf_counter()
+    compression = compression or base.compression
+    validate_compression(compression, level)
+
+    buffer = io.BytesIO(base.data)
+    with zipfile.ZipFile(buffer, 'a') as zip_file:
+        uncompressed_size = _write_zip_entries(
+            zip_file, files, prefix, COMPRESSION_METHODS[compression], level
+        )
+    data = buffer.getvalue()
+
+    return ArchiveResult(
+        data=data,
+        sha256=hashlib.sha256(data).hexdigest(),
+        archive_format='zip',
+        compression=compression,
+        level=level,
+        entries=base.entries + len(files),
+        uncompressed_size=base.uncompressed_size + uncompressed_size,
+        duration=time.perf_counter() - start,
+    )
+
+
+def build_tar_gz(
+    files: Dict[str, str],
+    prefix: str = '',
+    level: Optional[int] = None,
+    spool_threshold: int = DEFAULT_SPOOL_THRESHOLD
+) -> ArchiveResult:
+    """
+    Build a reproducible tar.gz archive and report its hash, size and build time.
+
+    Args:
+        files: Dictionary mapping filenames to content
+        prefix: Path prefix for every entry
+        level: Gzip level 1-9, or None for the default
+        spool_threshold: Bytes kept in memory before spilling to disk
+
+    Returns:
+        ArchiveResult
+    """
+    return build_archive(files, prefix, 'tar.gz', level=level, spool_threshold=spool_threshold)
+
+
+def _strip_common_prefix(files: Dict[str, str]) -> Dict[str, str]:
+    """Remove a top-level directory shared by every entry (e.g. "worker-name/")."""
+    roots = {path.split('/', 1)[0] for path in files}
+    if len(roots) != 1 or not all('/' in path for path in files):
+        return files
+    return {path.split('/', 1)[1]: content for path, content in files.items()}
+
+
+def read_archive(data: bytes, max_size: int = MAX_READ_SIZE) -> Dict[str, str]:
+    """
+    Read a previously downloaded ZIP or tar.gz bundle back into a file map.
+
+    A top-level directory shared by every entry is removed, so archives from
+    the download section map back to the generated file names. Entries that
+    are not UTF-8 text are skipped.
+
+    Args:
+        data: Archive bytes
+        max_size: Maximum total uncompressed size to read
+
+    Returns:
+        Dictionary mapping filenames to content
+
+    Raises:
+        ValueError: If the data is not a readable archive or is too large
+    """
+    buffer = io.BytesIO(data)
+    members = []
+
+    try:
+        if zipfile.is_zipfile(buffer):
+            with zipfile.ZipFile(buffer) as zip_file:
+                infos = [info for info in zip_file.infolist() if not info.is_dir()]
+                if sum(info.file_size for info in infos) > max_size:
+                    raise ValueError("Archive contents are too large")
+                members = [(info.filename, zip_file.read(info)) for info in infos]
+        else:
+            buffer.seek(0)
+            with tarfile.open(fileobj=buffer, mode='r:*') as tar:
+                total = 0
+                for info in tar:
+                    if not info.isfile():
+                        continue
+                    total += info.size
+                    if total > max_size:
+                        raise ValueError("Archive contents are too large")
+                    members.append((info.name, tar.extractfile(info).read()))
+    except (zipfile.BadZipFile, tarfile.TarError, EOFError, OSError) as e:
+        raise ValueError(f"Not a ZIP or tar.gz archive: {e}") from e
+
+    files = {}
+    for name, content in members:
+        try:
+            files[posixpath.normpath(name).lstrip('/')] = content.decode('utf-8')
+        except UnicodeDecodeError:
+            continue
+    return _strip_common_prefix(files)
@@ -0,0 +1,182 @@
+"""
+Generated file bundles with per-file metadata computed once.
+
+A ``Bundle`` is a ``dict`` of filename to content, so existing code keeps
+working, but each file also carries a ``GeneratedFile`` record with its
+UTF-8 bytes, line count, hash, MIME type, language and (optionally)
+deflated bytes. The UI and archive writers read these instead of
+re-encoding and re-scanning content on every rerun.
+"""
+import hashlib
+import posixpath
+import zlib
+from typing import Dict, Iterator, Optional
+
+from .constants import LANGUAGE_NAMES, MIME_TYPES
+
+
+# Level used for precompressed entries; matches zlib's default (-1)
+PRECOMPRESS_LEVEL = 6
+
+
+def _extension(path: str) -> str:
+    """Get the lowercase extension of a path ('' for dotfiles like .gitignore)."""
+    return posixpath.splitext(path)[1].lower()
+
+
+def mime_type_for(path: str) -> str:
+    """
+    Get the MIME type for a file.
+
+    Args:
+        path: File path
+
+    Returns:
+        MIME type string (text/plain if unknown)
+    """
+    return MIME_TYPES.get(_extension(path), 'text/plain')
+
+
+def language_for(path: str) -> str:
+    """
+    Get the st.code language identifier for a file.
+
+    Args:
+        path: File path
+
+    Returns:
+        Language identifier ('text' if unknown)
+    """
+    return LANGUAGE_NAMES.get(_extension(path), 'text')
+
+
+class GeneratedFile:
+    """One generated file and its precomputed metadata."""
+
+    __slots__ = (
+        'path', 'content', 'data', 'chars', 'lines', 'sha256', 'crc32',
+        'mime_type', 'language', 'compressed'
+    )
+
+    def __init__(self, path: str, content: str, compress: bool = False):
+        """
+        Initialize file record.
+
+        Args:
+            path: File path within the bundle
+            content: File content
+            compress: Also store raw deflate bytes at PRECOMPRESS_LEVEL
+        """
+        self.path = path
+        self.content = content
+        self.data = content.encode('utf-8')
+        self.chars = len(content)
+        self.lines = len(content.splitlines())
+        self.sha256 = hashlib.sha256(self.data).hexdigest()
+        self.crc32 = zlib.crc32(self.data)
+        self.mime_type = mime_type_for(path)
+        self.language = language_for(path)
+        self.compressed: Optional[bytes] = None
+        if compress:
+            compressor = zlib.compressobj(PRECOMPRESS_LEVEL, zlib.DEFLATED, -15)
+            self.compressed = compressor.compress(self.data) + compressor.flush()
+
+    @property
+    def size(self) -> int:
+        """Size in bytes (UTF-8)."""
+        return len(self.data)
+
+    def __repr__(self) -> str:
+        return f"GeneratedFile({self.path!r}, {self.size} bytes, {self.lines} lines)"
+
+
+class Bundle(dict):
+    """
+    Dictionary of generated files with a ``GeneratedFile`` per entry.
+
+    Metadata is computed when the bundle is created. If an entry is later
+    replaced, its record is rebuilt the next time it is requested.
+    """
+
+    __slots__ = ('compress', '_meta')
+
+    def __init__(self, files: Optional[Dict[str, str]] = None, compress: bool = False):
+        """
+        Initialize bundle.
+
+        Args:
+            files: Dictionary mapping filenames to content
+            compress: Precompress every file (see GeneratedFile)
+        """
+        super().__init__(files or {})
+        self.compress = compress
+        self._meta: Dict[str, GeneratedFile] = {
+            path: GeneratedFile(path, content, compress) for path, content in self.items()
+        }
+
+    def file(self, path: str) -> GeneratedFile:
+        """
+        Get the metadata record for a file.
+
+        Args:
+            path: File path
+
+        Returns:
+            GeneratedFile
+
+        Raises:
+            KeyError: If the path is not in the bundle
+        """
+        content = self[path]
+        meta = self._meta.get(path)
+        if meta is None or meta.content is not content:
+            meta = self._meta[path] = GeneratedFile(path, content, self.compress)
+        return meta
+
+    def files(self) -> Iterator[GeneratedFile]:
+        """Iterate over file records in insertion order."""
+        return (self.file(path) for path in self)
+
+    @property
+    def total_size(self) -> int:
+        """Total size in bytes (UTF-8)."""
+        return sum(meta.size for meta in self.files())
+
+    @property
+    def total_chars(self) -> int:
+        """Total number of characters."""
+        return sum(meta.chars for meta in self.files())
+
+    @property
+    def total_lines(self) -> int:
+        """Total number of lines."""
+        return sum(meta.lines for meta in self.files())
+
+
+def as_bundle(files: Dict[str, str]) -> Bundle:
+    """
+    Get a Bundle for a file map, reusing it if it already is one.
+
+    Args:
+        files: Dictionary mapping filenames to content
+
+    Returns:
+        Bundle
+    """
+    return files if isinstance(files, Bundle) else Bundle(files)
+
+
+def encoded(files: Dict[str, str], path: str) -> bytes:
+    """
+    Get the UTF-8 bytes of one file, using the precomputed bytes of a Bundle.
+
+    Args:
+        files: Dictionary mapping filenames to content
+        path: File path
+
+    Returns:
+        File content as bytes
+    """
+    if isinstance(files, Bundle):
+        return files.file(path).data
+    return files[path].encode('utf-8')
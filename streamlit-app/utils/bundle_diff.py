@@ -0,0 +1,370 @@
+"""
+Per-file diffs and unified patches between two generated bundles.
+
+Files with identical hashes are skipped outright. Changed files are diffed
+on line hashes rather than strings: the common head and tail are trimmed
+with slice comparisons, large ranges are bisected on a line that occurs
+once on each side, and the rest is split on all such lines (as in patience
+diff). Only the short gaps without such anchors go through
+``difflib.SequenceMatcher``.
+"""
+import bisect
+import difflib
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .archive import entry_mode
+from .bundle import as_bundle
+
+
+# Opcode tuples as returned by SequenceMatcher.get_opcodes()
+Opcode = Tuple[str, int, int, int, int]
+
+NO_NEWLINE_MARKER = '\\ No newline at end of file\n'
+
+# Ranges with more lines than this are first split on a single anchor line
+BISECT_THRESHOLD = 2000
+PIVOT_TRIES = 32
+
+
+@dataclass
+class FileDiff:
+    """Changes to one file between two bundles."""
+    path: str
+    status: str  # 'added', 'removed', 'modified' or 'unchanged'
+    added: int = 0
+    removed: int = 0
+    hunks: List[str] = field(default_factory=list)
+
+    @property
+    def patch(self) -> str:
+        """Unified diff for this file ('' if unchanged)."""
+        if self.status == 'unchanged':
+            return ''
+        if not self.hunks:
+            # An empty file added or removed has no hunk; only a git header records it
+            kind = 'new' if self.status == 'added' else 'deleted'
+            return (
+                f"diff --git a/{self.path} b/{self.path}\n"
+                f"{kind} file mode 100{entry_mode(self.path):o}\n"
+            )
+        old = '/dev/null' if self.status == 'added' else f"a/{self.path}"
+        new = '/dev/null' if self.status == 'removed' else f"b/{self.path}"
+        return f"--- {old}\n+++ {new}\n" + ''.join(self.hunks)
+
+
+def _intern(old: Sequence[str], new: Sequence[str]) -> Tuple[List[int], List[int]]:
+    """Map each distinct line to a small integer id (collision-free fallback for hashes)."""
+    ids: Dict[str, int] = {}
+    old_ids = [ids.setdefault(line, len(ids)) for line in old]
+    new_ids = [ids.setdefault(line, len(ids)) for line in new]
+    return old_ids, new_ids
+
+
+def _common_prefix(a: List[int], b: List[int], alo: int, ahi: int, blo: int, bhi: int) -> int:
+    """Length of the shared head, found by binary search over slice comparisons."""
+    low, high = 0, min(ahi - alo, bhi - blo)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[alo:alo + middle] == b[blo:blo + middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _common_suffix(a: List[int], b: List[int], alo: int, ahi: int, blo: int, bhi: int) -> int:
+    """Length of the shared tail, found by binary search over slice comparisons."""
+    low, high = 0, min(ahi - alo, bhi - blo)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[ahi - middle:ahi] == b[bhi - middle:bhi]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _unique_anchors(a: List[int], b: List[int], alo: int, ahi: int, blo: int, bhi: int) -> List[Tuple[int, int]]:
+    """
+    Pair lines that occur exactly once on each side, keeping the longest in-order run.
+
+    Returns:
+        (index in a, index in b) pairs, increasing on both sides
+    """
+    counts_a = Counter(a[alo:ahi])
+    counts_b = Counter(b[blo:bhi])
+    unique = (
+        {line for line, count in counts_a.items() if count == 1}
+        & {line for line, count in counts_b.items() if count == 1}
+    )
+    if not unique:
+        return []
+    positions_b = {line: j for j, line in enumerate(b[blo:bhi], blo) if line in unique}
+    pairs = [(i, positions_b[line]) for i, line in enumerate(a[alo:ahi], alo) if line in unique]
+
+    js = [j for _, j in pairs]
+    if js == sorted(js):
+        # Nothing moved: every unique pair is already in order
+        return pairs
+
+    # Longest increasing subsequence of b indices (patience sorting)
+    tails: List[int] = []
+    tail_index: List[int] = []
+    previous = [-1] * len(pairs)
+    for index, j in enumerate(js):
+        position = bisect.bisect_left(tails, j)
+        if position == len(tails):
+            tails.append(j)
+            tail_index.append(index)
+        else:
+            tails[position] = j
+            tail_index[position] = index
+        previous[index] = tail_index[position - 1] if position else -1
+
+    anchors = []
+    index = tail_index[-1]
+    while index != -1:
+        anchors.append(pairs[index])
+        index = previous[index]
+    anchors.reverse()
+    return anchors
+
+
+def _pivot(a: List[int], b: List[int], alo: int, ahi: int, blo: int, bhi: int) -> Optional[Tuple[int, int]]:
+    """Find a line near the middle of a[alo:ahi] that occurs once on each side."""
+    a_range, b_range = a[alo:ahi], b[blo:bhi]
+    middle = (alo + ahi) // 2
+    for i in range(middle, min(ahi, middle + PIVOT_TRIES)):
+        if a_range.count(a[i]) == 1 and b_range.count(a[i]) == 1:
+            return i, blo + b_range.index(a[i])
+    return None
+
+
+def _add_block(blocks: List[Tuple[int, int, int]], i: int, j: int, size: int) -> None:
+    """Append a matching block, merging it with the previous one if adjacent."""
+    if blocks:
+        last_i, last_j, last_size = blocks[-1]
+        if last_i + last_size == i and last_j + last_size == j:
+            blocks[-1] = (last_i, last_j, last_size + size)
+            return
+    blocks.append((i, j, size))
+
+
+def _match(a: List[int], b: List[int], alo: int, ahi: int, blo: int, bhi: int,
+           blocks: List[Tuple[int, int, int]]) -> None:
+    """Append matching (i, j, size) blocks for a[alo:ahi] and b[blo:bhi], in order."""
+    # Generated files usually differ in a few places, so trim the shared ends first
+    head = _common_prefix(a, b, alo, ahi, blo, bhi)
+    if head:
+        _add_block(blocks, alo, blo, head)
+        alo += head
+        blo += head
+    tail = _common_suffix(a, b, alo, ahi, blo, bhi)
+    ahi -= tail
+    bhi -= tail
+
+    pivot = None
+    if (ahi - alo) + (bhi - blo) > BISECT_THRESHOLD:
+        pivot = _pivot(a, b, alo, ahi, blo, bhi)
+
+    if pivot:
+        # Large ranges: split on one anchor so each half trims its shared ends
+        i, j = pivot
+        _match(a, b, alo, i, blo, j, blocks)
+        _add_block(blocks, i, j, 1)
+        _match(a, b, i + 1, ahi, j + 1, bhi, blocks)
+    elif alo < ahi and blo < bhi:
+        anchors = _unique_anchors(a, b, alo, ahi, blo, bhi)
+        if anchors:
+            # Group consecutive anchors into runs, then diff the gaps between runs
+            runs = [[anchors[0][0], anchors[0][1], 0]]
+            for i, j in anchors:
+                run = runs[-1]
+                if i == run[0] + run[2] and j == run[1] + run[2]:
+                    run[2] += 1
+                else:
+                    runs.append([i, j, 1])
+
+            for i, j, size in runs:
+                if alo < i and blo < j:
+                    _match(a, b, alo, i, blo, j, blocks)
+                _add_block(blocks, i, j, size)
+                alo, blo = i + size, j + size
+            if alo < ahi and blo < bhi:
+                _match(a, b, alo, ahi, blo, bhi, blocks)
+        else:
+            matcher = difflib.SequenceMatcher(None, a[alo:ahi], b[blo:bhi], autojunk=False)
+            for i, j, size in matcher.get_matching_blocks():
+                if size:
+                    _add_block(blocks, alo + i, blo + j, size)
+
+    if tail:
+        _add_block(blocks, ahi, bhi, tail)
+
+
+def line_opcodes(old: Sequence[str], new: Sequence[str]) -> List[Opcode]:
+    """
+    Compute diff opcodes between two line sequences.
+
+    Args:
+        old: Original lines
+        new: Changed lines
+
+    Returns:
+        Opcodes in SequenceMatcher.get_opcodes() format
+    """
+    # Compare line hashes; on the (unlikely) event of a collision, redo with exact ids
+    a, b = list(map(hash, old)), list(map(hash, new))
+    blocks: List[Tuple[int, int, int]] = []
+    _match(a, b, 0, len(a), 0, len(b), blocks)
+    if any(old[i:i + size] != new[j:j + size] for i, j, size in blocks):
+        a, b = _intern(old, new)
+        blocks = []
+        _match(a, b, 0, len(a), 0, len(b), blocks)
+
+    opcodes: List[Opcode] = []
+    i = j = 0
+    # A zero-size sentinel block closes any trailing change
+    for block_i, block_j, size in blocks + [(len(a), len(b), 0)]:
+        if i < block_i and j < block_j:
+            opcodes.append(('replace', i, block_i, j, block_j))
+        elif i < block_i:
+            opcodes.append(('delete', i, block_i, j, j))
+        elif j < block_j:
+            opcodes.append(('insert', i, i, j, block_j))
+        if size:
+            opcodes.append(('equal', block_i, block_i + size, block_j, block_j + size))
+        i, j = block_i + size, block_j + size
+
+    return opcodes
+
+
+def _group_opcodes(opcodes: List[Opcode], context: int) -> List[List[Opcode]]:
+    """Group opcodes into hunks with ``context`` lines around each change."""
+    if not opcodes:
+        opcodes = [('equal', 0, 1, 0, 1)]
+
+    # Clip leading and trailing context
+    tag, i1, i2, j1, j2 = opcodes[0]
+    if tag == 'equal':
+        opcodes[0] = (tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2)
+    tag, i1, i2, j1, j2 = opcodes[-1]
+    if tag == 'equal':
+        opcodes[-1] = (tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context))
+
+    groups: List[List[Opcode]] = []
+    group: List[Opcode] = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        # Split long unchanged runs into the end of one hunk and the start of the next
+        if tag == 'equal' and i2 - i1 > context * 2:
+            group.append((tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)))
+            groups.append(group)
+            group = []
+            i1, j1 = max(i1, i2 - context), max(j1, j2 - context)
+        group.append((tag, i1, i2, j1, j2))
+
+    if group and not (len(group) == 1 and group[0][0] == 'equal'):
+        groups.append(group)
+    return groups
+
+
+def _range(start: int, stop: int) -> str:
+    """Format a hunk range the way ``diff -u`` does."""
+    length = stop - start
+    beginning = start + 1
+    if length == 1:
+        return str(beginning)
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def _line(prefix: str, line: str) -> str:
+    """Format one patch line, marking a missing final newline."""
+    if line.endswith('\n'):
+        return prefix + line
+    return prefix + line + '\n' + NO_NEWLINE_MARKER
+
+
+def diff_lines(old: Sequence[str], new: Sequence[str], context: int = 3) -> Tuple[List[str], int, int]:
+    """
+    Build unified diff hunks between two line sequences.
+
+    Args:
+        old: Original lines (with line endings)
+        new: Changed lines (with line endings)
+        context: Unchanged lines shown around each change
+
+    Returns:
+        Tuple of (hunks, lines added, lines removed)
+    """
+    hunks = []
+    added = removed = 0
+
+    for group in _group_opcodes(line_opcodes(old, new), context):
+        first, last = group[0], group[-1]
+        lines = [f"@@ -{_range(first[1], last[2])} +{_range(first[3], last[4])} @@\n"]
+        for tag, i1, i2, j1, j2 in group:
+            if tag == 'equal':
+                lines.extend(_line(' ', line) for line in old[i1:i2])
+                continue
+            if tag in ('replace', 'delete'):
+                lines.extend(_line('-', line) for line in old[i1:i2])
+                removed += i2 - i1
+            if tag in ('replace', 'insert'):
+                lines.extend(_line('+', line) for line in new[j1:j2])
+                added += j2 - j1
+        hunks.append(''.join(lines))
+
+    return hunks, added, removed
+
+
+def diff_bundles(old: Dict[str, str], new: Dict[str, str], context: int = 3) -> List[FileDiff]:
+    """
+    Compare two bundles file by file.
+
+    Args:
+        old: Previous bundle (e.g. read from an uploaded archive)
+        new: Current bundle
+        context: Unchanged lines shown around each change
+
+    Returns:
+        FileDiff per path in either bundle, sorted by path
+    """
+    old, new = as_bundle(old), as_bundle(new)
+    diffs = []
+
+    for path in sorted(set(old) | set(new)):
+        if path not in new:
+            status = 'removed'
+        elif path not in old:
+            status = 'added'
+        elif old.file(path).sha256 == new.file(path).sha256:
+            diffs.append(FileDiff(path, 'unchanged'))
+            continue
+        else:
+            status = 'modified'
+
+        hunks, added, removed = diff_lines(
+            old[path].splitlines(keepends=True) if path in old else [],
+            new[path].splitlines(keepends=True) if path in new else [],
+            context
+        )
+        diffs.append(FileDiff(path, status, added, removed, hunks))
+
+    return diffs
+
+
+def bundle_patch(diffs: List[FileDiff]) -> str:
+    """
+    Join file diffs into one patch for ``git apply`` or ``patch -p1``.
+
+    Args:
+        diffs: Result of diff_bundles
+
+    Returns:
+        Unified patch text
+    """
+    return ''.join(diff.patch for diff in diffs)
@@ -0,0 +1,262 @@
+"""
+Process-wide content-addressed store for generated bundles.
+
+Sessions keep a ``BundleRef`` (file paths and content hashes) in
+``st.session_state`` instead of their own copy of every file. The store
+keeps each distinct file content once, keyed by SHA-256 and optionally
+deflated, no matter how many sessions or generations use it.
+
+Each content blob is reference counted. A ``BundleRef`` holds one reference
+per file and releases it when the ref is garbage collected, for example when
+a session replaces its bundle or the session ends. Unreferenced blobs stay
+cached for regenerations until the store exceeds its memory cap, then the
+least recently used are evicted. Referenced blobs are never evicted, so the
+cap bounds the cache of unreferenced content, not live sessions.
+"""
+import hashlib
+import threading
+import weakref
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterator, Optional, Tuple
+
+from .bundle import PRECOMPRESS_LEVEL, Bundle, as_bundle
+from .cache import LRUCache
+from .constants import BUNDLE_STORE_MATERIALIZED_ENTRIES, BUNDLE_STORE_MAX_BYTES
+
+
+class _Blob:
+    """One stored file content."""
+
+    __slots__ = ('data', 'compressed', 'refs')
+
+    def __init__(self, data: bytes, compressed: bool):
+        self.data = data
+        self.compressed = compressed
+        self.refs = 0
+
+    def content(self) -> str:
+        """Decoded file content."""
+        data = zlib.decompress(self.data, -15) if self.compressed else self.data
+        return data.decode('utf-8')
+
+
+class BundleRef:
+    """
+    Reference to a bundle held in a BundleStore.
+
+    Behaves like a read-only view of the file list (``len``, iteration,
+    ``in``); use ``BundleStore.get`` or ``load_bundle`` for the contents.
+    """
+
+    __slots__ = ('store', 'key', 'manifest', 'compress', '_release', '__weakref__')
+
+    def __init__(self, store: 'BundleStore', manifest: Tuple[Tuple[str, str], ...], compress: bool):
+        """
+        Initialize reference.
+
+        Args:
+            store: Store holding the contents
+            manifest: Ordered (path, sha256) pairs
+            compress: Whether the bundle is precompressed when loaded
+        """
+        self.store = store
+        self.manifest = manifest
+        self.compress = compress
+        self.key = hashlib.sha256(repr((manifest, compress)).encode('utf-8')).hexdigest()
+        self._release = weakref.finalize(self, store._release, [digest for _, digest in manifest])
+
+    def release(self) -> None:
+        """Release the store references now instead of at garbage collection."""
+        self._release()
+
+    @property
+    def released(self) -> bool:
+        """Whether the references have been released."""
+        return not self._release.alive
+
+    def __len__(self) -> int:
+        return len(self.manifest)
+
+    def __iter__(self) -> Iterator[str]:
+        return (path for path, _ in self.manifest)
+
+    def __contains__(self, path: object) -> bool:
+        return any(path == entry for entry, _ in self.manifest)
+
+    def __repr__(self) -> str:
+        return f"BundleRef({self.key[:12]}, {len(self)} files)"
+
+
+class BundleStore:
+    """
+    Thread-safe store of file contents shared by all sessions.
+
+    Loaded bundles are also kept in a small LRU, so sessions viewing the
+    same bundle share one in-memory Bundle across reruns.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = BUNDLE_STORE_MAX_BYTES,
+        compress: bool = True,
+        materialized_entries: int = BUNDLE_STORE_MATERIALIZED_ENTRIES
+    ):
+        """
+        Initialize store.
+
+        Args:
+            max_bytes: Size above which unreferenced blobs are evicted
+            compress: Store content deflated instead of raw UTF-8
+            materialized_entries: Number of loaded bundles kept in memory
+        """
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self._blobs: 'OrderedDict[str, _Blob]' = OrderedDict()
+        self._total_bytes = 0
+        # Reentrant: a BundleRef finalizer may run during garbage collection
+        # triggered while this thread already holds the lock
+        self._lock = threading.RLock()
+        self._materialized = LRUCache(max_entries=materialized_entries)
+
+    def put(self, files: Dict[str, str]) -> BundleRef:
+        """
+        Store a bundle and get a reference to it.
+
+        Content already in the store is not stored again. Precompressed
+        Bundles reuse their deflated bytes.
+
+        Args:
+            files: Dictionary mapping filenames to content
+
+        Returns:
+            BundleRef holding one reference per file
+        """
+        bundle = as_bundle(files)
+        manifest = []
+        with self._lock:
+            for meta in bundle.files():
+                blob = self._blobs.get(meta.sha256)
+                if blob is None:
+                    blob = self._encode(meta)
+                    blob.refs = 1
+                    self._blobs[meta.sha256] = blob
+                    self._total_bytes += len(blob.data)
+                else:
+                    blob.refs += 1
+                    self._blobs.move_to_end(meta.sha256)
+                manifest.append((meta.path, meta.sha256))
+            self._evict()
+
+        ref = BundleRef(self, tuple(manifest), bundle.compress)
+        self._materialized.put(ref.key, bundle)
+        return ref
+
+    def get(self, ref: BundleRef) -> Bundle:
+        """
+        Load the bundle behind a reference.
+
+        Args:
+            ref: Reference returned by put
+
+        Returns:
+            Bundle (shared; do not modify)
+
+        Raises:
+            KeyError: If the reference was released or belongs to another store
+        """
+        if ref.store is not self or ref.released:
+            raise KeyError(f"{ref!r} is not held in this store")
+        return self._materialized.get_or_create(ref.key, lambda: self._load(ref))
+
+    def _load(self, ref: BundleRef) -> Bundle:
+        """Rebuild a Bundle from stored blobs."""
+        with self._lock:
+            blobs = []
+            for _, digest in ref.manifest:
+                self._blobs.move_to_end(digest)
+                blobs.append(self._blobs[digest])
+        files = {path: blob.content() for (path, _), blob in zip(ref.manifest, blobs)}
+        return Bundle(files, compress=ref.compress)
+
+    def _encode(self, meta) -> _Blob:
+        """Create the blob for a GeneratedFile."""
+        if not self.compress:
+            return _Blob(meta.data, compressed=False)
+        if meta.compressed is not None:
+            return _Blob(meta.compressed, compressed=True)
+        compressor = zlib.compressobj(PRECOMPRESS_LEVEL, zlib.DEFLATED, -15)
+        return _Blob(compressor.compress(meta.data) + compressor.flush(), compressed=True)
+
+    def _release(self, digests) -> None:
+        """Drop one reference per digest (called by BundleRef finalizers)."""
+        with self._lock:
+            for digest in digests:
+                blob = self._blobs.get(digest)
+                if blob is not None:
+                    blob.refs -= 1
+            self._evict()
+
+    def _evict(self) -> None:
+        """Evict least recently used unreferenced blobs while over the cap (lock held)."""
+        if self._total_bytes <= self.max_bytes:
+            return
+        for digest in [digest for digest, blob in self._blobs.items() if blob.refs <= 0]:
+            self._drop(digest)
+            if self._total_bytes <= self.max_bytes:
+                break
+
+    def _drop(self, digest: str) -> None:
+        """Remove a blob (lock held)."""
+        blob = self._blobs.pop(digest, None)
+        if blob is not None:
+            self._total_bytes -= len(blob.data)
+
+    def clear(self) -> None:
+        """Drop unreferenced blobs and all loaded bundles."""
+        with self._lock:
+            for digest in [digest for digest, blob in self._blobs.items() if blob.refs <= 0]:
+                self._drop(digest)
+        self._materialized.clear()
+
+    @property
+    def total_bytes(self) -> int:
+        """Stored size of all blobs."""
+        return self._total_bytes
+
+    @property
+    def blob_count(self) -> int:
+        """Number of distinct contents stored."""
+        return len(self._blobs)
+
+    def references(self, digest: str) -> int:
+        """
+        Count references to a content hash.
+
+        Args:
+            digest: SHA-256 hex digest
+
+        Returns:
+            Number of live references (0 if not stored)
+        """
+        blob = self._blobs.get(digest)
+        return blob.refs if blob else 0
+
+
+# Bundles from every session, stored once per distinct file content
+bundle_store = BundleStore()
+
+
+def load_bundle(files) -> Optional[Dict[str, str]]:
+    """
+    Get file contents from a BundleRef, passing plain dictionaries through.
+
+    Args:
+        files: BundleRef, Bundle, dictionary or None
+
+    Returns:
+        Bundle or dictionary mapping filenames to content
+    """
+    if isinstance(files, BundleRef):
+        return files.store.get(files)
+    return files
@@ -0,0 +1,133 @@
+"""Process-wide bounded caches shared across Streamlit sessions."""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from .bundle import encoded
+
+
+def bundle_fingerprint(files: Dict[str, str], *parts: str) -> str:
+    """
+    Compute a content hash for a generated file map.
+
+    Args:
+        files: Dictionary mapping filenames to content
+        *parts: Extra values that affect derived output (e.g. worker name)
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    for filepath in sorted(files):
+        digest.update(filepath.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(encoded(files, filepath))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache bounded by entry count and size.
+
+    Module-level instances live for the whole server process, so every
+    Streamlit session shares them.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        max_bytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = len
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            max_entries: Maximum number of entries
+            max_bytes: Maximum total size of values (None = unbounded)
+            sizeof: Function returning the size of a value
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._data: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value and mark it recently used."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting least recently used entries as needed."""
+        size = self._sizeof(value)
+        with self._lock:
+            if key in self._data:
+                self._total_bytes -= self._sizes.pop(key)
+                del self._data[key]
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._data[key] = value
+            self._sizes[key] = size
+            self._total_bytes += size
+            self._evict()
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Get a cached value or build and store it.
+
+        Args:
+            key: Cache key
+            factory: Called with no arguments on a miss
+
+        Returns:
+            Cached or newly created value
+        """
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Remove all entries and reset statistics."""
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of cached values."""
+        return self._total_bytes
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _evict(self) -> None:
+        """Drop oldest entries until within bounds (lock must be held)."""
+        while len(self._data) > self.max_entries or (
+            self.max_bytes is not None and self._total_bytes > self.max_bytes
+        ):
+            key, _ = self._data.popitem(last=False)
+            self._total_bytes -= self._sizes.pop(key)
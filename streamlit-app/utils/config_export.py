@@ -0,0 +1,145 @@
+"""Streaming, redacting JSON export of worker configurations."""
+import io
+import json
+from dataclasses import fields, is_dataclass
+from json.encoder import encode_basestring_ascii
+from typing import Any, Mapping, TextIO, Tuple
+
+
+# Configuration fields replaced by placeholders on export
+SENSITIVE_PATHS = frozenset({
+    ('twilio', 'account_sid'),
+    ('twilio', 'auth_token'),
+    ('twilio', 'phone_number'),
+    ('cloudflare', 'api_token'),
+    ('integrations', 'notification_email'),
+})
+
+# String lists are encoded in slices of this size to bound memory
+_LIST_CHUNK = 1024
+
+
+def placeholder_for(key: str) -> str:
+    """
+    Get the export placeholder for a sensitive field.
+
+    Args:
+        key: Field name
+
+    Returns:
+        Placeholder string
+    """
+    return f"<{key.upper()}_PLACEHOLDER>"
+
+
+def is_placeholder(value: Any) -> bool:
+    """
+    Check whether a value is an export placeholder.
+
+    Args:
+        value: Value read from an exported configuration
+
+    Returns:
+        True if value is a placeholder
+    """
+    return isinstance(value, str) and value.startswith('<') and value.endswith('_PLACEHOLDER>')
+
+
+def _encode_scalar(value: Any) -> str:
+    """Encode a JSON scalar exactly as json.dumps would."""
+    if isinstance(value, str):
+        return encode_basestring_ascii(value)
+    return json.dumps(value, default=str)
+
+
+def _items(obj: Any):
+    """Iterate (key, value) pairs of a dataclass or mapping without copying."""
+    if is_dataclass(obj):
+        return ((f.name, getattr(obj, f.name)) for f in fields(obj))
+    return obj.items()
+
+
+def _write_value(fp: TextIO, value: Any, path: Tuple[str, ...], level: int, indent: str, redact: bool):
+    """Write a single value, recursing into containers."""
+    if is_dataclass(value) or isinstance(value, Mapping):
+        _write_object(fp, value, path, level, indent, redact)
+    elif isinstance(value, (list, tuple)):
+        _write_array(fp, value, path, level, indent, redact)
+    else:
+        fp.write(_encode_scalar(value))
+
+
+def _write_object(fp: TextIO, obj: Any, path: Tuple[str, ...], level: int, indent: str, redact: bool):
+    """Write a dataclass or mapping as a JSON object."""
+    inner = '\n' + indent * (level + 1)
+    first = True
+
+    for key, value in _items(obj):
+        fp.write(('{' if first else ',') + inner + encode_basestring_ascii(str(key)) + ': ')
+        first = False
+        child_path = path + (key,)
+        if redact and child_path in SENSITIVE_PATHS:
+            fp.write(encode_basestring_ascii(placeholder_for(key)))
+        else:
+            _write_value(fp, value, child_path, level + 1, indent, redact)
+
+    fp.write('{}' if first else '\n' + indent * level + '}')
+
+
+def _write_array(fp: TextIO, items: Any, path: Tuple[str, ...], level: int, indent: str, redact: bool):
+    """Write a list as a JSON array."""
+    if not items:
+        fp.write('[]')
+        return
+
+    inner = '\n' + indent * (level + 1)
+    fp.write('[' + inner)
+
+    if all(type(item) is str for item in items):
+        # Fast path for string lists such as sender whitelists
+        separator = ',' + inner
+        for start in range(0, len(items), _LIST_CHUNK):
+            if start:
+                fp.write(separator)
+            fp.write(separator.join(map(encode_basestring_ascii, items[start:start + _LIST_CHUNK])))
+    else:
+        for index, item in enumerate(items):
+            if index:
+                fp.write(',' + inner)
+            _write_value(fp, item, path, level + 1, indent, redact)
+
+    fp.write('\n' + indent * level + ']')
+
+
+def write_config_json(config: Any, fp: TextIO, redact: bool = True, indent: int = 2) -> None:
+    """
+    Stream a configuration as JSON to a file-like object.
+
+    Fields are read directly from the WorkerConfig (or mapping) without an
+    intermediate dict, and sensitive fields are replaced by placeholders as
+    they are written. Output matches ``json.dumps(config.to_dict(), indent=indent)``.
+
+    Args:
+        config: WorkerConfig or configuration mapping
+        fp: Writable text file-like object
+        redact: Replace sensitive fields with placeholders
+        indent: Spaces per indentation level
+    """
+    _write_value(fp, config, (), 0, ' ' * indent, redact)
+
+
+def export_config_json(config: Any, redact: bool = True, indent: int = 2) -> str:
+    """
+    Export a configuration as a JSON string.
+
+    Args:
+        config: WorkerConfig or configuration mapping
+        redact: Replace sensitive fields with placeholders
+        indent: Spaces per indentation level
+
+    Returns:
+        JSON string
+    """
+    buffer = io.StringIO()
+    write_config_json(config, buffer, redact=redact, indent=indent)
+    return buffer.getvalue()
@@ -0,0 +1,244 @@
+"""Layered configuration overlays with cached WorkerConfig resolution."""
+import hashlib
+import json
+from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from schemas import WorkerConfig
+
+
+@lru_cache(maxsize=1024)
+def compile_path(path: str) -> Tuple[str, ...]:
+    """
+    Split a dotted path once and cache the result.
+
+    Args:
+        path: Dot-separated path (e.g., "basic.worker_name")
+
+    Returns:
+        Tuple of keys
+    """
+    return tuple(path.split('.'))
+
+
+def overlay_merge(base: Mapping, override: Mapping) -> Mapping:
+    """
+    Copy-on-write deep merge.
+
+    Neither input is modified. Subtrees the override does not touch are
+    shared with base rather than copied, and base itself is returned when
+    the override is empty.
+
+    Args:
+        base: Base mapping
+        override: Override mapping
+
+    Returns:
+        Merged mapping
+    """
+    if not override:
+        return base
+
+    result = None
+    for key, value in override.items():
+        current = base.get(key)
+        if isinstance(current, Mapping) and isinstance(value, Mapping):
+            merged = overlay_merge(current, value)
+        else:
+            merged = value
+        if merged is current and key in base:
+            continue
+        if result is None:
+            result = dict(base)
+        result[key] = merged
+
+    return base if result is None else result
+
+
+def fingerprint(data: Mapping) -> str:
+    """
+    Compute a stable fingerprint for a configuration layer.
+
+    Args:
+        data: Layer data
+
+    Returns:
+        Hex digest
+    """
+    canonical = json.dumps(data, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class ConfigLayer:
+    """Immutable named configuration layer."""
+    name: str
+    data: Mapping
+    fingerprint: str = field(default='')
+
+    def __post_init__(self):
+        if not self.fingerprint:
+            object.__setattr__(self, 'fingerprint', fingerprint(self.data))
+
+
+class ConfigOverlayResolver:
+    """
+    Resolve WorkerConfig objects from stacks of overlay layers.
+
+    Layers (organization defaults, environment overrides, tenant overrides)
+    are registered by name and tenants are defined as an ordered stack of
+    layer names, lowest precedence first. Resolved configs are cached by
+    the fingerprints of their layers, so replacing one layer re-resolves
+    only the tenants whose stack includes it.
+
+    Resolved WorkerConfig objects are shared between callers; copy them
+    before mutating (CodeGenerator updates metadata in place).
+    """
+
+    def __init__(self):
+        """Initialize an empty resolver."""
+        self._layers: Dict[str, ConfigLayer] = {}
+        self._stacks: Dict[str, Tuple[str, ...]] = {}
+        self._tenants_by_layer: Dict[str, Set[str]] = defaultdict(set)
+        self._cache: Dict[Tuple[str, ...], WorkerConfig] = {}
+        self._tenant_keys: Dict[str, Tuple[str, ...]] = {}
+        self._key_refs: Dict[Tuple[str, ...], int] = defaultdict(int)
+        self.resolutions = 0
+        self.cache_hits = 0
+
+    def set_layer(self, name: str, data: Mapping) -> bool:
+        """
+        Add or replace a layer.
+
+        Args:
+            name: Layer name
+            data: Layer data (treated as immutable after this call)
+
+        Returns:
+            True if the layer content changed
+        """
+        layer = ConfigLayer(name, data)
+        previous = self._layers.get(name)
+        if previous is not None and previous.fingerprint == layer.fingerprint:
+            return False
+
+        self._layers[name] = layer
+        for tenant in self._tenants_by_layer.get(name, ()):
+            self._invalidate(tenant)
+        return True
+
+    def get_layer(self, name: str) -> Optional[ConfigLayer]:
+        """Get a layer by name."""
+        return self._layers.get(name)
+
+    def register_tenant(self, tenant: str, layer_names: Sequence[str]) -> None:
+        """
+        Define the layer stack for a tenant.
+
+        Args:
+            tenant: Tenant identifier
+            layer_names: Layer names, lowest precedence first
+        """
+        for name in self._stacks.get(tenant, ()):
+            self._tenants_by_layer[name].discard(tenant)
+        self._invalidate(tenant)
+
+        self._stacks[tenant] = tuple(layer_names)
+        for name in layer_names:
+            self._tenants_by_layer[name].add(tenant)
+
+    def tenants(self) -> List[str]:
+        """List registered tenants."""
+        return list(self._stacks)
+
+    def affected_tenants(self, layer_name: str) -> Set[str]:
+        """Tenants whose resolution depends on a layer."""
+        return set(self._tenants_by_layer.get(layer_name, ()))
+
+    def resolve_dict(self, tenant: str) -> Mapping:
+        """
+        Merge a tenant's layers without building a WorkerConfig.
+
+        Args:
+            tenant: Tenant identifier
+
+        Returns:
+            Merged configuration mapping
+        """
+        merged: Mapping = {}
+        for layer in self._stack_layers(tenant):
+            merged = overlay_merge(merged, layer.data)
+        return merged
+
+    def resolve(self, tenant: str) -> WorkerConfig:
+        """
+        Resolve a tenant's WorkerConfig, using the cache when possible.
+
+        Args:
+            tenant: Tenant identifier
+
+        Returns:
+            Resolved WorkerConfig (shared; do not mutate)
+
+        Raises:
+            KeyError: If the tenant or one of its layers is unknown
+        """
+        key = tuple(layer.fingerprint for layer in self._stack_layers(tenant))
+
+        config = self._cache.get(key)
+        if config is not None:
+            self.cache_hits += 1
+        else:
+            config = WorkerConfig.from_dict(self.resolve_dict(tenant))
+            self._cache[key] = config
+            self.resolutions += 1
+
+        previous = self._tenant_keys.get(tenant)
+        if previous != key:
+            if previous is not None:
+                self._release(previous)
+            self._tenant_keys[tenant] = key
+            self._key_refs[key] += 1
+        return config
+
+    def resolve_all(self, tenants: Optional[Iterable[str]] = None) -> Dict[str, WorkerConfig]:
+        """
+        Resolve many tenants.
+
+        Args:
+            tenants: Tenants to resolve (default: all registered)
+
+        Returns:
+            Dictionary mapping tenant to WorkerConfig
+        """
+        return {tenant: self.resolve(tenant) for tenant in (self.tenants() if tenants is None else tenants)}
+
+    def _stack_layers(self, tenant: str) -> List[ConfigLayer]:
+        """Look up the layers of a tenant's stack."""
+        try:
+            names = self._stacks[tenant]
+        except KeyError:
+            raise KeyError(f"Unknown tenant: {tenant}") from None
+
+        layers = []
+        for name in names:
+            layer = self._layers.get(name)
+            if layer is None:
+                raise KeyError(f"Tenant '{tenant}' references unknown layer: {name}")
+            layers.append(layer)
+        return layers
+
+    def _invalidate(self, tenant: str) -> None:
+        """Drop a tenant's cached resolution if no other tenant shares it."""
+        key = self._tenant_keys.pop(tenant, None)
+        if key is not None:
+            self._release(key)
+
+    def _release(self, key: Tuple[str, ...]) -> None:
+        """Drop one tenant's reference to a cache entry, evicting it at zero."""
+        self._key_refs[key] -= 1
+        if self._key_refs[key] == 0:
+            del self._key_refs[key]
+            self._cache.pop(key, None)
@@ -15,6 +15,9 @@ DEFAULT_RATE_LIMIT_RECIPIENT = 20
 DEFAULT_MAX_RETRIES = 3
 DEFAULT_RETRY_DELAY = 5
 
+# Approximate Twilio outbound price per SMS segment (USD, US numbers)
+SMS_SEGMENT_PRICE_USD = 0.0079
+
 # Phone Extraction Methods
 PHONE_EXTRACTION_METHODS = {
     "email_prefix": "Email prefix (15551234567@sms.domain.com)",
@@ -31,6 +34,13 @@ CONTENT_SOURCE_OPTIONS = {
     "subject_and_body": "Email subject + body"
 }
 
+# Rate Limit Storage Backends
+RATE_LIMIT_STORAGE_TYPES = {
+    "kv": "KV Namespace",
+    "durable_objects": "Durable Object (atomic, Email Worker only)",
+    "memory": "In-memory (per isolate)"
+}
+
 # Log Storage Types
 LOG_STORAGE_TYPES = {
     "console": "Console only",
@@ -56,6 +66,18 @@ MIME_TYPES = {
     ".txt": "text/plain"
 }
 
+# st.code language identifiers
+LANGUAGE_NAMES = {
+    ".ts": "typescript",
+    ".js": "javascript",
+    ".toml": "toml",
+    ".json": "json",
+    ".md": "markdown",
+    ".sh": "bash",
+    ".yml": "yaml",
+    ".yaml": "yaml"
+}
+
 # Syntax highlighting themes
 PYGMENTS_THEMES = [
     "monokai",
@@ -119,3 +141,44 @@ NPM_DEV_DEPENDENCIES = {
 # Cloudflare compatibility
 CLOUDFLARE_COMPATIBILITY_DATE = "2024-10-22"
 CLOUDFLARE_COMPATIBILITY_FLAGS = ["nodejs_compat"]
+
+# Archive cache bounds (shared by all sessions in the server process)
+ARCHIVE_CACHE_MAX_ENTRIES = 32
+ARCHIVE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Archive compression methods offered for downloads
+ARCHIVE_COMPRESSION_OPTIONS = {
+    "deflate": "Deflate (standard ZIP)",
+    "stored": "Stored (no compression, fastest)",
+    "bzip2": "BZIP2 (smaller, slower)",
+    "lzma": "LZMA (smallest, slowest)"
+}
+
+# Archive formats offered for downloads
+ARCHIVE_FORMAT_OPTIONS = {
+    "zip": "ZIP (.zip)",
+    "tar.gz": "Tarball (.tar.gz)"
+}
+
+# Syntax highlighting: files larger than this use st.code instead of Pygments HTML
+HIGHLIGHT_MAX_CHARS = 50_000
+HIGHLIGHT_CACHE_MAX_ENTRIES = 256
+HIGHLIGHT_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# Form validation results shared across reruns and sessions
+VALIDATION_CACHE_MAX_ENTRIES = 4096
+
+# Code preview: longer files are truncated until "show all" is toggled
+PREVIEW_MAX_LINES = 150
+
+# Background generation jobs (shared executor for all sessions)
+GENERATION_WORKERS = 2
+JOB_POLL_INTERVAL = 0.25
+
+# Content-addressed bundle store (shared by all sessions)
+BUNDLE_STORE_MAX_BYTES = 128 * 1024 * 1024
+BUNDLE_STORE_MATERIALIZED_ENTRIES = 32
+
+# Metrics: recent samples kept per histogram, seconds between METRICS_FILE writes
+METRICS_RECENT_SAMPLES = 1024
+METRICS_FLUSH_INTERVAL = 10.0
@@ -0,0 +1,307 @@
+"""
+Offline replay of .eml files through a Python port of the worker pipeline.
+
+Predicts the SMS recipient, text and segment count the generated worker
+would produce for each email, so routing and truncation settings can be
+checked against a real corpus before deploying.
+
+Usage:
+    python -m utils.email_replay ./corpus --config my-worker-config.json --output predictions.csv
+"""
+import argparse
+import csv
+import email
+import json
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, fields
+from email.header import decode_header, make_header
+from email.utils import parseaddr
+from functools import partial
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from schemas import WorkerConfig
+
+from .helpers import extract_phone_from_subject, truncate_string
+from .sms_segments import analyze_sms
+
+
+# Replay status values
+STATUS_OK = 'ok'
+STATUS_NO_RECIPIENT = 'no_recipient'
+STATUS_BLOCKED = 'sender_blocked'
+STATUS_EMPTY = 'empty_content'
+STATUS_ERROR = 'error'
+
+# Same expressions the generated worker uses
+_EMAIL_PREFIX = re.compile(r'^(\+?\d+)@')
+_HTML_TAG = re.compile(r'<[^>]+>')
+_WHITESPACE = re.compile(r'\s+')
+
+
+@dataclass(slots=True)
+class ReplayResult:
+    """Predicted worker output for one email."""
+    path: str
+    status: str
+    recipient: Optional[str] = None
+    sms_text: str = ''
+    segments: int = 0
+    encoding: str = ''
+    error: str = ''
+
+
+def extract_recipient(config: WorkerConfig, to_address: str, subject: str, headers: dict) -> Optional[str]:
+    """
+    Predict the recipient phone number, mirroring extractPhoneNumber().
+
+    Args:
+        config: Worker configuration
+        to_address: Envelope recipient address
+        subject: Email subject
+        headers: Lower-cased header mapping
+
+    Returns:
+        Phone number or None
+    """
+    method = config.routing.phone_extraction_method
+
+    if method in ('email_prefix', 'all_methods'):
+        match = _EMAIL_PREFIX.match(to_address)
+        if match:
+            phone = match.group(1)
+            if not phone.startswith('+'):
+                phone = config.routing.default_country_code + phone
+            return phone
+
+    if method in ('subject_line', 'all_methods'):
+        phone = extract_phone_from_subject(subject)
+        if phone:
+            return phone
+
+    if method in ('custom_header', 'all_methods'):
+        if headers.get('x-sms-to'):
+            return headers['x-sms-to']
+
+    return None
+
+
+def extract_sms_text(config: WorkerConfig, text_body: str, html_body: str, subject: str, sender: str) -> str:
+    """
+    Predict the SMS text, mirroring extractContent().
+
+    Args:
+        config: Worker configuration
+        text_body: Plain-text body
+        html_body: HTML body
+        subject: Email subject
+        sender: Sender address
+
+    Returns:
+        SMS text
+    """
+    routing = config.routing
+    source = routing.content_source
+
+    if source == 'body_html':
+        content = html_body or text_body
+        if routing.strip_html:
+            content = _HTML_TAG.sub('', content)
+    elif source == 'subject':
+        content = subject
+    elif source == 'subject_and_body':
+        content = subject + '\n\n' + (text_body or html_body)
+        if routing.strip_html:
+            content = _HTML_TAG.sub('', content)
+    else:
+        content = text_body
+
+    content = _WHITESPACE.sub(' ', content).strip()
+    content = truncate_string(content, routing.max_message_length)
+
+    if routing.include_sender_info:
+        content = f"[From: {sender}]\n{content}"
+
+    return content
+
+
+def _decode_header(value: str) -> str:
+    """Decode RFC 2047 encoded words, skipping the work for plain headers."""
+    if '=?' not in value:
+        return value
+    return str(make_header(decode_header(value)))
+
+
+def _bodies(message) -> Tuple[str, str]:
+    """Get the first text/plain and text/html bodies, ignoring attachments."""
+    bodies = {}
+    for part in message.walk():
+        content_type = part.get_content_type()
+        if content_type not in ('text/plain', 'text/html') or content_type in bodies:
+            continue
+        if part.get('content-disposition', '').lower().startswith('attachment'):
+            continue
+        payload = part.get_payload(decode=True) or b''
+        charset = part.get_content_charset() or 'utf-8'
+        try:
+            bodies[content_type] = payload.decode(charset, errors='replace')
+        except LookupError:
+            bodies[content_type] = payload.decode('utf-8', errors='replace')
+    return bodies.get('text/plain', ''), bodies.get('text/html', '')
+
+
+def replay_email(raw: bytes, config: WorkerConfig, path: str = '') -> ReplayResult:
+    """
+    Replay a single raw email.
+
+    Args:
+        raw: RFC 5322 message bytes
+        config: Worker configuration
+        path: Source path reported in the result
+
+    Returns:
+        ReplayResult
+    """
+    # The compat32 parser keeps headers as strings, which is several times
+    # faster than the policy.default header registry on large corpora
+    message = email.message_from_bytes(raw)
+    headers = {key.lower(): _decode_header(str(value)) for key, value in message.items()}
+    to_address = parseaddr(headers.get('to', ''))[1]
+    sender = parseaddr(headers.get('from', ''))[1]
+    subject = headers.get('subject', '')
+
+    # Exact match, like the worker's isWhitelisted()
+    security = config.security
+    if security.enable_sender_whitelist and sender not in security.sender_whitelist:
+        return ReplayResult(path=path, status=STATUS_BLOCKED)
+
+    recipient = extract_recipient(config, to_address, subject, headers)
+    if not recipient:
+        return ReplayResult(path=path, status=STATUS_NO_RECIPIENT)
+
+    text_body, html_body = _bodies(message)
+    sms_text = extract_sms_text(config, text_body, html_body, subject, sender)
+    if not sms_text:
+        # The worker rejects this with 400 "Empty message content"
+        return ReplayResult(path=path, status=STATUS_EMPTY, recipient=recipient)
+    info = analyze_sms(sms_text)
+
+    return ReplayResult(
+        path=path,
+        status=STATUS_OK,
+        recipient=recipient,
+        sms_text=sms_text,
+        segments=info.segments,
+        encoding=info.encoding,
+    )
+
+
+def replay_file(path: Union[str, Path], config: WorkerConfig) -> ReplayResult:
+    """
+    Replay a single .eml file, capturing parse errors in the result.
+
+    Args:
+        path: Path to .eml file
+        config: Worker configuration
+
+    Returns:
+        ReplayResult
+    """
+    try:
+        return replay_email(Path(path).read_bytes(), config, str(path))
+    except Exception as e:
+        return ReplayResult(path=str(path), status=STATUS_ERROR, error=str(e))
+
+
+def find_emails(directory: Union[str, Path]) -> List[Path]:
+    """
+    Find .eml files under a directory.
+
+    Args:
+        directory: Corpus directory
+
+    Returns:
+        Sorted list of paths
+    """
+    return sorted(Path(directory).rglob('*.eml'))
+
+
+def replay_paths(
+    paths: Iterable[Union[str, Path]],
+    config: WorkerConfig,
+    workers: Optional[int] = None,
+    chunksize: int = 256
+) -> Iterator[ReplayResult]:
+    """
+    Replay many emails across a process pool, yielding results in input order.
+
+    Args:
+        paths: .eml file paths
+        config: Worker configuration
+        workers: Process count (None = CPU count, 1 = in-process)
+        chunksize: Files handed to a worker process at a time
+
+    Yields:
+        ReplayResult per email
+    """
+    if workers == 1:
+        for path in paths:
+            yield replay_file(path, config)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(partial(replay_file, config=config), paths, chunksize=chunksize)
+
+
+def write_results_csv(results: Iterable[ReplayResult], fp) -> dict:
+    """
+    Write replay results as CSV.
+
+    Args:
+        results: Replay results
+        fp: Writable text file-like object
+
+    Returns:
+        Counts per status plus total segments
+    """
+    writer = csv.DictWriter(fp, fieldnames=[f.name for f in fields(ReplayResult)])
+    writer.writeheader()
+
+    summary = {'total': 0, 'segments': 0}
+    for result in results:
+        writer.writerow(asdict(result))
+        summary['total'] += 1
+        summary['segments'] += result.segments
+        summary[result.status] = summary.get(result.status, 0) + 1
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('directory', help='Directory containing .eml files')
+    parser.add_argument('--config', help='Exported configuration JSON (defaults are used if omitted)')
+    parser.add_argument('--output', help='CSV output path (default: stdout)')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    args = parser.parse_args(argv)
+
+    config = WorkerConfig()
+    if args.config:
+        config = WorkerConfig.from_dict(json.loads(Path(args.config).read_text()))
+
+    results = replay_paths(find_emails(args.directory), config, workers=args.workers)
+
+    if args.output:
+        with open(args.output, 'w', newline='') as fp:
+            summary = write_results_csv(results, fp)
+    else:
+        summary = write_results_csv(results, sys.stdout)
+
+    print(', '.join(f"{key}: {value}" for key, value in summary.items()), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
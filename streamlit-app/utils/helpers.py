@@ -5,6 +5,12 @@ from typing import Any, Dict, Optional
 from datetime import datetime
 import phonenumbers
 
+from .config_export import SENSITIVE_PATHS, placeholder_for
+from .config_overlay import compile_path
+from .html_text import html_to_text
+from .secret_scanner import scan_text
+from .sms_segments import analyze_sms
+
 
 def format_phone_e164(phone: str, default_country: str = "US") -> Optional[str]:
     """
@@ -50,10 +56,9 @@ def deep_get(dictionary: dict, path: str, default: Any = None) -> Any:
     Returns:
         Value at path or default
     """
-    keys = path.split('.')
     value = dictionary
 
-    for key in keys:
+    for key in compile_path(path):
         if isinstance(value, dict):
             value = value.get(key)
             if value is None:
@@ -210,44 +215,32 @@ def json_deserialize(json_str: str) -> Dict:
     return json.loads(json_str)
 
 
-def calculate_sms_segments(text: str, encoding: str = 'GSM-7') -> int:
+def calculate_sms_segments(text: str, encoding: Optional[str] = None) -> int:
     """
     Calculate number of SMS segments needed.
 
     Args:
         text: Message text
-        encoding: Character encoding (GSM-7 or UCS-2)
+        encoding: Character encoding (GSM-7 or UCS-2); auto-detected when None
 
     Returns:
         Number of segments
     """
-    length = len(text)
-
-    if encoding == 'GSM-7':
-        if length <= 160:
-            return 1
-        return (length - 1) // 153 + 1
-    else:  # UCS-2
-        if length <= 70:
-            return 1
-        return (length - 1) // 67 + 1
+    return analyze_sms(text, encoding).segments
 
 
-def strip_html_tags(html: str) -> str:
+def strip_html_tags(html: str, max_length: Optional[int] = None) -> str:
     """
-    Remove HTML tags from string.
+    Convert HTML to plain text.
 
     Args:
         html: HTML string
+        max_length: Stop once this many characters are collected (None = unlimited)
 
     Returns:
-        Plain text
+        Plain text with entities decoded and script/style content removed
     """
-    # Remove HTML tags
-    text = re.sub(r'<[^>]+>', '', html)
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
+    return html_to_text(html, max_chars=max_length)
 
 
 def generate_example_email(pattern: str, domain: str) -> str:
@@ -293,20 +286,8 @@ def validate_no_hardcoded_secrets(code: str) -> tuple[bool, list[str]]:
     Returns:
         Tuple of (is_safe, list of warnings)
     """
-    warnings = []
-
-    # Patterns to detect hardcoded secrets
-    patterns = {
-        'Twilio SID': r'AC[a-f0-9]{32}',
-        'API Key': r'["\']sk_[a-zA-Z0-9]{32,}["\']',
-        'Auth Token': r'["\'][a-f0-9]{32,}["\']',
-        'Password': r'password\s*=\s*["\'][^"\']+["\']',
-    }
-
-    for secret_type, pattern in patterns.items():
-        import re
-        if re.search(pattern, code, re.IGNORECASE):
-            warnings.append(f"Potential hardcoded {secret_type} detected")
+    detected = dict.fromkeys(finding.secret_type for finding in scan_text(code))
+    warnings = [f"Potential hardcoded {secret_type} detected" for secret_type in detected]
 
     return len(warnings) == 0, warnings
 
@@ -315,34 +296,23 @@ def sanitize_config_for_export(config_dict: dict) -> dict:
     """
     Sanitize configuration for safe export (remove sensitive data).
 
+    Only the sections holding sensitive fields are copied; everything else
+    is shared with the input. Use write_config_json to stream redacted JSON
+    straight from a WorkerConfig instead.
+
     Args:
         config_dict: Configuration dictionary
 
     Returns:
         Sanitized configuration
     """
-    import copy
-    safe_config = copy.deepcopy(config_dict)
-
-    # Remove sensitive fields
-    sensitive_paths = [
-        ('twilio', 'account_sid'),
-        ('twilio', 'auth_token'),
-        ('twilio', 'phone_number'),
-        ('cloudflare', 'api_token'),
-        ('integrations', 'notification_email')
-    ]
+    safe_config = dict(config_dict)
 
-    for path in sensitive_paths:
-        current = safe_config
-        for key in path[:-1]:
-            if key in current and isinstance(current[key], dict):
-                current = current[key]
-            else:
-                break
-        else:
-            # Replace with placeholder
-            if path[-1] in current:
-                current[path[-1]] = f"<{path[-1].upper()}_PLACEHOLDER>"
+    for section, key in SENSITIVE_PATHS:
+        current = safe_config.get(section)
+        if isinstance(current, dict) and key in current:
+            if current is config_dict.get(section):
+                current = safe_config[section] = dict(current)
+            current[key] = placeholder_for(key)
 
     return safe_config
@@ -0,0 +1,129 @@
+"""Incremental HTML-to-text conversion for email bodies."""
+from html.parser import HTMLParser
+from typing import Iterable, List, Optional, Union
+
+
+# Elements whose content is never part of the visible message
+SKIPPED_TAGS = frozenset({'script', 'style', 'template', 'title'})
+
+# Elements that separate words when rendered
+BLOCK_TAGS = frozenset({
+    'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt',
+    'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li',
+    'main', 'nav', 'ol', 'p', 'pre', 'section', 'table', 'td', 'th', 'tr', 'ul',
+})
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class HtmlTextExtractor(HTMLParser):
+    """
+    Streaming HTML parser that emits whitespace-normalized text.
+
+    Feed HTML in chunks; once ``max_chars`` characters of text have been
+    collected the extractor marks itself ``done`` and ignores further input.
+    """
+
+    def __init__(self, max_chars: Optional[int] = None):
+        """
+        Initialize extractor.
+
+        Args:
+            max_chars: Stop after this many output characters (None = unlimited)
+        """
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.done = False
+        self.truncated = False
+        self._parts: List[str] = []
+        self._length = 0
+        self._skip_depth = 0
+        self._pending_space = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag in BLOCK_TAGS:
+            self._pending_space = True
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in BLOCK_TAGS:
+            self._pending_space = True
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in BLOCK_TAGS:
+            self._pending_space = True
+
+    def handle_data(self, data):
+        if self.done or self._skip_depth:
+            return
+
+        words = data.split()
+        if not words:
+            if data:
+                self._pending_space = True
+            return
+
+        text = ' '.join(words)
+        if self._length and (self._pending_space or data[0].isspace()):
+            text = ' ' + text
+        self._pending_space = data[-1].isspace()
+
+        if self.max_chars is not None:
+            remaining = self.max_chars - self._length
+            if len(text) > remaining:
+                text = text[:remaining].rstrip()
+                self.truncated = True
+                self.done = True
+
+        self._parts.append(text)
+        self._length += len(text)
+
+    def feed(self, data: str):
+        """Feed a chunk of HTML; ignored once the budget is reached."""
+        if not self.done:
+            super().feed(data)
+
+    def get_text(self) -> str:
+        """Return the text collected so far."""
+        return ''.join(self._parts)
+
+
+def _iter_chunks(html: str, chunk_size: int) -> Iterable[str]:
+    """Yield fixed-size slices of a string."""
+    for start in range(0, len(html), chunk_size):
+        yield html[start:start + chunk_size]
+
+
+def html_to_text(
+    html: Union[str, Iterable[str]],
+    max_chars: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> str:
+    """
+    Convert HTML to plain text, stopping once the character budget is met.
+
+    Entities are decoded, script/style contents are dropped and runs of
+    whitespace collapse to single spaces.
+
+    Args:
+        html: HTML string or iterable of HTML chunks (e.g. a file read in blocks)
+        max_chars: Maximum output length (None = unlimited)
+        chunk_size: Chunk size used when html is a single string
+
+    Returns:
+        Plain text
+    """
+    chunks = _iter_chunks(html, chunk_size) if isinstance(html, str) else html
+
+    extractor = HtmlTextExtractor(max_chars=max_chars)
+    for chunk in chunks:
+        extractor.feed(chunk)
+        if extractor.done:
+            break
+    else:
+        extractor.close()
+
+    return extractor.get_text()
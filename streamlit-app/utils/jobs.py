@@ -0,0 +1,224 @@
+"""
+Background jobs on a process-wide executor shared by all sessions.
+
+Long-running work (bundle generation) is submitted as a ``Job`` owned by a
+session. Jobs report progress and can be cancelled while queued or between
+steps. Queued jobs are started round-robin across owners, so one session
+submitting many jobs cannot delay other sessions' jobs behind its own.
+"""
+import itertools
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Hashable, Optional
+
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+
+class JobCancelled(BaseException):
+    """
+    Raised inside a job when it has been cancelled.
+
+    Derives from BaseException (like asyncio.CancelledError) so that
+    ``except Exception`` blocks in job code do not swallow cancellation.
+    """
+
+
+class Job:
+    """One unit of background work and its progress."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, func: Callable[['Job'], Any], owner: Hashable, label: str = ''):
+        """
+        Initialize job.
+
+        Args:
+            func: Called with the job; returns the job result
+            owner: Owner (session) the job is scheduled under
+            label: Short description for display
+        """
+        self.id = next(self._ids)
+        self.func = func
+        self.owner = owner
+        self.label = label
+        self.status = QUEUED
+        self.completed = 0
+        self.total = 0
+        self.current = ''
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+
+    def update(self, completed: int, total: int, current: str = '') -> None:
+        """
+        Report progress from inside the job.
+
+        Args:
+            completed: Completed steps
+            total: Total steps
+            current: Description of the last completed step
+
+        Raises:
+            JobCancelled: If the job has been cancelled
+        """
+        self.completed, self.total, self.current = completed, total, current
+        self.check_cancelled()
+
+    def check_cancelled(self) -> None:
+        """Raise JobCancelled if cancellation was requested."""
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def cancel(self) -> None:
+        """Request cancellation; takes effect at the job's next progress update."""
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation was requested."""
+        return self._cancel.is_set()
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job is done, failed or cancelled."""
+        return self._done.is_set()
+
+    @property
+    def fraction(self) -> float:
+        """Completed fraction between 0.0 and 1.0."""
+        return self.completed / self.total if self.total else 0.0
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the job to finish.
+
+        Args:
+            timeout: Seconds to wait (None = forever)
+
+        Returns:
+            True if the job finished
+        """
+        return self._done.wait(timeout)
+
+    def _finish(self, status: str) -> None:
+        self.status = status
+        self._done.set()
+
+    def __repr__(self) -> str:
+        return f"Job({self.id}, {self.label!r}, {self.status}, {self.completed}/{self.total})"
+
+
+class JobScheduler:
+    """
+    Runs jobs on a bounded thread pool with round-robin fairness per owner.
+
+    Every submitted job adds one task to the pool, but a task runs whichever
+    job is next in owner order rather than the job it was submitted for.
+    """
+
+    def __init__(self, workers: int = 2):
+        """
+        Initialize scheduler.
+
+        Args:
+            workers: Maximum number of jobs running at once
+        """
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job')
+        self._queues: 'OrderedDict[Hashable, Deque[Job]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, func: Callable[[Job], Any], owner: Hashable, label: str = '') -> Job:
+        """
+        Queue a job.
+
+        Args:
+            func: Called with the job; returns the job result
+            owner: Owner (session) the job is scheduled under
+            label: Short description for display
+
+        Returns:
+            Queued Job
+        """
+        job = Job(func, owner, label)
+        with self._lock:
+            self._queues.setdefault(owner, deque()).append(job)
+        self._executor.submit(self._run_next)
+        return job
+
+    def cancel(self, job: Job) -> None:
+        """
+        Cancel a job, removing it from the queue if it has not started.
+
+        Args:
+            job: Job to cancel
+        """
+        job.cancel()
+        with self._lock:
+            queue = self._queues.get(job.owner)
+            if queue and job in queue:
+                queue.remove(job)
+                if not queue:
+                    del self._queues[job.owner]
+                job._finish(CANCELLED)
+
+    def pending(self, owner: Optional[Hashable] = None) -> int:
+        """
+        Count queued jobs.
+
+        Args:
+            owner: Count only this owner's jobs (None = all owners)
+
+        Returns:
+            Number of queued jobs
+        """
+        with self._lock:
+            if owner is not None:
+                return len(self._queues.get(owner, ()))
+            return sum(len(queue) for queue in self._queues.values())
+
+    def _next(self) -> Optional[Job]:
+        """Take the next job from the owner at the front, then rotate that owner to the back."""
+        with self._lock:
+            if not self._queues:
+                return None
+            owner, queue = next(iter(self._queues.items()))
+            job = queue.popleft()
+            if queue:
+                self._queues.move_to_end(owner)
+            else:
+                del self._queues[owner]
+            job.status = RUNNING
+            return job
+
+    def _run_next(self) -> None:
+        job = self._next()
+        if job is None:
+            return
+        try:
+            job.check_cancelled()
+            job.result = job.func(job)
+        except JobCancelled:
+            job._finish(CANCELLED)
+        except Exception as e:
+            job.error = e
+            job._finish(FAILED)
+        else:
+            job._finish(DONE)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the executor, cancelling queued jobs."""
+        with self._lock:
+            queued = [job for queue in self._queues.values() for job in queue]
+            self._queues.clear()
+        for job in queued:
+            job.cancel()
+            job._finish(CANCELLED)
+        self._executor.shutdown(wait=wait, cancel_futures=True)
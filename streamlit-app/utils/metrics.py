@@ -0,0 +1,245 @@
+"""
+Lightweight in-process metrics shared by all Streamlit sessions.
+
+Counters count events (cache hits, generations); histograms record
+durations in milliseconds or sizes in bytes, with fixed buckets plus a
+window of recent samples for percentiles. ``metrics`` is the process-wide
+registry used by the app.
+
+Metrics can be exported two ways:
+
+- Structured logs: ``emit`` writes one JSON object per event to the
+  ``email_to_sms.metrics`` logger at INFO level. Nothing is printed unless
+  logging is configured to show it.
+- JSON file: set ``METRICS_FILE`` to a path and the app writes a snapshot
+  there at most every ``METRICS_FLUSH_INTERVAL`` seconds.
+"""
+import bisect
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Sequence
+
+from .constants import METRICS_FLUSH_INTERVAL, METRICS_RECENT_SAMPLES
+
+
+# Default bucket upper bounds for durations (milliseconds)
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Default bucket upper bounds for sizes (bytes)
+SIZE_BUCKETS_BYTES = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+logger = logging.getLogger('email_to_sms.metrics')
+
+
+def _nearest_rank(ordered: Sequence[float], p: float) -> Optional[float]:
+    """Percentile of sorted values by nearest rank (None if empty)."""
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))]
+
+
+class Counter:
+    """Monotonic event counter."""
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        """Add to the counter."""
+        with self._lock:
+            self.value += amount
+
+
+class Histogram:
+    """Distribution of observed values with fixed buckets and recent samples."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS_MS, recent: int = METRICS_RECENT_SAMPLES):
+        """
+        Initialize histogram.
+
+        Args:
+            buckets: Ascending bucket upper bounds; larger values go to an overflow bucket
+            recent: Number of recent samples kept for percentiles
+        """
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._recent: deque = deque(maxlen=recent)
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record one value."""
+        with self._lock:
+            self.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.count += 1
+            self.total += value
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+            self._recent.append(value)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """
+        Get a percentile of the recent samples (nearest rank).
+
+        Args:
+            p: Percentile between 0 and 100
+
+        Returns:
+            Value, or None if nothing was observed
+        """
+        with self._lock:
+            ordered = sorted(self._recent)
+        return _nearest_rank(ordered, p)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Summary statistics as a dictionary."""
+        with self._lock:
+            ordered = sorted(self._recent)
+            summary = {
+                'count': self.count,
+                'sum': self.total,
+                'mean': self.total / self.count if self.count else None,
+                'min': self.min,
+                'max': self.max,
+                'buckets': {
+                    **{f"le_{bound:g}": count for bound, count in zip(self.buckets, self.bucket_counts)},
+                    'inf': self.bucket_counts[-1]
+                }
+            }
+        for p in (50, 95, 99):
+            summary[f"p{p}"] = _nearest_rank(ordered, p)
+        return summary
+
+
+class MetricsRegistry:
+    """Named counters and histograms, created on first use."""
+
+    def __init__(self):
+        self._counters: Dict[str, Counter] = {}
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+
+    def counter(self, name: str) -> Counter:
+        """Get or create a counter."""
+        with self._lock:
+            if name not in self._counters:
+                self._counters[name] = Counter()
+            return self._counters[name]
+
+    def histogram(self, name: str, buckets: Sequence[float] = LATENCY_BUCKETS_MS) -> Histogram:
+        """
+        Get or create a histogram.
+
+        Args:
+            name: Metric name
+            buckets: Bucket bounds, used only when the histogram is created
+
+        Returns:
+            Histogram
+        """
+        with self._lock:
+            if name not in self._histograms:
+                self._histograms[name] = Histogram(buckets)
+            return self._histograms[name]
+
+    def inc(self, name: str, amount: int = 1) -> None:
+        """Add to a counter."""
+        self.counter(name).inc(amount)
+
+    def observe(self, name: str, value: float, buckets: Sequence[float] = LATENCY_BUCKETS_MS) -> None:
+        """Record a value in a histogram."""
+        self.histogram(name, buckets).observe(value)
+
+    @contextmanager
+    def timer(self, name: str, into: Optional[Dict[str, float]] = None) -> Iterator[None]:
+        """
+        Time a block in milliseconds.
+
+        Args:
+            name: Histogram name
+            into: Also store the duration here under ``name`` (e.g. per-rerun timings)
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.observe(name, elapsed)
+            if into is not None:
+                into[name] = elapsed
+
+    def emit(self, event: str, **fields: Any) -> None:
+        """
+        Write a structured log record.
+
+        Args:
+            event: Event name
+            **fields: JSON-serializable values
+        """
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({'event': event, 'ts': time.time(), **fields}, default=str))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """All metrics as a JSON-serializable dictionary."""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = dict(self._histograms)
+        return {
+            'timestamp': time.time(),
+            'counters': {name: counter.value for name, counter in sorted(counters.items())},
+            'histograms': {name: histogram.snapshot() for name, histogram in sorted(histograms.items())}
+        }
+
+    def write_json(self, path: str) -> None:
+        """
+        Write a snapshot to a JSON file, replacing it atomically.
+
+        Args:
+            path: Output file path
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        with tempfile.NamedTemporaryFile('w', dir=directory, suffix='.tmp', delete=False) as tmp:
+            json.dump(self.snapshot(), tmp, indent=2)
+        os.replace(tmp.name, path)
+
+    def maybe_flush(self, path: Optional[str] = None, interval: float = METRICS_FLUSH_INTERVAL) -> bool:
+        """
+        Write a snapshot if a file is configured and the interval has passed.
+
+        Args:
+            path: Output file (default: the METRICS_FILE environment variable)
+            interval: Minimum seconds between writes
+
+        Returns:
+            True if a snapshot was written
+        """
+        path = path or os.environ.get('METRICS_FILE')
+        now = time.monotonic()
+        with self._lock:
+            if not path or now - self._last_flush < interval:
+                return False
+            self._last_flush = now
+        self.write_json(path)
+        return True
+
+    def reset(self) -> None:
+        """Remove all metrics."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._last_flush = 0.0
+
+
+# Metrics for every session in the server process
+metrics = MetricsRegistry()
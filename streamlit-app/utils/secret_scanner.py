@@ -0,0 +1,109 @@
+"""Single-pass secret scanning over generated file bundles."""
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+
+# Patterns to detect hardcoded secrets
+# (patterns are case-insensitive unless they scope their own flags)
+SECRET_PATTERNS: Dict[str, str] = {
+    # Case-sensitive: lowercase hex such as KV namespace IDs may contain "ac"
+    'Twilio SID': r'(?-i:AC[a-f0-9]{32})',
+    'API Key': r'["\']sk_[a-zA-Z0-9]{32,}["\']',
+    # wrangler.toml namespace `id`/`preview_id` values are 32-hex but not secret
+    'Auth Token': r'(?<![\s_]id = )(?<![\s_]id=)["\'][a-f0-9]{32,}["\']',
+    'Password': r'password\s*=\s*["\'][^"\']+["\']',
+}
+
+# Bundles at least this large are scanned across processes
+PARALLEL_SCAN_MIN_BYTES = 4 * 1024 * 1024
+
+
+def _compile_scanner(patterns: Dict[str, str]) -> Tuple[re.Pattern, Dict[str, str]]:
+    """
+    Compile all patterns into one scanner that walks the text once.
+
+    A leading lookahead of the alternation finds positions where any
+    pattern matches; one optional lookahead per pattern then records every
+    type matching there, so overlapping secrets of different types are all
+    reported.
+    """
+    group_names = {f'p{index}': name for index, name in enumerate(patterns)}
+    any_type = '|'.join(f'(?:{pattern})' for pattern in patterns.values())
+    each_type = ''.join(
+        f'(?:(?=(?P<{group}>{patterns[name]})))?' for group, name in group_names.items()
+    )
+    return re.compile(f'(?=(?:{any_type})){each_type}', re.IGNORECASE), group_names
+
+
+_SCANNER, _GROUP_NAMES = _compile_scanner(SECRET_PATTERNS)
+
+
+@dataclass(frozen=True, slots=True)
+class SecretFinding:
+    """A potential hardcoded secret in a generated file."""
+    file: str
+    line: int
+    secret_type: str
+
+    def __str__(self) -> str:
+        return f"{self.file}:{self.line}: potential hardcoded {self.secret_type}"
+
+
+def scan_text(text: str, filename: str = '<string>') -> List[SecretFinding]:
+    """
+    Scan a single text for hardcoded secrets.
+
+    Args:
+        text: Content to scan
+        filename: Name reported in findings
+
+    Returns:
+        Findings in order of appearance
+    """
+    findings = []
+    line = 1
+    last_pos = 0
+
+    for match in _SCANNER.finditer(text):
+        start = match.start()
+        line += text.count('\n', last_pos, start)
+        last_pos = start
+        for group, value in match.groupdict().items():
+            if value is not None:
+                findings.append(SecretFinding(filename, line, _GROUP_NAMES[group]))
+
+    return findings
+
+
+def _scan_item(item: Tuple[str, str]) -> List[SecretFinding]:
+    """Scan one (filename, content) pair; module-level so it can be pickled."""
+    filename, content = item
+    return scan_text(content, filename)
+
+
+def scan_bundle(files: Dict[str, str], max_workers: Optional[int] = None) -> List[SecretFinding]:
+    """
+    Scan every file in a generated bundle for hardcoded secrets.
+
+    Typical bundles are scanned in-process; bundles larger than
+    PARALLEL_SCAN_MIN_BYTES are spread across a process pool.
+
+    Args:
+        files: Dictionary mapping filenames to content
+        max_workers: Process pool size for large bundles (None = CPU count)
+
+    Returns:
+        Findings ordered by file, then line
+    """
+    items = sorted(files.items())
+    total_size = sum(len(content) for _, content in items)
+
+    if len(items) > 1 and total_size >= PARALLEL_SCAN_MIN_BYTES:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_scan_item, items))
+    else:
+        results = [_scan_item(item) for item in items]
+
+    return [finding for file_findings in results for finding in file_findings]
@@ -0,0 +1,160 @@
+"""SMS segment calculation for GSM-7 and UCS-2 encoded messages."""
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# GSM 03.38 basic character set (ESC at 0x1B is reserved for the extension table)
+GSM7_BASIC_CHARS = (
+    "@£$¥èéùìòÇ\nØø\rÅåΔ_ΦΓΛΩΠΨΣΘΞÆæßÉ"
+    " !\"#¤%&'()*+,-./0123456789:;<=>?"
+    "¡ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÑÜ§"
+    "¿abcdefghijklmnopqrstuvwxyzäöñüà"
+)
+
+# GSM 03.38 extension table; each character costs an ESC septet plus itself
+GSM7_EXTENSION_CHARS = "\f^{}\\[~]|€"
+
+GSM7 = 'GSM-7'
+UCS2 = 'UCS-2'
+
+# (single-segment capacity, per-segment capacity when concatenated)
+SEGMENT_LIMITS: Dict[str, Tuple[int, int]] = {
+    GSM7: (160, 153),
+    UCS2: (70, 67),
+}
+
+# Precomputed lookup tables, built once at import time
+_GSM7_SEPTETS: Dict[str, int] = {
+    **{char: 1 for char in GSM7_BASIC_CHARS},
+    **{char: 2 for char in GSM7_EXTENSION_CHARS},
+}
+_GSM7_CHARSET = frozenset(_GSM7_SEPTETS)
+
+
+@dataclass(frozen=True, slots=True)
+class SmsSegmentInfo:
+    """Result of segmenting a single SMS message."""
+    encoding: str
+    segments: int
+    units: int
+    non_gsm_chars: Tuple[str, ...]
+    boundaries: Tuple[Tuple[int, int], ...]
+
+    @property
+    def unit_name(self) -> str:
+        """Name of the unit counted by ``units``."""
+        return 'septets' if self.encoding == GSM7 else 'code units'
+
+    def estimated_cost(self, price_per_segment: float) -> float:
+        """Estimate send cost for this message."""
+        return self.segments * price_per_segment
+
+
+def detect_encoding(text: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Detect the encoding a carrier would use for a message.
+
+    Args:
+        text: Message text
+
+    Returns:
+        Tuple of (encoding, non-GSM characters in order of first appearance)
+    """
+    if _GSM7_CHARSET.issuperset(text):
+        return GSM7, ()
+
+    non_gsm = tuple(dict.fromkeys(char for char in text if char not in _GSM7_CHARSET))
+    return UCS2, non_gsm
+
+
+def _char_units(char: str, encoding: str) -> int:
+    """Units one character occupies in the given encoding."""
+    if encoding == GSM7:
+        return _GSM7_SEPTETS.get(char, 1)
+    # Characters outside the BMP are encoded as a UTF-16 surrogate pair
+    return 2 if ord(char) > 0xFFFF else 1
+
+
+def _count_units(text: str, encoding: str) -> int:
+    """Total units a message occupies in the given encoding."""
+    if encoding == GSM7:
+        # Characters outside GSM-7 (when forced) are substituted one-for-one by carriers
+        return len(text) + sum(text.count(char) for char in GSM7_EXTENSION_CHARS)
+    if text.isascii():
+        return len(text)
+    return len(text.encode('utf-16-le')) // 2
+
+
+def _segment_boundaries(text: str, encoding: str, units: int) -> Tuple[Tuple[int, int], ...]:
+    """
+    Compute (start, end) character offsets of each segment.
+
+    Multi-unit characters (GSM-7 escapes, surrogate pairs) are never split
+    across two segments, matching how handsets concatenate messages.
+    """
+    single_limit, part_limit = SEGMENT_LIMITS[encoding]
+    if units <= single_limit:
+        return ((0, len(text)),)
+
+    boundaries = []
+    start = 0
+    used = 0
+    for index, char in enumerate(text):
+        cost = _char_units(char, encoding)
+        if used + cost > part_limit:
+            boundaries.append((start, index))
+            start = index
+            used = 0
+        used += cost
+    boundaries.append((start, len(text)))
+    return tuple(boundaries)
+
+
+def analyze_sms(text: str, encoding: Optional[str] = None) -> SmsSegmentInfo:
+    """
+    Analyze how a message will be split into SMS segments.
+
+    Args:
+        text: Message text
+        encoding: Force GSM-7 or UCS-2; auto-detected when None
+
+    Returns:
+        SmsSegmentInfo with encoding, segment count and boundaries
+    """
+    detected, non_gsm = detect_encoding(text)
+    if encoding is None:
+        encoding = detected
+    elif encoding not in SEGMENT_LIMITS:
+        raise ValueError(f"Unsupported SMS encoding: {encoding}")
+
+    units = _count_units(text, encoding)
+    boundaries = _segment_boundaries(text, encoding, units)
+
+    return SmsSegmentInfo(
+        encoding=encoding,
+        segments=len(boundaries),
+        units=units,
+        non_gsm_chars=non_gsm,
+        boundaries=boundaries,
+    )
+
+
+def analyze_sms_batch(texts: Iterable[str], encoding: Optional[str] = None) -> List[SmsSegmentInfo]:
+    """
+    Analyze many messages, reusing results for duplicate texts.
+
+    Args:
+        texts: Message texts
+        encoding: Force GSM-7 or UCS-2; auto-detected when None
+
+    Returns:
+        List of SmsSegmentInfo in input order
+    """
+    seen: Dict[str, SmsSegmentInfo] = {}
+    results = []
+    for text in texts:
+        info = seen.get(text)
+        if info is None:
+            info = seen[text] = analyze_sms(text, encoding)
+        results.append(info)
+    return results
@@ -1,10 +1,20 @@
 """Input validation functions."""
+import hashlib
 import re
-from typing import Optional, Tuple
+from typing import Any, Callable, Optional, Tuple
 import validators as val
 import phonenumbers
 from phonenumbers import NumberParseException
 
+from .cache import LRUCache
+from .constants import VALIDATION_CACHE_MAX_ENTRIES
+from .metrics import metrics
+
+
+# Validation results keyed by (validator, hash of input). Validators are pure,
+# so results are shared by every rerun and every session.
+validation_cache = LRUCache(max_entries=VALIDATION_CACHE_MAX_ENTRIES)
+
 
 def validate_worker_name(name: str) -> Tuple[bool, Optional[str]]:
     """
@@ -347,3 +357,33 @@ def sanitize_user_input(input_str: str, max_length: int = 1000) -> str:
     sanitized = sanitized.replace('\x00', '')
 
     return sanitized.strip()
+
+
+def cached_validation(validator: Callable[[str], Tuple], value: str) -> Tuple:
+    """
+    Run a validator, reusing the result for a value it has already checked.
+
+    Inputs are keyed by hash, so credentials are never held in the cache.
+
+    Args:
+        validator: Validation function taking a single string
+        value: Input value
+
+    Returns:
+        The validator's result tuple (lists are copied, so callers may modify them)
+    """
+    key = (
+        validator.__module__,
+        validator.__qualname__,
+        hashlib.sha256((value or '').encode('utf-8')).hexdigest(),
+        value is None
+    )
+    result = validation_cache.get(key)
+    if result is None:
+        metrics.inc('validation.cache_misses')
+        with metrics.timer(f"validation.{validator.__qualname__}_ms"):
+            result = validator(value)
+        validation_cache.put(key, result)
+    else:
+        metrics.inc('validation.cache_hits')
+    return tuple(list(item) if isinstance(item, list) else item for item in result)
@@ -0,0 +1,254 @@
+"""
+Streaming ZIP writer that compresses entries on a thread pool.
+
+zlib releases the GIL while compressing and checksumming, so entries are
+deflated concurrently and then written to the container in input order.
+Headers are written after each entry is compressed, so the output file does
+not need to be seekable, and output is byte-identical to ``write_zip``.
+"""
+import hashlib
+import io
+import os
+import struct
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import BinaryIO, Deque, Dict, Iterable, List, Optional, Tuple, Union
+
+from .archive import FIXED_DATE_TIME, ArchiveResult, entry_mode
+from .bundle import PRECOMPRESS_LEVEL, Bundle, GeneratedFile
+
+
+# Methods this writer can compress in parallel (ZIP method ids)
+PARALLEL_METHODS = {
+    'stored': 0,
+    'deflate': 8,
+}
+
+# ZIP record layouts, matching the zipfile module
+_LOCAL_HEADER = struct.Struct('<4s2B4HL2L2H')
+_CENTRAL_HEADER = struct.Struct('<4s4B4HL2L5H2L')
+_END_RECORD = struct.Struct('<4s4H2LH')
+
+_VERSION = 20
+_UNIX = 3
+_UTF8_FLAG = 0x800
+
+# Limits of the classic (non-ZIP64) format
+_MAX_ENTRIES = 0xFFFF
+_MAX_OFFSET = 0xFFFFFFFF
+
+_DOS_TIME = (FIXED_DATE_TIME[3] << 11) | (FIXED_DATE_TIME[4] << 5) | (FIXED_DATE_TIME[5] // 2)
+_DOS_DATE = ((FIXED_DATE_TIME[0] - 1980) << 9) | (FIXED_DATE_TIME[1] << 5) | FIXED_DATE_TIME[2]
+
+
+def _compress_entry(data: bytes, method: int, level: Optional[int]) -> Tuple[bytes, int]:
+    """Compress one entry and compute its CRC (runs on a pool thread)."""
+    crc = zlib.crc32(data)
+    if method == 0:
+        return data, crc
+    compressor = zlib.compressobj(-1 if level is None else level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush(), crc
+
+
+class ParallelZipWriter:
+    """
+    Write ZIP archives with per-entry compression on a thread pool.
+
+    Usage:
+        with ParallelZipWriter(fp, level=6) as writer:
+            writer.write_files(files, prefix="worker-a/")
+            writer.write_files(other_files, prefix="worker-b/")
+    """
+
+    def __init__(
+        self,
+        fp: BinaryIO,
+        compression: str = 'deflate',
+        level: Optional[int] = None,
+        workers: Optional[int] = None,
+        executor: Optional[ThreadPoolExecutor] = None
+    ):
+        """
+        Initialize writer.
+
+        Args:
+            fp: Writable binary file-like object (need not be seekable)
+            compression: 'stored' or 'deflate'
+            level: Deflate level 1-9, or None for the zlib default
+            workers: Pool size (None = CPU count)
+            executor: Shared executor to use instead of a private pool
+        """
+        if compression not in PARALLEL_METHODS:
+            raise ValueError(
+                f"Parallel compression supports {', '.join(PARALLEL_METHODS)}, got {compression}"
+            )
+        if level is not None and (compression == 'stored' or not 1 <= level <= 9):
+            raise ValueError(f"Invalid compression level {level} for {compression}")
+
+        self.fp = fp
+        self.compression = compression
+        self.level = level
+        self.workers = workers or os.cpu_count() or 1
+        self._method = PARALLEL_METHODS[compression]
+        self._executor = executor or ThreadPoolExecutor(max_workers=self.workers)
+        self._owns_executor = executor is None
+        self._central: List[bytes] = []
+        self._offset = 0
+        self._closed = False
+        self.entries = 0
+        self.uncompressed_size = 0
+
+    def write_files(self, files: Dict[str, str], prefix: str = '') -> None:
+        """
+        Compress and append a bundle in sorted path order.
+
+        Args:
+            files: Dictionary mapping filenames to content (a Bundle's
+                precomputed bytes and deflate output are reused)
+            prefix: Path prefix for every entry
+        """
+        if isinstance(files, Bundle):
+            self.write_entries((prefix + path, path, files.file(path)) for path in sorted(files))
+        else:
+            self.write_entries((prefix + path, path, files[path]) for path in sorted(files))
+
+    def write_entries(self, entries: Iterable[Tuple[str, str, Union[str, GeneratedFile]]]) -> None:
+        """
+        Compress and append entries in the given order.
+
+        At most twice the pool size entries are in flight, so memory stays
+        bounded however many entries are written.
+
+        Args:
+            entries: (archive name, source path for mode bits, content) tuples
+        """
+        pending: Deque[Tuple[str, str, int, Future]] = deque()
+        window = self.workers * 2
+
+        for name, path, content in entries:
+            if isinstance(content, GeneratedFile):
+                data = content.data
+                future = self._reuse(content)
+            else:
+                data = content.encode('utf-8')
+                future = None
+            if future is None:
+                future = self._executor.submit(_compress_entry, data, self._method, self.level)
+            pending.append((name, path, len(data), future))
+            if len(pending) >= window:
+                self._write_entry(*pending.popleft())
+
+        while pending:
+            self._write_entry(*pending.popleft())
+
+    def _reuse(self, file: GeneratedFile) -> Optional[Future]:
+        """Get a completed future for an entry whose output is already known."""
+        if self._method == 0:
+            result = (file.data, file.crc32)
+        elif file.compressed is not None and self.level in (None, PRECOMPRESS_LEVEL):
+            result = (file.compressed, file.crc32)
+        else:
+            return None
+        future: Future = Future()
+        future.set_result(result)
+        return future
+
+    def _write_entry(self, name: str, path: str, size: int, future: Future) -> None:
+        """Write a compressed entry and remember its central directory record."""
+        compressed, crc = future.result()
+
+        try:
+            filename = name.encode('ascii')
+            flags = 0
+        except UnicodeEncodeError:
+            filename = name.encode('utf-8')
+            flags = _UTF8_FLAG
+
+        if self.entries + 1 > _MAX_ENTRIES or self._offset + len(compressed) > _MAX_OFFSET:
+            raise ValueError("Archive exceeds ZIP limits without ZIP64")
+
+        header = _LOCAL_HEADER.pack(
+            b'PK\x03\x04', _VERSION, 0, flags, self._method, _DOS_TIME, _DOS_DATE,
+            crc, len(compressed), size, len(filename), 0
+        )
+        self._central.append(_CENTRAL_HEADER.pack(
+            b'PK\x01\x02', _VERSION, _UNIX, _VERSION, 0, flags, self._method, _DOS_TIME, _DOS_DATE,
+            crc, len(compressed), size, len(filename), 0, 0, 0, 0,
+            (0o100000 | entry_mode(path)) << 16, self._offset
+        ) + filename)
+
+        self.fp.write(header)
+        self.fp.write(filename)
+        self.fp.write(compressed)
+        self._offset += len(header) + len(filename) + len(compressed)
+        self.entries += 1
+        self.uncompressed_size += size
+
+    def close(self) -> None:
+        """Write the central directory and release the pool."""
+        if self._closed:
+            return
+        self._closed = True
+
+        directory_offset = self._offset
+        directory_size = 0
+        for record in self._central:
+            self.fp.write(record)
+            directory_size += len(record)
+
+        self.fp.write(_END_RECORD.pack(
+            b'PK\x05\x06', 0, 0, self.entries, self.entries, directory_size, directory_offset, 0
+        ))
+        self._central.clear()
+
+        if self._owns_executor:
+            self._executor.shutdown()
+
+    def __enter__(self) -> 'ParallelZipWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        elif self._owns_executor:
+            self._executor.shutdown(cancel_futures=True)
+
+
+def build_zip_parallel(
+    files: Dict[str, str],
+    prefix: str = '',
+    compression: str = 'deflate',
+    level: Optional[int] = None,
+    workers: Optional[int] = None
+) -> ArchiveResult:
+    """
+    Build a reproducible ZIP archive, compressing entries on a thread pool.
+
+    Args:
+        files: Dictionary mapping filenames to content
+        prefix: Path prefix for every entry
+        compression: 'stored' or 'deflate'
+        level: Deflate level 1-9, or None for the zlib default
+        workers: Pool size (None = CPU count)
+
+    Returns:
+        ArchiveResult
+    """
+    start = time.perf_counter()
+    buffer = io.BytesIO()
+    with ParallelZipWriter(buffer, compression, level, workers) as writer:
+        writer.write_files(files, prefix)
+    data = buffer.getvalue()
+
+    return ArchiveResult(
+        data=data,
+        sha256=hashlib.sha256(data).hexdigest(),
+        archive_format='zip',
+        compression=compression,
+        level=level,
+        entries=writer.entries,
+        uncompressed_size=writer.uncompressed_size,
+        duration=time.perf_counter() - start,
+    )